@@ -5,7 +5,7 @@ import asyncio
 import re
 import json
 import gc
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 # 并发控制：防止OOM，保证每个请求都能完成
 MAX_CONCURRENT_REQUESTS = 3  # 最大同时处理请求数
@@ -22,7 +22,7 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 # WhiteNoise将通过StaticFiles中间件集成，不需要ASGI↔WSGI转换
@@ -224,6 +224,11 @@ class MeetSpotRequest(BaseModel):
     price_range: Optional[str] = ""        # 价格区间: economy/mid/high
     # 预解析坐标（可选，由前端 Autocomplete 提供）
     location_coords: Optional[List[LocationCoord]] = None
+    # 中心点算法（可选）：midpoint / median / minimax，空为默认 midpoint；其他取值直接返回 422
+    center_objective: Optional[Literal["", "median", "minimax", "midpoint"]] = ""
+    # 多中心模式（可选）：参与者分成几组、每组一个会面点，0/1 为单中心；
+    # 上限与 CafeRecommender.CLUSTER_MAX 一致，超出范围直接返回 422
+    cluster_count: Optional[int] = Field(0, ge=0, le=10)
 
 class AIChatRequest(BaseModel):
     message: str
@@ -323,6 +328,53 @@ async def startup_database():
         logger.error(f"❌ Database init failed: {e}")
         raise
 
+    # 把持久化缓存中最热门的地址预热进内存，重启后首批请求无需再访问高德
+    try:
+        from app.amap.geocode_store import geocode_store_warm_start_limit, get_geocode_store
+
+        await get_geocode_store().warm_start(geocode_store_warm_start_limit())
+    except Exception as e:
+        logger.warning(f"地理编码缓存预热跳过: {e}")
+
+    # 热门地址并入离线地名表，之后解析这些地址不再访问数据库与高德
+    try:
+        from app.amap.gazetteer import refresh_gazetteer_from_store
+
+        await refresh_gazetteer_from_store()
+    except Exception as e:
+        logger.warning(f"离线地名表刷新跳过: {e}")
+
+    # 建好各城市的地铁耗时表（每个城市约数百次 Dijkstra），避免首个请求现算
+    try:
+        from app.amap.transit_graph import get_transit_graph
+
+        if await asyncio.to_thread(get_transit_graph().precompute) == 0:
+            logger.warning("离线轨道交通线网为空，transit 公平性与地铁耗时评分不生效（见 tools/build_transit_graph.py）")
+    except Exception as e:
+        logger.warning(f"轨道交通耗时表预计算跳过: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_amap_client():
+    """关闭共享的高德API连接池。"""
+    try:
+        from app.amap import close_amap_client
+
+        await close_amap_client()
+    except Exception as e:
+        logger.error(f"❌ Failed to close AMap client: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_geocode_store():
+    """写回尚未落库的地理编码缓存命中次数。"""
+    try:
+        from app.amap.geocode_store import get_geocode_store
+
+        await get_geocode_store().flush_hits()
+    except Exception as e:
+        logger.warning(f"地理编码缓存命中次数写回跳过: {e}")
+
 
 # 配置CORS
 app.add_middleware(
@@ -814,7 +866,9 @@ async def _process_meetspot_request(request: MeetSpotRequest, start_time: float)
                 min_rating=request.min_rating or 0.0,
                 max_distance=request.max_distance or 100000,
                 price_range=request.price_range or "",
-                pre_resolved_coords=pre_resolved_coords
+                pre_resolved_coords=pre_resolved_coords,
+                center_objective=request.center_objective or "",
+                cluster_count=request.cluster_count or 0
             )
 
             processing_time = time.time() - start_time
@@ -1038,6 +1092,42 @@ async def api_status():
         "timestamp": time.time()
     }
 
+
+@app.get("/api/metrics/amap")
+async def amap_metrics():
+    """高德API调用统计（连接复用等）"""
+    try:
+        from app.amap import (
+            breaker_stats,
+            cache_stats,
+            get_amap_client,
+            get_gazetteer,
+            get_geocode_negative_cache,
+            get_geocode_store,
+            get_poi_index,
+            get_rate_scheduler,
+            get_transit_graph,
+            singleflight_stats,
+        )
+    except ImportError:
+        return {"available": False}
+
+    return {
+        "available": True,
+        "client": get_amap_client().stats(),
+        "cache": cache_stats(),
+        "gazetteer": get_gazetteer().stats(),
+        "geocode_store": get_geocode_store().stats(),
+        "geocode_negative": get_geocode_negative_cache().stats(),
+        "poi_index": get_poi_index().stats(),
+        "circuit_breakers": breaker_stats(),
+        "latency": get_amap_client().latency_stats(),
+        "rate_limits": get_rate_scheduler().stats(),
+        "singleflight": singleflight_stats(),
+        "transit": get_transit_graph().stats(),
+        "timestamp": time.time()
+    }
+
 # 静态文件服务（替代WhiteNoise，使用FastAPI原生StaticFiles）
 # StaticFiles自带gzip压缩和缓存控制
 if os.path.exists("static"):
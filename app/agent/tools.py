@@ -3,8 +3,10 @@
 import json
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 from pydantic import Field
 
+from app.amap.distance import distances_from
 from app.tool.base import BaseTool, ToolResult
 from app.logger import logger
 
@@ -20,16 +22,22 @@ class GeocodeTool(BaseTool):
 - 知名地标：'天安门'、'外滩'、'广州塔'
 - 商圈区域：'三里屯'、'王府井'
 
-返回地址的经纬度坐标和格式化地址。"""
+返回地址的经纬度坐标和格式化地址。
+需要解析多个地址时，用 addresses 一次传入，会合并为批量请求。"""
     parameters: dict = {
         "type": "object",
         "properties": {
             "address": {
                 "type": "string",
                 "description": "地址或地点名称，如'北京大学'、'上海市浦东新区陆家嘴'"
+            },
+            "addresses": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "（可选）多个地址，批量解析"
             }
         },
-        "required": ["address"]
+        "required": []
     }
 
     class Config:
@@ -47,27 +55,53 @@ class GeocodeTool(BaseTool):
             object.__setattr__(self, '_cached_recommender', recommender)
         return self._cached_recommender
 
-    async def execute(self, address: str) -> ToolResult:
+    @staticmethod
+    def _format_result(address: str, result: dict) -> dict:
+        location = result.get("location", "")
+        lng, lat = location.split(",") if location else (None, None)
+        return {
+            "address": address,
+            "formatted_address": result.get("formatted_address", ""),
+            "location": location,
+            "lng": float(lng) if lng else None,
+            "lat": float(lat) if lat else None,
+            "city": result.get("city", ""),
+            "district": result.get("district", "")
+        }
+
+    async def execute(self, address: str = "", addresses: Optional[List[str]] = None) -> ToolResult:
         """执行地理编码"""
-        try:
-            recommender = self._get_recommender()
-            result = await recommender._geocode(address)
+        all_addresses = ([address] if address else []) + list(addresses or [])
+        if not all_addresses:
+            return BaseTool.fail_response("请提供 address 或 addresses")
 
-            if result:
-                location = result.get("location", "")
-                lng, lat = location.split(",") if location else (None, None)
-
-                return BaseTool.success_response({
-                    "address": address,
-                    "formatted_address": result.get("formatted_address", ""),
-                    "location": location,
-                    "lng": float(lng) if lng else None,
-                    "lat": float(lat) if lat else None,
-                    "city": result.get("city", ""),
-                    "district": result.get("district", "")
-                })
+        try:
+            from app.amap import track_upstream_calls
 
-            return BaseTool.fail_response(f"无法解析地址: {address}")
+            recommender = self._get_recommender()
+            with track_upstream_calls() as upstream_calls:
+                results = await recommender._geocode_many(all_addresses)
+
+            if len(all_addresses) == 1:
+                if results[0]:
+                    return BaseTool.success_response({
+                        **self._format_result(all_addresses[0], results[0]),
+                        "upstream_calls": sum(upstream_calls.values())
+                    })
+                return BaseTool.fail_response(f"无法解析地址: {all_addresses[0]}")
+
+            resolved = [
+                self._format_result(addr, result)
+                for addr, result in zip(all_addresses, results) if result
+            ]
+            failed = [addr for addr, result in zip(all_addresses, results) if not result]
+            if not resolved:
+                return BaseTool.fail_response(f"无法解析地址: {'、'.join(failed)}")
+            return BaseTool.success_response({
+                "results": resolved,
+                "failed": failed,
+                "upstream_calls": sum(upstream_calls.values())
+            })
 
         except Exception as e:
             logger.error(f"地理编码失败: {e}")
@@ -117,6 +151,18 @@ class CalculateCenterTool(BaseTool):
                 "type": "boolean",
                 "description": "是否使用智能算法（考虑 POI 密度和交通），默认 true",
                 "default": True
+            },
+            "center_objective": {
+                "type": "string",
+                "description": "几何中心的算法：'midpoint'(经纬度平均，默认)、'median'(所有人总距离最短)、'minimax'(最远的人距离最短)",
+                "enum": ["midpoint", "median", "minimax"],
+                "default": "midpoint"
+            },
+            "fairness": {
+                "type": "string",
+                "description": "智能算法的公平性标准：'distance'(直线距离，默认)、'travel_time'(驾车出行时间，最远的人耗时最短)",
+                "enum": ["distance", "travel_time"],
+                "default": "distance"
             }
         },
         "required": ["coordinates"]
@@ -140,12 +186,19 @@ class CalculateCenterTool(BaseTool):
         self,
         coordinates: List[Dict],
         keywords: str = "咖啡馆",
-        use_smart_algorithm: bool = True
+        use_smart_algorithm: bool = True,
+        center_objective: str = "midpoint",
+        fairness: str = "distance"
     ) -> ToolResult:
         """计算最佳中心点"""
         try:
             if not coordinates or len(coordinates) < 2:
                 return BaseTool.fail_response("至少需要2个坐标点来计算中心")
+            # 枚举参数按 parameters 中声明的取值校验，取值无效时不发起任何计算
+            for name, value in (("center_objective", center_objective), ("fairness", fairness)):
+                allowed = self.parameters["properties"][name]["enum"]
+                if value not in allowed:
+                    return BaseTool.fail_response(f"{name} 取值无效: {value}，可选 {', '.join(allowed)}")
 
             recommender = self._get_recommender()
 
@@ -155,18 +208,18 @@ class CalculateCenterTool(BaseTool):
             if use_smart_algorithm:
                 # 使用智能中心点算法
                 center, evaluation_details = await recommender._calculate_smart_center(
-                    coord_tuples, keywords
+                    coord_tuples, keywords, center_objective, fairness
                 )
                 logger.info(f"智能中心点算法完成，最优中心: {center}")
             else:
                 # 使用简单几何中心
-                center = recommender._calculate_center_point(coord_tuples)
-                evaluation_details = {"algorithm": "geometric_center"}
+                center = recommender._calculate_center_point(coord_tuples, center_objective)
+                evaluation_details = {"algorithm": "geometric_center", "objective": center_objective}
 
             # 计算每个点到中心的距离
             distances = []
-            for c in coordinates:
-                dist = recommender._calculate_distance(center, (c["lng"], c["lat"]))
+            center_distances = distances_from(center, coord_tuples).tolist()
+            for c, dist in zip(coordinates, center_distances):
                 distances.append({
                     "name": c.get("name", f"({c['lng']:.4f}, {c['lat']:.4f})"),
                     "distance_to_center": round(dist, 0)
@@ -181,6 +234,7 @@ class CalculateCenterTool(BaseTool):
                     "lat": round(center[1], 6)
                 },
                 "algorithm": "smart" if use_smart_algorithm else "geometric",
+                "center_objective": center_objective,
                 "input_count": len(coordinates),
                 "distances": distances,
                 "max_distance": max_dist,
@@ -192,7 +246,13 @@ class CalculateCenterTool(BaseTool):
                 result["evaluation"] = {
                     "geo_center": evaluation_details.get("geo_center"),
                     "best_score": evaluation_details.get("best_score"),
-                    "top_candidates": len(evaluation_details.get("all_candidates", []))
+                    "top_candidates": len(evaluation_details.get("all_candidates", [])),
+                    "evaluated": evaluation_details.get("evaluated"),
+                    "levels": evaluation_details.get("levels"),
+                    "fairness": evaluation_details.get("fairness_mode"),
+                    "budget_exhausted": evaluation_details.get("budget_exhausted"),
+                    "pruned": evaluation_details.get("pruned"),
+                    "searches_avoided": evaluation_details.get("searches_avoided")
                 }
 
             return BaseTool.success_response(result)
@@ -275,17 +335,17 @@ class SearchPOITool(BaseTool):
 
             # 简化返回数据
             simplified = []
-            for p in places[:15]:  # 最多返回15个
+            top_places = places[:15]  # 最多返回15个
+            # 一次算出到中心的距离（无坐标的记为 0）
+            place_distances = distances_from((center_lng, center_lat), [
+                tuple(map(float, p["location"].split(","))) if p.get("location") else (None, None)
+                for p in top_places
+            ])
+            for p, distance in zip(top_places, np.nan_to_num(place_distances).tolist()):
                 biz_ext = p.get("biz_ext", {}) or {}
                 location = p.get("location", "")
                 lng, lat = location.split(",") if location else (0, 0)
 
-                # 计算到中心的距离
-                distance = recommender._calculate_distance(
-                    (center_lng, center_lat),
-                    (float(lng), float(lat))
-                ) if location else 0
-
                 simplified.append({
                     "name": p.get("name", ""),
                     "address": p.get("address", ""),
@@ -445,13 +505,13 @@ class GenerateRecommendationTool(BaseTool):
             # 生成推荐结果
             recommendations = []
             for i, place in enumerate(top_places, 1):
-                score = place.get("_final_score") or place.get("_score", 0)
-                distance = place.get("_distance") or place.get("distance", 0)
-                rating = place.get("_raw_rating") or place.get("rating", "N/A")
+                score = place.final_score or place.score
+                distance = place.distance or 0
+                rating = place.raw_rating or place.rating_text or "N/A"
 
                 # 优先使用 LLM 生成的理由
-                llm_reason = place.get("_llm_reason", "")
-                rule_reason = place.get("_recommendation_reason", "")
+                llm_reason = place.llm_reason
+                rule_reason = place.recommendation_reason
 
                 if llm_reason:
                     reasons = [llm_reason]
@@ -480,16 +540,16 @@ class GenerateRecommendationTool(BaseTool):
 
                 recommendations.append({
                     "rank": i,
-                    "name": place.get("name", ""),
-                    "address": place.get("address", ""),
+                    "name": place.name,
+                    "address": place.address,
                     "rating": str(rating) if rating else "N/A",
                     "distance": round(distance, 0),
                     "score": round(score, 1),
-                    "llm_score": place.get("_llm_score", 0),
-                    "tel": place.get("tel", ""),
+                    "llm_score": place.llm_score,
+                    "tel": place.tel,
                     "reasons": reasons,
-                    "location": place.get("location", ""),
-                    "scoring_method": "llm+rule" if place.get("_llm_score") else "rule"
+                    "location": place.location,
+                    "scoring_method": "llm+rule" if place.llm_score else "rule"
                 })
 
             return BaseTool.success_response({
@@ -0,0 +1,41 @@
+"""高德地图 Web 服务 API 访问层。"""
+
+from app.amap.cache import LRUCache, cache_stats, get_cache
+from app.amap.client import AMapClient, close_amap_client, get_amap_client, track_upstream_calls
+from app.amap.gazetteer import Gazetteer, get_gazetteer
+from app.amap.geocode_store import GeocodeStore, get_geocode_store
+from app.amap.negative_cache import NegativeCache, get_geocode_negative_cache
+from app.amap.poi_index import POIIndex, get_poi_index
+from app.amap.resilience import CircuitBreaker, breaker_stats, get_circuit_breaker
+from app.amap.scheduler import AMapRateScheduler, TokenBucket, get_rate_scheduler
+from app.amap.singleflight import SingleFlight, get_flight_group, singleflight_stats
+from app.amap.transit_graph import TransitGraph, get_transit_graph
+
+__all__ = [
+    "LRUCache",
+    "get_cache",
+    "cache_stats",
+    "AMapClient",
+    "get_amap_client",
+    "close_amap_client",
+    "track_upstream_calls",
+    "Gazetteer",
+    "get_gazetteer",
+    "GeocodeStore",
+    "get_geocode_store",
+    "NegativeCache",
+    "get_geocode_negative_cache",
+    "POIIndex",
+    "get_poi_index",
+    "CircuitBreaker",
+    "get_circuit_breaker",
+    "breaker_stats",
+    "AMapRateScheduler",
+    "TokenBucket",
+    "get_rate_scheduler",
+    "SingleFlight",
+    "get_flight_group",
+    "singleflight_stats",
+    "TransitGraph",
+    "get_transit_graph",
+]
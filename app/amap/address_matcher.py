@@ -0,0 +1,134 @@
+"""地址文本的多模式匹配。
+
+简称映射、城市提示与模糊词检测原来在每次调用时重建词表并逐词做子串查找，耗时随词表
+线性增长。这里在导入时把词表编译为 Aho-Corasick 自动机（已展开为确定性转移表），
+扫描一遍输入即可得到全部出现的词（含重叠出现，如 "大学校区" 同时命中 "大学" 与
+"学校"），耗时只与输入长度有关。
+"""
+
+import re
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+
+class PatternMatcher:
+    """Aho-Corasick 多模式匹配器，结果按模式定义顺序返回"""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns: Tuple[str, ...] = tuple(dict.fromkeys(p for p in patterns if p))
+        # 模式只可能出现在由模式字符组成、长度不短于最短模式的连续片段中；
+        # 先用正则（C 实现）切出这些片段，自动机只扫描片段，地址其余部分直接跳过
+        alphabet = "".join(sorted({ch for p in self.patterns for ch in p}))
+        shortest = min((len(p) for p in self.patterns), default=1)
+        self._segments = re.compile(f"[{re.escape(alphabet)}]{{{shortest},}}") if alphabet else None
+        # 转移表只保存通往非根状态的边；输出为模式下标
+        self._delta: List[Dict[str, int]] = [{}]
+        self._output: List[Tuple[int, ...]] = [()]
+        self._build()
+
+    def _build(self) -> None:
+        children: List[Dict[str, int]] = [{}]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = children[state].get(ch)
+                if nxt is None:
+                    nxt = len(children)
+                    children[state][ch] = nxt
+                    children.append({})
+                    self._output.append(())
+                state = nxt
+            self._output[state] += (index,)
+
+        # 确定性转移 = 自身子节点 + 失败状态的转移；根的转移是所有状态的公共后备，不复制
+        root = children[0]
+        self._delta = [dict() for _ in children]
+        self._delta[0] = root
+        fail = [0] * len(children)
+        queue = deque(root.values())
+        while queue:
+            state = queue.popleft()
+            inherited = self._delta[fail[state]]
+            delta = dict(inherited) if fail[state] else {}
+            for ch, nxt in children[state].items():
+                fail[nxt] = inherited.get(ch) or root.get(ch, 0)
+                self._output[nxt] += self._output[fail[nxt]]
+                delta[ch] = nxt
+                queue.append(nxt)
+            self._delta[state] = delta
+
+    def matches(self, text: str) -> List[str]:
+        """返回 text 中出现过的全部模式（含重叠出现），按模式定义顺序去重"""
+        if not text or self._segments is None:
+            return []
+        delta, output = self._delta, self._output
+        root = delta[0]
+        found: Tuple[int, ...] = ()
+        for segment in self._segments.findall(text):
+            state = 0
+            for ch in segment:
+                state = delta[state].get(ch) or root.get(ch, 0)
+                if output[state]:
+                    found += output[state]
+        if not found:
+            return []
+        if len(found) == 1:
+            return [self.patterns[found[0]]]
+        return [self.patterns[i] for i in sorted(set(found))]
+
+
+# 常见高校简称 -> 带省市区的查询词（完整匹配）
+ALIAS_TO_FULLNAME: Dict[str, str] = {
+    "北大": "北京市海淀区北京大学",
+    "清华": "北京市海淀区清华大学",
+    "人大": "北京市海淀区中国人民大学",
+    "北师大": "北京市海淀区北京师范大学",
+    "复旦": "上海市杨浦区复旦大学",
+    "上交": "上海市闵行区上海交通大学",
+    "浙大": "浙江省杭州市浙江大学",
+    "中大": "广东省广州市中山大学",
+    "华工": "广东省广州市华南理工大学",
+    "华科": "湖北省武汉市华中科技大学",
+}
+
+# 用于 citylimit 的城市提示
+CITY_KEYWORDS: Tuple[str, ...] = (
+    "北京", "上海", "广州", "深圳", "杭州", "南京", "武汉", "成都", "西安", "天津",
+    "重庆", "苏州", "长沙", "郑州", "济南", "青岛", "大连", "厦门", "福州", "昆明",
+)
+
+# 只输入这些城市名时提示地址过于宽泛
+MAJOR_CITIES: FrozenSet[str] = frozenset(
+    ("北京", "上海", "广州", "深圳", "杭州", "南京", "武汉", "成都", "西安", "天津")
+)
+
+# 模糊词 -> 输入建议（按此顺序输出）
+VAGUE_TERM_SUGGESTIONS: Dict[str, str] = {
+    "大学": "**请输入完整大学名称**，如 '北京大学'、'清华大学'、'复旦大学'",
+    "学校": "**请输入具体学校全名**，如 '北京市第一中学'、'上海交通大学附属中学'",
+    "医院": "**请输入完整医院名称**，如 '北京协和医院'、'上海华山医院'",
+    "商场": "**请输入具体商场名称**，如 '王府井百货大楼'、'上海环球港'",
+    "火车站": "**请输入完整站名**，如 '北京站'、'上海虹桥站'、'广州南站'",
+    "机场": "**请输入完整机场名称**，如 '北京首都国际机场'、'上海浦东国际机场'",
+    "公园": "**请输入具体公园名称**，如 '颐和园'、'中山公园'、'西湖公园'",
+    "广场": "**请输入具体广场名称**，如 '天安门广场'、'人民广场'",
+    "地铁站": "**请输入完整地铁站名**，如 '中关村地铁站'、'人民广场地铁站'",
+    "购物中心": "**请输入具体购物中心名称**，如 '北京apm'、'上海iapm'",
+}
+
+CITY_MATCHER = PatternMatcher(CITY_KEYWORDS)
+VAGUE_TERM_MATCHER = PatternMatcher(VAGUE_TERM_SUGGESTIONS)
+
+
+def cities_in(address: str) -> List[str]:
+    """地址本身或其简称展开后出现的城市，按 CITY_KEYWORDS 顺序"""
+    fullname = ALIAS_TO_FULLNAME.get(address.strip())
+    if fullname:
+        # 换行不在任何模式中，两段之间不会拼出跨界匹配
+        address = f"{address}\n{fullname}"
+    return CITY_MATCHER.matches(address)
+
+
+def vague_terms_in(address: str) -> List[str]:
+    """地址中出现的模糊词，按 VAGUE_TERM_SUGGESTIONS 的顺序"""
+    return VAGUE_TERM_MATCHER.matches(address)
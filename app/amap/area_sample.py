@@ -0,0 +1,79 @@
+"""区域 POI 样本：一次大半径周边搜索，本地回答多个中心点的计数查询。
+
+智能中心点的各个候选点相距不过几公里，逐个调用周边搜索时结果大量重叠。这里以几何
+中心为圆心按类别各取一次数（可多页），把结果视为一个“完整圆盘”（与
+app.amap.poi_cells 相同：未截断时为取数半径，截断时为最远一条结果的距离），
+再用候选点 × POI 的距离矩阵一次算出所有候选点半径内的 POI 数。
+
+与直接调用高德等价的条件同 poi_cells.query_entries：查询圆落在完整圆盘内，或
+最近 cap 条结果都落在圆盘内（计数已封顶）。不满足时由调用方改为单独搜索。
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from app.amap import poi_cells
+from app.amap.center import as_lnglat_array, project
+
+
+class AreaSample:
+    """以 (lng, lat) 为圆心、complete_radius 米内完整的一类 POI"""
+
+    def __init__(self, lng: float, lat: float, complete_radius: float, pois: List[Dict]) -> None:
+        self.lng = lng
+        self.lat = lat
+        self.complete_radius = complete_radius
+        points = []
+        seen = set()
+        for poi in pois:
+            key = poi.get("id") or f"{poi.get('name')}@{poi.get('location')}"
+            try:
+                lng_str, lat_str = poi.get("location", "").split(",")
+                point = (float(lng_str), float(lat_str))
+            except (ValueError, AttributeError):
+                continue
+            if key not in seen:
+                seen.add(key)
+                points.append(point)
+        # 以样本圆心为原点的平面坐标（米）
+        self._xy = (
+            project(np.asarray(points, dtype=np.float64), origin=(lng, lat))[0]
+            if points else np.empty((0, 2))
+        )
+
+    @classmethod
+    def from_fetch(cls, center: str, fetch_radius: int, max_pois: int, pois: List[Dict]) -> "AreaSample":
+        """由一次（多页）取数结果构造；取满 max_pois 条视为截断"""
+        entry = poi_cells.build_entry(center, fetch_radius, max_pois, pois)
+        return cls(entry["lng"], entry["lat"], entry["complete_radius"], entry["pois"])
+
+    def __len__(self) -> int:
+        return len(self._xy)
+
+    def counts(
+        self, candidates: Iterable[Tuple[float, float]], radius: float, cap: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """各候选点 radius 米内的 POI 数（不超过 cap），以及该计数是否与直接搜索等价
+
+        Returns:
+            (counts, exact): 形状均为 (候选数,)
+        """
+        xy, _ = project(as_lnglat_array(candidates), origin=(self.lng, self.lat))
+        safe_radius = self.complete_radius - np.hypot(xy[:, 0], xy[:, 1])
+        if not len(self._xy):
+            return np.zeros(len(xy), dtype=np.int64), safe_radius >= radius
+
+        # 候选点 × POI 距离矩阵
+        dist = np.hypot(
+            xy[:, 0, None] - self._xy[None, :, 0],
+            xy[:, 1, None] - self._xy[None, :, 1],
+        )
+        within = (dist <= radius).sum(axis=1)
+        counts = np.minimum(within, cap)
+        exact = safe_radius >= radius
+        if cap <= dist.shape[1]:
+            # 第 cap 近的 POI 仍在完整圆盘内时，最近 cap 条与直接搜索一致
+            kth = np.partition(dist, cap - 1, axis=1)[:, cap - 1]
+            exact |= (within >= cap) & (kth <= safe_radius)
+        return counts, exact
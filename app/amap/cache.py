@@ -0,0 +1,133 @@
+"""进程级高德结果缓存（LRU + TTL + 字节预算）。
+
+推荐器每个请求都会新建实例，实例级缓存几乎不会命中；这里的缓存由所有推荐器实例
+与 Agent 工具共享。容量按估算字节数而不是条目数控制，便于对照实例内存上限调整。
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.logger import logger
+
+
+def estimate_size(obj: Any) -> int:
+    """递归估算对象占用的字节数（dict / list / tuple / str / 数值）"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            stack.extend(item)
+    return total
+
+
+class LRUCache:
+    """带 TTL 与字节预算的 LRU 缓存"""
+
+    def __init__(self, name: str, max_bytes: int, default_ttl: float) -> None:
+        self.name = name
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        # key -> (value, expires_at, size)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return value
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """读取未过期的值，不更新 LRU 顺序与命中统计"""
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            logger.debug(f"缓存 {self.name} 跳过过大的条目: {size} bytes")
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        self._entries[key] = (value, expires_at, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self._stats["evictions"] += 1
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+# 默认预算：地理编码结果小且稳定（POI 结果由 app.amap.poi_index 管理）
+DEFAULT_CACHE_SETTINGS: Dict[str, Dict[str, float]] = {
+    "geocode": {"max_bytes": 2 * 1024 * 1024, "ttl": 24 * 3600},
+    "travel_time": {"max_bytes": 1024 * 1024, "ttl": 1800},
+}
+
+_caches: Dict[str, LRUCache] = {}
+
+
+def get_cache(name: str) -> LRUCache:
+    """获取进程级共享缓存（预算来自 config.toml 的 [amap.cache.<name>]）"""
+    cache = _caches.get(name)
+    if cache is None:
+        settings = dict(DEFAULT_CACHE_SETTINGS.get(name, {"max_bytes": 1024 * 1024, "ttl": 600}))
+        try:
+            from app.config import config
+
+            if config.amap is not None and name in config.amap.cache:
+                settings.update(config.amap.cache[name].model_dump())
+        except Exception as e:
+            logger.warning(f"读取高德缓存配置失败，使用默认预算: {e}")
+        cache = LRUCache(name, max_bytes=int(settings["max_bytes"]), default_ttl=float(settings["ttl"]))
+        _caches[name] = cache
+    return cache
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """返回所有共享缓存的命中/淘汰统计"""
+    return {name: cache.stats() for name, cache in _caches.items()}
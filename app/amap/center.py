@@ -0,0 +1,257 @@
+"""多人会面中心点计算（NumPy 向量化）。
+
+坐标先投影到以参与者为中心的局部平面（单位：米，等距圆柱投影，城市尺度误差远小于
+POI 定位误差），在平面上求解后再反投影回经纬度。支持三种目标：
+
+- median：几何中位数（Weiszfeld 迭代），所有人直线距离之和最小
+- minimax：最小覆盖圆圆心，最远参与者的距离最小
+- midpoint：原有算法，三人及以上取经纬度算术平均（默认）
+
+两人时三种目标的解都是两点中点，统一返回球面中点（大圆中点）。
+"""
+
+import math
+import random
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+
+MEDIAN = "median"
+MINIMAX = "minimax"
+MIDPOINT = "midpoint"
+OBJECTIVES = (MEDIAN, MINIMAX, MIDPOINT)
+
+# Weiszfeld：距离总和的相对改进阈值、最大迭代次数与超松弛系数
+MEDIAN_RTOL = 1e-7
+MEDIAN_MAX_ITER = 200
+MEDIAN_RELAXATION = 1.5
+# 不超过该人数时预先检查每个输入点是否即为几何中位数（n x n 矩阵）
+_VERTEX_CHECK_ALL = 64
+# 两点距离小于该值（米）视为同一点
+_SAME_POINT_M = 1e-3
+# 最小覆盖圆判定点在圆内时的容差（米）
+_CIRCLE_EPS_M = 1e-6
+# 超过该点数时先用 16 个方向的极值点剔除内部点
+_HULL_FILTER_MIN_POINTS = 32
+_HULL_DIRECTIONS = np.array([
+    np.cos(np.linspace(0.0, 2.0 * np.pi, 16, endpoint=False)),
+    np.sin(np.linspace(0.0, 2.0 * np.pi, 16, endpoint=False)),
+])
+
+
+def as_lnglat_array(coordinates: Iterable[Tuple[float, float]]) -> np.ndarray:
+    """(lng, lat) 序列 -> 形状 (n, 2) 的 float64 数组"""
+    points = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+    if points.size == 0:
+        raise ValueError("至少需要一个坐标来计算中心点。")
+    return points
+
+
+def project(points: np.ndarray, origin: Optional[Tuple[float, float]] = None) -> Tuple[np.ndarray, Tuple[float, float]]:
+    """经纬度 -> 以 origin（默认各点经纬度均值）为原点的局部平面坐标（米）"""
+    if origin is None:
+        origin = (float(points[:, 0].mean()), float(points[:, 1].mean()))
+    lng0, lat0 = origin
+    scale_x = EARTH_RADIUS_M * np.cos(np.radians(lat0))
+    xy = np.empty_like(points)
+    xy[:, 0] = np.radians(points[:, 0] - lng0) * scale_x
+    xy[:, 1] = np.radians(points[:, 1] - lat0) * EARTH_RADIUS_M
+    return xy, origin
+
+
+def unproject(xy: np.ndarray, origin: Tuple[float, float]) -> np.ndarray:
+    """局部平面坐标（米）-> 经纬度"""
+    lng0, lat0 = origin
+    scale_x = EARTH_RADIUS_M * np.cos(np.radians(lat0))
+    xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+    lnglat = np.empty_like(xy)
+    lnglat[:, 0] = lng0 + np.degrees(xy[:, 0] / scale_x)
+    lnglat[:, 1] = lat0 + np.degrees(xy[:, 1] / EARTH_RADIUS_M)
+    return lnglat
+
+
+def spherical_midpoint(points: np.ndarray) -> np.ndarray:
+    """各点单位向量之和的方向（球面中点），返回 (lng, lat)"""
+    lng = np.radians(points[:, 0])
+    lat = np.radians(points[:, 1])
+    cos_lat = np.cos(lat)
+    x = (cos_lat * np.cos(lng)).sum()
+    y = (cos_lat * np.sin(lng)).sum()
+    z = np.sin(lat).sum()
+    return np.degrees([np.arctan2(y, x), np.arctan2(z, np.hypot(x, y))])
+
+
+def _optimal_vertex(z: np.ndarray, candidates: np.ndarray, tol: float) -> Optional[int]:
+    """返回满足最优条件的输入点下标：其余点指向它的单位向量合力不超过它的重数"""
+    diff = z[None, :] - z[candidates, None]
+    dist = np.abs(diff)
+    same = dist < tol
+    with np.errstate(divide="ignore", invalid="ignore"):
+        unit = np.where(same, 0.0, diff / dist)
+    optimal = np.abs(unit.sum(axis=1)) <= same.sum(axis=1)
+    hits = np.flatnonzero(optimal)
+    return int(candidates[hits[0]]) if hits.size else None
+
+
+def geometric_median(
+    xy: np.ndarray,
+    rtol: float = MEDIAN_RTOL,
+    max_iter: int = MEDIAN_MAX_ITER,
+    relaxation: float = MEDIAN_RELAXATION,
+) -> np.ndarray:
+    """Weiszfeld 迭代求几何中位数，距离总和的相对改进小于 rtol 时停止
+
+    - 使用超松弛步长（Ostresh，1 <= relaxation < 2 时目标单调下降）加速收敛
+    - 最优解恰为某个输入点时 Weiszfeld 收敛极慢，因此先（小规模时对全部点、
+      否则对迭代结果最近的点）检查输入点的最优条件，满足则直接返回该点
+    """
+    z = xy[:, 0] + 1j * xy[:, 1]
+    if len(z) <= _VERTEX_CHECK_ALL:
+        vertex = _optimal_vertex(z, np.arange(len(z)), _SAME_POINT_M)
+        if vertex is not None:
+            return xy[vertex].copy()
+
+    estimate = z.mean()
+    previous = np.inf
+    for _ in range(max_iter):
+        dist = np.abs(z - estimate)
+        total = dist.sum()
+        if previous - total <= rtol * total:
+            break
+        previous = total
+        weights = 1.0 / np.maximum(dist, _SAME_POINT_M)
+        target = (z * weights).sum() / weights.sum()
+        estimate = estimate + relaxation * (target - estimate)
+
+    if len(z) > _VERTEX_CHECK_ALL:
+        nearest = int(np.argmin(np.abs(z - estimate)))
+        if _optimal_vertex(z, np.array([nearest]), _SAME_POINT_M) is not None:
+            return xy[nearest].copy()
+    return np.array([estimate.real, estimate.imag])
+
+
+def _hull_candidates(xy: np.ndarray) -> np.ndarray:
+    """去掉严格位于若干方向极值点所围凸多边形内部的点（它们不可能在最小覆盖圆上）"""
+    if len(xy) <= _HULL_FILTER_MIN_POINTS:
+        return xy
+    extreme = xy[np.argmax(xy @ _HULL_DIRECTIONS, axis=0)]
+    # 极值点按方向角逆时针排列，去掉相邻重复
+    distinct = np.any(extreme != np.roll(extreme, 1, axis=0), axis=1)
+    polygon = extreme[distinct]
+    if len(polygon) < 3:
+        return xy
+    start = polygon
+    edge = np.roll(polygon, -1, axis=0) - start
+    cross = (
+        edge[:, 0, None] * (xy[None, :, 1] - start[:, 1, None])
+        - edge[:, 1, None] * (xy[None, :, 0] - start[:, 0, None])
+    )
+    inside = (cross > _CIRCLE_EPS_M).all(axis=0)
+    return xy[~inside]
+
+
+Circle = Tuple[float, float, float]
+
+
+def _in_circle(circle: Circle, x: float, y: float) -> bool:
+    return math.hypot(x - circle[0], y - circle[1]) <= circle[2] + _CIRCLE_EPS_M
+
+
+def _diameter_circle(ax: float, ay: float, bx: float, by: float) -> Circle:
+    cx, cy = (ax + bx) / 2.0, (ay + by) / 2.0
+    return cx, cy, math.hypot(ax - cx, ay - cy)
+
+
+def _circumcircle(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> Optional[Circle]:
+    d = 2.0 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
+    if d == 0.0:
+        return None
+    a2, b2, c2 = ax * ax + ay * ay, bx * bx + by * by, cx * cx + cy * cy
+    ux = (a2 * (by - cy) + b2 * (cy - ay) + c2 * (ay - by)) / d
+    uy = (a2 * (cx - bx) + b2 * (ax - cx) + c2 * (bx - ax)) / d
+    return ux, uy, math.hypot(ax - ux, ay - uy)
+
+
+def _circle_two_boundary(points: List[Tuple[float, float]], p: Tuple[float, float], q: Tuple[float, float]) -> Circle:
+    """p、q 在圆周上、覆盖 points 的最小圆"""
+    (px, py), (qx, qy) = p, q
+    circle = _diameter_circle(px, py, qx, qy)
+    # (cx, cy, r, 圆心相对 pq 的偏移)
+    left: Optional[Tuple[float, float, float, float]] = None
+    right: Optional[Tuple[float, float, float, float]] = None
+    for rx, ry in points:
+        if _in_circle(circle, rx, ry):
+            continue
+        # 圆心在 pq 中垂线上；左侧点把圆心推向左，右侧点推向右，各取推得最远的一个
+        cross = (qx - px) * (ry - py) - (qy - py) * (rx - px)
+        c = _circumcircle(px, py, qx, qy, rx, ry)
+        if c is None:
+            continue
+        offset = (qx - px) * (c[1] - py) - (qy - py) * (c[0] - px)
+        if cross > 0 and (left is None or offset > left[3]):
+            left = (*c, offset)
+        elif cross < 0 and (right is None or offset < right[3]):
+            right = (*c, offset)
+    if left is None and right is None:
+        return circle
+    if left is None:
+        return right[:3]
+    if right is None:
+        return left[:3]
+    return left[:3] if left[2] <= right[2] else right[:3]
+
+
+def _circle_one_boundary(points: List[Tuple[float, float]], p: Tuple[float, float]) -> Circle:
+    """p 在圆周上、覆盖 points 的最小圆"""
+    circle: Circle = (p[0], p[1], 0.0)
+    for i, (qx, qy) in enumerate(points):
+        if _in_circle(circle, qx, qy):
+            continue
+        if circle[2] == 0.0:
+            circle = _diameter_circle(p[0], p[1], qx, qy)
+        else:
+            circle = _circle_two_boundary(points[:i], p, (qx, qy))
+    return circle
+
+
+def minimax_center(xy: np.ndarray, seed: int = 0) -> np.ndarray:
+    """最小覆盖圆圆心：先向量化剔除内部点，再对剩余点做 Welzl 随机增量"""
+    points = [(float(x), float(y)) for x, y in _hull_candidates(xy)]
+    random.Random(seed).shuffle(points)
+    circle: Optional[Circle] = None
+    for i, (x, y) in enumerate(points):
+        if circle is None or not _in_circle(circle, x, y):
+            circle = _circle_one_boundary(points[:i], (x, y))
+    return np.array([circle[0], circle[1]])
+
+
+def compute_center(coordinates: Iterable[Tuple[float, float]], objective: str = MIDPOINT) -> Tuple[float, float]:
+    """按目标计算中心点，返回 (lng, lat)"""
+    if objective not in OBJECTIVES:
+        raise ValueError(f"未知的中心点算法: {objective}，可选 {', '.join(OBJECTIVES)}")
+    points = as_lnglat_array(coordinates)
+    if len(points) == 1:
+        return float(points[0, 0]), float(points[0, 1])
+    if len(points) == 2:
+        lng, lat = spherical_midpoint(points)
+        return float(lng), float(lat)
+    if objective == MIDPOINT:
+        lng, lat = points.mean(axis=0)
+        return float(lng), float(lat)
+
+    xy, origin = project(points)
+    if objective == MEDIAN:
+        solution = geometric_median(xy)
+    else:
+        solution = minimax_center(xy)
+    lng, lat = unproject(solution, origin)[0]
+    return float(lng), float(lat)
+
+
+def distances_m(center: Tuple[float, float], coordinates: Iterable[Tuple[float, float]]) -> np.ndarray:
+    """中心点到各坐标的局部平面距离（米）"""
+    points = as_lnglat_array(coordinates)
+    xy, _ = project(points, origin=center)
+    return np.hypot(xy[:, 0], xy[:, 1])
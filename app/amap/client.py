@@ -0,0 +1,253 @@
+"""高德 Web 服务 API 共享 HTTP 客户端。
+
+每个事件循环只维护一个长连接 `aiohttp.ClientSession`，复用 TCP/TLS 连接并缓存 DNS，
+避免每次地理编码 / POI 搜索都重新握手。推荐器与 Agent 工具都通过 `get_amap_client()`
+访问同一个实例，FastAPI 关闭时调用 `close_amap_client()` 释放连接。
+请求经过按端点的熔断器与可选的对冲请求（见 app.amap.resilience）。
+"""
+
+import asyncio
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+import aiohttp
+
+from app.amap.resilience import HedgingPolicy, LatencyTracker, get_circuit_breaker, load_hedging_policy
+from app.amap.scheduler import get_rate_scheduler
+from app.exceptions import AMapCircuitOpenError, AMapError
+from app.logger import logger
+
+# 当前请求的上游调用计数（端点 -> 次数），由 track_upstream_calls() 设置
+_upstream_calls: ContextVar[Optional[Dict[str, int]]] = ContextVar("amap_upstream_calls", default=None)
+
+
+@contextmanager
+def track_upstream_calls() -> Iterator[Dict[str, int]]:
+    """统计代码块内（含其派生的任务）实际发往高德的请求数，按端点计数"""
+    counter: Dict[str, int] = {}
+    token = _upstream_calls.set(counter)
+    try:
+        yield counter
+    finally:
+        _upstream_calls.reset(token)
+
+
+class AMapClient:
+    """进程级高德 API 客户端（每个事件循环一个连接池）"""
+
+    BASE_URL = "https://restapi.amap.com"
+
+    # 端点名称 -> 路径
+    ENDPOINTS: Dict[str, str] = {
+        "geocode": "/v3/geocode/geo",
+        "place_text": "/v3/place/text",
+        "place_around": "/v3/place/around",
+        "distance": "/v3/distance",
+        "bus_linename": "/v3/bus/linename",
+    }
+
+    # 连接池参数：Render 实例内存有限，连接数保持在较小范围
+    CONNECTION_LIMIT = 32
+    CONNECTION_LIMIT_PER_HOST = 16
+    DNS_CACHE_TTL = 300  # 秒
+    KEEPALIVE_TIMEOUT = 30  # 秒
+    REQUEST_TIMEOUT = 10  # 秒
+    CONNECT_TIMEOUT = 3  # 秒
+
+    def __init__(self) -> None:
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._stats: Dict[str, int] = {
+            "requests": 0,
+            "errors": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+            "sessions_created": 0,
+            "short_circuited": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+        }
+        self._latency: Dict[str, LatencyTracker] = {}
+        self._hedging: Optional[HedgingPolicy] = None
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """通过 aiohttp trace 钩子统计连接复用情况"""
+        trace_config = aiohttp.TraceConfig()
+
+        def _counter(key: str):
+            async def _inc(session, ctx, params):
+                self._stats[key] += 1
+            return _inc
+
+        trace_config.on_connection_create_end.append(_counter("connections_created"))
+        trace_config.on_connection_reuseconn.append(_counter("connections_reused"))
+        trace_config.on_dns_cache_hit.append(_counter("dns_cache_hits"))
+        trace_config.on_dns_cache_miss.append(_counter("dns_cache_misses"))
+        return trace_config
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.CONNECTION_LIMIT,
+                limit_per_host=self.CONNECTION_LIMIT_PER_HOST,
+                ttl_dns_cache=self.DNS_CACHE_TTL,
+                use_dns_cache=True,
+                keepalive_timeout=self.KEEPALIVE_TIMEOUT,
+            )
+            session = aiohttp.ClientSession(
+                base_url=self.BASE_URL,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=self.REQUEST_TIMEOUT, connect=self.CONNECT_TIMEOUT
+                ),
+                trace_configs=[self._build_trace_config()],
+            )
+            self._sessions[loop] = session
+            self._stats["sessions_created"] += 1
+        return session
+
+    async def get_json(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """请求高德端点并返回 JSON
+
+        端点熔断时直接抛出 `AMapCircuitOpenError`；启用对冲时，首个请求超过 p95 耗时
+        仍未返回会再发一个相同请求，取先成功的结果。
+
+        Args:
+            endpoint: `ENDPOINTS` 中的端点名称，如 "geocode"
+            params: 查询参数（包含 key）
+
+        Raises:
+            AMapError: HTTP 状态码非 200、网络异常或端点熔断中
+        """
+        breaker = get_circuit_breaker(endpoint)
+        if not breaker.allow():
+            self._stats["short_circuited"] += 1
+            raise AMapCircuitOpenError(f"高德API {endpoint} 熔断中，跳过请求", endpoint=endpoint)
+        settled = False
+        try:
+            if self._get_hedging().applies_to(endpoint):
+                data = await self._hedged_request(endpoint, params)
+            else:
+                data = await self._request(endpoint, params)
+        except AMapError:
+            breaker.record_failure()
+            settled = True
+            raise
+        else:
+            breaker.record_success()
+            settled = True
+            return data
+        finally:
+            if not settled:
+                breaker.release()
+
+    async def _hedged_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """首个请求超过延迟阈值未返回时发出对冲请求，返回先成功的一个"""
+        delay = self._get_hedging().delay(self._latency_tracker(endpoint))
+        first = asyncio.ensure_future(self._request(endpoint, params))
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self._stats["hedged"] += 1
+                tasks.append(asyncio.ensure_future(self._request(endpoint, params)))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self._stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # 标记落败请求的异常已读取，避免未处理异常告警
+
+    async def _request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """发出一次请求：先经过限流调度器，上游返回 QPS 超限时通知调度器清空令牌桶"""
+        path = self.ENDPOINTS[endpoint]
+        scheduler = get_rate_scheduler()
+        await scheduler.acquire(endpoint)
+        session = self._get_session()
+        self._stats["requests"] += 1
+        counter = _upstream_calls.get()
+        if counter is not None:
+            counter[endpoint] = counter.get(endpoint, 0) + 1
+        started = time.monotonic()
+        try:
+            async with session.get(path, params=params) as response:
+                if response.status != 200:
+                    self._stats["errors"] += 1
+                    raise AMapError(
+                        f"高德API请求失败: {response.status}", endpoint=endpoint, status=response.status
+                    )
+                # 高德部分错误响应的 Content-Type 不是 application/json
+                data = await response.json(content_type=None)
+            self._latency_tracker(endpoint).observe(time.monotonic() - started)
+            if data.get("info") == "CUQPS_HAS_EXCEEDED_THE_LIMIT":
+                scheduler.report_limit_exceeded(endpoint)
+            return data
+        except AMapError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self._stats["errors"] += 1
+            raise AMapError(f"高德API网络异常: {e!r}", endpoint=endpoint) from e
+
+    def _get_hedging(self) -> HedgingPolicy:
+        if self._hedging is None:
+            self._hedging = load_hedging_policy()
+        return self._hedging
+
+    def _latency_tracker(self, endpoint: str) -> LatencyTracker:
+        tracker = self._latency.get(endpoint)
+        if tracker is None:
+            tracker = LatencyTracker()
+            self._latency[endpoint] = tracker
+        return tracker
+
+    def latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """各端点最近响应耗时分位数（对冲等待时间的依据）"""
+        return {endpoint: tracker.stats() for endpoint, tracker in self._latency.items()}
+
+    def stats(self) -> Dict[str, int]:
+        """返回连接复用、熔断跳过与对冲请求统计"""
+        return dict(self._stats)
+
+    async def close(self) -> None:
+        """关闭当前事件循环中的连接池"""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+            logger.info(f"高德API连接池已关闭: {self._stats}")
+
+
+_amap_client: Optional[AMapClient] = None
+
+
+def get_amap_client() -> AMapClient:
+    """获取进程级共享的高德客户端"""
+    global _amap_client
+    if _amap_client is None:
+        _amap_client = AMapClient()
+    return _amap_client
+
+
+async def close_amap_client() -> None:
+    """关闭共享客户端（FastAPI shutdown 时调用）"""
+    if _amap_client is not None:
+        await _amap_client.close()
@@ -0,0 +1,132 @@
+"""多中心分组：把大量参与者按位置分成 k 组，每组一个会面中心（NumPy 向量化）。
+
+团建等 20~200 人分布在整个城市时，一个中心点对大多数人都不近。这里在局部平面
+（app.amap.center.project，单位米）上做 k-means：
+
+1. k-means++ 选初始中心，Lloyd 迭代（点 × 中心距离矩阵一次算出，按标签求均值）
+2. 以不同随机种子重复 N_INIT 次，取“所有人到本组中心的最远距离”最小的一次，
+   使各组的出行距离尽量均衡，而不是只让平方和最小
+3. 对选中的分组按中心点目标（median / minimax / midpoint，见 compute_center）
+   重新计算各组中心并重新分配，直到分组不再变化
+
+分组按人数从多到少排列。
+"""
+
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from app.amap.center import MEDIAN, as_lnglat_array, compute_center, project
+
+N_INIT = 8
+MAX_ITER = 50
+REFINE_ITER = 10
+
+
+@dataclass
+class Cluster:
+    """一组参与者（members 为输入坐标的下标）及其会面中心"""
+
+    members: List[int]
+    center: Tuple[float, float]
+    max_distance: float
+    mean_distance: float
+
+
+def _plane_distances(xy: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """点 × 中心的平面距离矩阵（米）"""
+    return np.hypot(xy[:, None, 0] - centers[None, :, 0], xy[:, None, 1] - centers[None, :, 1])
+
+
+def _kmeans_plus_plus(xy: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """k-means++ 初始中心：每次按到已选中心最近距离的平方加权抽样"""
+    centers = [xy[rng.integers(len(xy))]]
+    nearest = np.sum((xy - centers[0]) ** 2, axis=1)
+    for _ in range(1, k):
+        total = nearest.sum()
+        index = rng.choice(len(xy), p=nearest / total) if total > 0 else rng.integers(len(xy))
+        centers.append(xy[index])
+        nearest = np.minimum(nearest, np.sum((xy - xy[index]) ** 2, axis=1))
+    return np.array(centers)
+
+
+def kmeans(xy: np.ndarray, k: int, rng: np.random.Generator, max_iter: int = MAX_ITER) -> Tuple[np.ndarray, np.ndarray]:
+    """Lloyd 迭代，返回 (各点标签, 各组中心)；空组改用离所属中心最远的点重新开始"""
+    centers = _kmeans_plus_plus(xy, k, rng)
+    labels = np.full(len(xy), -1)
+    for _ in range(max_iter):
+        distances = _plane_distances(xy, centers)
+        new_labels = distances.argmin(axis=1)
+        counts = np.bincount(new_labels, minlength=k)
+        for empty in np.flatnonzero(counts == 0):
+            farthest = int(distances[np.arange(len(xy)), new_labels].argmax())
+            new_labels[farthest] = empty
+            distances[farthest] = 0.0
+            counts = np.bincount(new_labels, minlength=k)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        # 按标签求均值：对每组的 x、y 分别加权计数
+        centers = np.stack([
+            np.bincount(labels, weights=xy[:, 0], minlength=k),
+            np.bincount(labels, weights=xy[:, 1], minlength=k),
+        ], axis=1) / counts[:, None]
+    return labels, centers
+
+
+def _worst_distance(xy: np.ndarray, labels: np.ndarray, centers: np.ndarray) -> float:
+    return float(np.hypot(*(xy - centers[labels]).T).max())
+
+
+def _group_centers(
+    points: np.ndarray, labels: np.ndarray, k: int, objective: str, origin: Tuple[float, float]
+) -> Tuple[List[Tuple[float, float]], np.ndarray]:
+    """各组按中心点目标计算的中心：(经纬度列表, 平面坐标)"""
+    centers_lnglat = [compute_center(points[labels == g], objective) for g in range(k)]
+    return centers_lnglat, project(np.array(centers_lnglat), origin=origin)[0]
+
+
+def cluster_participants(
+    coordinates: Sequence[Tuple[float, float]],
+    k: int,
+    objective: str = MEDIAN,
+    n_init: int = N_INIT,
+    seed: int = 0,
+) -> List[Cluster]:
+    """把参与者分成 k 组（k 不超过人数），返回各组成员与会面中心"""
+    points = as_lnglat_array(coordinates)
+    k = max(1, min(k, len(points)))
+    xy, origin = project(points)
+    rng = np.random.default_rng(seed)
+
+    # 多次随机初始化，取最远成员距离最小的一次
+    best_labels, best_worst = None, np.inf
+    for _ in range(n_init if k > 1 else 1):
+        labels, centers = kmeans(xy, k, rng)
+        worst = _worst_distance(xy, labels, centers)
+        if worst < best_worst:
+            best_labels, best_worst = labels, worst
+
+    # 按中心点目标重算各组中心并重新分配（出现空组时保留上一次的分组）
+    labels = best_labels
+    centers_lnglat, centers = _group_centers(points, labels, k, objective, origin)
+    for _ in range(REFINE_ITER):
+        new_labels = _plane_distances(xy, centers).argmin(axis=1)
+        if np.array_equal(new_labels, labels) or np.bincount(new_labels, minlength=k).min() == 0:
+            break
+        labels = new_labels
+        centers_lnglat, centers = _group_centers(points, labels, k, objective, origin)
+
+    member_distances = np.hypot(*(xy - centers[labels]).T)
+    clusters = []
+    for g in range(k):
+        members = np.flatnonzero(labels == g)
+        clusters.append(Cluster(
+            members=members.tolist(),
+            center=centers_lnglat[g],
+            max_distance=float(member_distances[members].max()),
+            mean_distance=float(member_distances[members].mean()),
+        ))
+    clusters.sort(key=lambda cluster: (-len(cluster.members), cluster.members[0]))
+    return clusters
@@ -0,0 +1,54 @@
+"""经纬度球面距离（haversine），项目内所有距离计算都经过这里。
+
+排序、筛选、城市纠正与智能中心点都需要一批点到另一批点的距离：参与者 × 场所、
+候选中心 × 参与者等。distance_matrix 一次算出整个矩阵（NumPy 向量化），替代逐对调用
+标量函数的 Python 循环；单对距离用 haversine_m，两者公式与地球半径相同，结果一致。
+
+坐标缺失（None）的点对应的行或列为 NaN，与任何距离比较都为 False。
+"""
+
+import math
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+
+Coordinate = Tuple[Optional[float], Optional[float]]
+
+
+def haversine_m(lng1: float, lat1: float, lng2: float, lat2: float) -> float:
+    """两点间球面距离（米）"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def as_radians(coordinates: Iterable[Coordinate]) -> np.ndarray:
+    """(lng, lat) 序列 -> 形状 (n, 2) 的弧度数组，缺失坐标为 NaN"""
+    points = np.array(
+        [(np.nan if lng is None else lng, np.nan if lat is None else lat) for lng, lat in coordinates],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+    return np.radians(points)
+
+
+def distance_matrix(origins: Iterable[Coordinate], destinations: Iterable[Coordinate]) -> np.ndarray:
+    """origins × destinations 的球面距离矩阵（米），形状 (len(origins), len(destinations))"""
+    a = as_radians(origins)
+    b = as_radians(destinations)
+    lng1, lat1 = a[:, 0, None], a[:, 1, None]
+    lng2, lat2 = b[None, :, 0], b[None, :, 1]
+    h = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+
+def distances_from(origin: Coordinate, destinations: Iterable[Coordinate]) -> np.ndarray:
+    """一个点到一组点的距离（米），形状 (len(destinations),)"""
+    return distance_matrix([origin], destinations)[0]
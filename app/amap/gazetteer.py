@@ -0,0 +1,255 @@
+"""离线地名表（gazetteer）：常用地点不经网络直接解析。
+
+随应用发布的 `data/gazetteer.json` 保存 "规范化地名 -> 坐标/城市/行政区"，
+`data/address_aliases.json` 中的简称（北大、国贸……）与全称共用同一条记录。
+`_geocode` 最先查这里，命中时既不访问高德也不查数据库。
+
+数据来源是持久化地理编码缓存中命中最多的地址：
+- 发布前用 `tools/build_gazetteer.py` 从线上缓存导出，写回 data/gazetteer.json
+- 运行时启动阶段 `refresh_from_store()` 把当前库中的热门地址并入内存
+`data/cities.json` 的城市中心用于校验：坐标离所属城市中心过远的缓存结果不收录。
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.amap.distance import haversine_m
+from app.amap.keys import normalize_address
+from app.logger import logger
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_PATH = PROJECT_ROOT / "data" / "gazetteer.json"
+ALIASES_PATH = PROJECT_ROOT / "data" / "address_aliases.json"
+CITIES_PATH = PROJECT_ROOT / "data" / "cities.json"
+
+FORMAT_VERSION = 1
+# 记录距所属城市中心超过该距离时视为误解析（跨城同名地点）
+MAX_CITY_DISTANCE_M = 150000
+
+# 文件中每条记录为数组，字段顺序如下
+_FIELDS = ("lng", "lat", "city", "district", "formatted_address", "province")
+
+
+def _as_text(value: Any) -> str:
+    # 高德对缺失字段返回空列表而不是空字符串
+    return value if isinstance(value, str) else ""
+
+
+def load_aliases(path: Path = ALIASES_PATH) -> Dict[str, str]:
+    """读取简称 -> 全称映射（高校与地标）"""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            payload = json.load(fh)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    aliases: Dict[str, str] = {}
+    for section in ("university_aliases", "landmark_aliases"):
+        for alias, full_name in (payload.get(section) or {}).items():
+            aliases[normalize_address(alias)] = normalize_address(full_name)
+    return aliases
+
+
+def load_city_centers(path: Path = CITIES_PATH) -> Dict[str, Tuple[float, float]]:
+    """读取城市名 -> 城市中心 (lng, lat)"""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            cities = json.load(fh).get("cities", [])
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    centers = {}
+    for city in cities:
+        coords = city.get("coordinates") or {}
+        if city.get("name") and "lng" in coords and "lat" in coords:
+            centers[city["name"]] = (float(coords["lng"]), float(coords["lat"]))
+    return centers
+
+
+def record_from_result(result: Dict[str, Any]) -> Optional[List[Any]]:
+    """把一次地理编码结果压缩为文件中的记录；坐标无效时返回 None"""
+    try:
+        lng_str, lat_str = result["location"].split(",")
+        lng, lat = round(float(lng_str), 6), round(float(lat_str), 6)
+    except (KeyError, ValueError, AttributeError):
+        return None
+    return [
+        lng,
+        lat,
+        _as_text(result.get("city")),
+        _as_text(result.get("district")),
+        _as_text(result.get("formatted_address")),
+        _as_text(result.get("province")),
+    ]
+
+
+def plausible(record: List[Any], city_centers: Dict[str, Tuple[float, float]]) -> bool:
+    """记录所属城市在 cities.json 中时，坐标须在城市中心 MAX_CITY_DISTANCE_M 以内"""
+    city = record[2].rstrip("市")
+    center = city_centers.get(city)
+    if center is None:
+        return True
+    return haversine_m(record[0], record[1], center[0], center[1]) <= MAX_CITY_DISTANCE_M
+
+
+class Gazetteer:
+    """内存中的离线地名表"""
+
+    def __init__(self, records: Optional[Dict[str, List[Any]]] = None,
+                 aliases: Optional[Dict[str, str]] = None, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._records: Dict[str, List[Any]] = dict(records or {})
+        self._aliases: Dict[str, str] = {}
+        # 全称 -> 简称列表：缓存里只有 "北大" 时，输入 "北京大学" 也能命中
+        self._reverse_aliases: Dict[str, List[str]] = {}
+        for alias, full_name in (aliases or {}).items():
+            self.add_alias(alias, full_name)
+        self._stats: Dict[str, int] = {"hits": 0, "alias_hits": 0, "misses": 0, "refreshed": 0}
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_PATH, enabled: bool = True) -> "Gazetteer":
+        """读取地名表文件；文件缺失或损坏时返回只含简称映射的空表"""
+        records: Dict[str, List[Any]] = {}
+        aliases: Dict[str, str] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                payload = json.load(fh)
+            if payload.get("version") == FORMAT_VERSION:
+                records = payload.get("entries") or {}
+                aliases = payload.get("aliases") or {}
+            else:
+                logger.warning(f"离线地名表版本不兼容，忽略: {path}")
+        except FileNotFoundError:
+            logger.info(f"离线地名表不存在，仅使用简称映射: {path}")
+        except json.JSONDecodeError as e:
+            logger.warning(f"离线地名表解析失败: {e}")
+        # 简称表以 data/address_aliases.json 为准
+        aliases.update(load_aliases())
+        gazetteer = cls(records, aliases, enabled=enabled)
+        logger.info(f"离线地名表已加载: {len(records)} 个地点, {len(aliases)} 个简称")
+        return gazetteer
+
+    def add_alias(self, alias: str, full_name: str) -> None:
+        self._aliases[alias] = full_name
+        self._reverse_aliases.setdefault(full_name, []).append(alias)
+
+    def lookup(self, address: str) -> Optional[Dict[str, Any]]:
+        """按地名或简称查找，返回与高德地理编码相同结构的结果"""
+        if not self.enabled:
+            return None
+        key = normalize_address(address)
+        record = self._records.get(key)
+        if record is None:
+            record = self._lookup_alias(key)
+            if record is not None:
+                self._stats["alias_hits"] += 1
+        if record is None:
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        result = dict(zip(_FIELDS, record))
+        lng, lat = result.pop("lng"), result.pop("lat")
+        result.update({"location": f"{lng},{lat}", "name": key, "_source": "gazetteer"})
+        return result
+
+    def _lookup_alias(self, key: str) -> Optional[List[Any]]:
+        full_name = self._aliases.get(key)
+        if full_name is not None and full_name in self._records:
+            return self._records[full_name]
+        for alias in self._reverse_aliases.get(key, ()):
+            if alias in self._records:
+                return self._records[alias]
+        return None
+
+    def add(self, key: str, record: List[Any]) -> None:
+        self._records[normalize_address(key)] = record
+
+    async def refresh_from_store(self, min_hits: int, limit: int) -> int:
+        """把持久化缓存中命中不少于 min_hits 次的地址并入地名表"""
+        if not self.enabled or limit <= 0:
+            return 0
+        try:
+            from app.db import crud
+            from app.db.database import AsyncSessionLocal
+
+            async with AsyncSessionLocal() as session:
+                entries = await crud.list_hot_geocode_entries(session, datetime.utcnow(), limit)
+                rows = [(e.address_key, e.hits, e.payload_json) for e in entries]
+        except Exception as e:
+            logger.warning(f"离线地名表刷新失败: {e}")
+            return 0
+
+        city_centers = load_city_centers()
+        added = 0
+        for address_key, hits, payload_json in rows:
+            if hits < min_hits or address_key in self._records:
+                continue
+            record = record_from_result(json.loads(payload_json))
+            if record is None or not plausible(record, city_centers):
+                continue
+            self._records[address_key] = record
+            added += 1
+        self._stats["refreshed"] += added
+        if added:
+            logger.info(f"离线地名表从持久化缓存并入 {added} 个热门地址")
+        return added
+
+    def to_payload(self) -> Dict[str, Any]:
+        """导出为文件格式"""
+        return {
+            "version": FORMAT_VERSION,
+            "generated_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "fields": list(_FIELDS),
+            "entries": dict(sorted(self._records.items())),
+            "aliases": dict(sorted(self._aliases.items())),
+        }
+
+    def items(self) -> List[Tuple[str, List[Any]]]:
+        return list(self._records.items())
+
+    def __contains__(self, address: str) -> bool:
+        return normalize_address(address) in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "entries": len(self._records), "aliases": len(self._aliases), "enabled": self.enabled}
+
+
+_gazetteer: Optional[Gazetteer] = None
+
+
+def _settings():
+    try:
+        from app.config import config
+
+        return config.amap.gazetteer if config.amap is not None else None
+    except Exception as e:
+        logger.warning(f"读取离线地名表配置失败，使用默认值: {e}")
+        return None
+
+
+def get_gazetteer() -> Gazetteer:
+    """获取进程级离线地名表（首次调用时从 [amap.gazetteer].path 加载）"""
+    global _gazetteer
+    if _gazetteer is None:
+        settings = _settings()
+        path, enabled = DEFAULT_PATH, True
+        if settings is not None:
+            enabled = settings.enabled
+            if settings.path:
+                path = Path(settings.path)
+                if not path.is_absolute():
+                    path = PROJECT_ROOT / path
+        _gazetteer = Gazetteer.load(path, enabled=enabled)
+    return _gazetteer
+
+
+async def refresh_gazetteer_from_store() -> int:
+    """启动时调用：按 [amap.gazetteer] 的阈值并入持久化缓存中的热门地址"""
+    settings = _settings()
+    min_hits, limit = 3, 1000
+    if settings is not None:
+        min_hits, limit = settings.refresh_min_hits, settings.refresh_limit
+    return await get_gazetteer().refresh_from_store(min_hits, limit)
@@ -0,0 +1,172 @@
+"""地理编码持久化缓存（L2），落在应用自带的 SQLite 库中。
+
+内存缓存（L1）随进程重启或多实例部署而清空，地址解析结果却几天甚至几个月都不会变。
+查找顺序为 内存缓存 -> 持久化缓存 -> 高德接口；启动时把命中最多的地址预热进内存。
+数据库不可用时只记录日志并视为未命中，不影响主流程。
+
+结果只保存 STORED_FIELDS 中推荐流程与离线地名表用到的字段。读取是只读查询，
+命中次数先在内存中累计，满 HIT_FLUSH_SIZE 个地址、写入新结果、预热或关闭时
+在一个事务内批量写回。
+"""
+
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from app.logger import logger
+
+# 持久化的字段：坐标、地址与行政区（推荐流程、Agent 工具与离线地名表使用）
+STORED_FIELDS = ("location", "formatted_address", "name", "province", "city", "district", "adcode", "level", "_source")
+# 内存中累计的命中地址数达到该值时写回数据库
+HIT_FLUSH_SIZE = 50
+
+
+class GeocodeStore:
+    """基于 SQLAlchemy 异步会话的地理编码持久化缓存"""
+
+    def __init__(self, enabled: bool = True, ttl: float = 30 * 24 * 3600) -> None:
+        self.enabled = enabled
+        self.ttl = ttl
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0, "writes": 0, "errors": 0, "warmed": 0}
+        # 地址 -> 尚未写回的命中次数
+        self._pending_hits: Dict[str, int] = {}
+
+    async def get(self, address_key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        try:
+            from app.db import crud
+            from app.db.database import AsyncSessionLocal
+
+            async with AsyncSessionLocal() as session:
+                entry = await crud.get_geocode_entry(session, address_key, datetime.utcnow())
+                payload_json = entry.payload_json if entry is not None else None
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"读取地理编码持久化缓存失败: {e}")
+            return None
+        if payload_json is None:
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        self._pending_hits[address_key] = self._pending_hits.get(address_key, 0) + 1
+        if len(self._pending_hits) >= HIT_FLUSH_SIZE:
+            await self.flush_hits()
+        return json.loads(payload_json)
+
+    async def flush_hits(self) -> None:
+        """把内存中累计的命中次数写回数据库（失败时丢弃，命中次数只用于排序预热）"""
+        if not self._pending_hits:
+            return
+        hits, self._pending_hits = self._pending_hits, {}
+        try:
+            from app.db import crud
+            from app.db.database import AsyncSessionLocal
+
+            async with AsyncSessionLocal() as session:
+                await crud.add_geocode_hits(session, hits)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"写回地理编码缓存命中次数失败: {e}")
+
+    async def put(self, address_key: str, result: Dict[str, Any]) -> None:
+        if not self.enabled or not result or not result.get("location"):
+            return
+        try:
+            lng_str, lat_str = result["location"].split(",")
+            lng, lat = float(lng_str), float(lat_str)
+        except (ValueError, AttributeError):
+            return
+        try:
+            from app.db import crud
+            from app.db.database import AsyncSessionLocal
+
+            async with AsyncSessionLocal() as session:
+                await crud.upsert_geocode_entry(
+                    session,
+                    address_key=address_key,
+                    lng=lng,
+                    lat=lat,
+                    city=_as_text(result.get("city")),
+                    district=_as_text(result.get("district")),
+                    payload_json=json.dumps(compact_result(result), ensure_ascii=False),
+                    expires_at=datetime.utcnow() + timedelta(seconds=self.ttl),
+                )
+            self._stats["writes"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"写入地理编码持久化缓存失败: {e}")
+        await self.flush_hits()
+
+    async def warm_start(self, limit: int) -> int:
+        """清理过期条目，并把命中最多的 limit 个地址载入内存缓存"""
+        if not self.enabled or limit <= 0:
+            return 0
+        from app.amap.cache import get_cache
+
+        await self.flush_hits()
+        try:
+            from app.db import crud
+            from app.db.database import AsyncSessionLocal
+
+            now = datetime.utcnow()
+            async with AsyncSessionLocal() as session:
+                purged = await crud.purge_expired_geocode_entries(session, now)
+                entries = await crud.list_hot_geocode_entries(session, now, limit)
+                payloads = [(entry.address_key, entry.payload_json) for entry in entries]
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"地理编码缓存预热失败: {e}")
+            return 0
+
+        cache = get_cache("geocode")
+        for address_key, payload_json in payloads:
+            cache.set(address_key, json.loads(payload_json))
+        self._stats["warmed"] += len(payloads)
+        logger.info(f"地理编码缓存预热完成: 载入 {len(payloads)} 条，清理过期 {purged} 条")
+        return len(payloads)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "pending_hits": len(self._pending_hits), "enabled": self.enabled, "ttl": self.ttl}
+
+
+def compact_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """只保留 STORED_FIELDS 中的字段"""
+    return {field: result[field] for field in STORED_FIELDS if field in result}
+
+
+def _as_text(value: Any) -> str:
+    # 高德对缺失字段返回空列表而不是空字符串
+    return value if isinstance(value, str) else ""
+
+
+_store: Optional[GeocodeStore] = None
+
+
+def get_geocode_store() -> GeocodeStore:
+    """获取进程级地理编码持久化缓存（配置来自 [amap.geocode_store]）"""
+    global _store
+    if _store is None:
+        enabled, ttl = True, 30 * 24 * 3600.0
+        try:
+            from app.config import config
+
+            if config.amap is not None:
+                enabled = config.amap.geocode_store.enabled
+                ttl = config.amap.geocode_store.ttl
+        except Exception as e:
+            logger.warning(f"读取地理编码持久化缓存配置失败，使用默认值: {e}")
+        _store = GeocodeStore(enabled=enabled, ttl=ttl)
+    return _store
+
+
+def geocode_store_warm_start_limit() -> int:
+    """启动预热条数，未配置高德时为 0"""
+    try:
+        from app.config import config
+
+        if config.amap is not None:
+            return config.amap.geocode_store.warm_start
+    except Exception:
+        pass
+    return 0
@@ -0,0 +1,84 @@
+"""Geohash 编码工具，用于按空间网格组织高德结果缓存。"""
+
+from typing import List, Tuple
+
+from app.amap.distance import haversine_m
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE_MAP = {ch: i for i, ch in enumerate(_BASE32)}
+
+
+def encode(lng: float, lat: float, precision: int = 7) -> str:
+    """将经纬度编码为指定长度的 geohash"""
+    lng_range = [-180.0, 180.0]
+    lat_range = [-90.0, 90.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # geohash 从经度位开始交替
+    while len(chars) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def bbox(geohash: str) -> Tuple[float, float, float, float]:
+    """返回 geohash 网格的 (min_lng, min_lat, max_lng, max_lat)"""
+    lng_range = [-180.0, 180.0]
+    lat_range = [-90.0, 90.0]
+    even = True
+    for ch in geohash:
+        value = _DECODE_MAP[ch]
+        for shift in range(4, -1, -1):
+            rng = lng_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (value >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return lng_range[0], lat_range[0], lng_range[1], lat_range[1]
+
+
+def center(geohash: str) -> Tuple[float, float]:
+    """返回 geohash 网格中心的 (lng, lat)"""
+    min_lng, min_lat, max_lng, max_lat = bbox(geohash)
+    return (min_lng + max_lng) / 2, (min_lat + max_lat) / 2
+
+
+def half_diagonal_m(geohash: str) -> float:
+    """网格中心到角点的距离（米），即网格内任一点到中心的最大距离"""
+    min_lng, min_lat, max_lng, max_lat = bbox(geohash)
+    return haversine_m((min_lng + max_lng) / 2, (min_lat + max_lat) / 2, max_lng, max_lat)
+
+
+def neighbors(geohash: str) -> List[str]:
+    """返回相邻的 8 个同级网格"""
+    min_lng, min_lat, max_lng, max_lat = bbox(geohash)
+    width = max_lng - min_lng
+    height = max_lat - min_lat
+    lng, lat = (min_lng + max_lng) / 2, (min_lat + max_lat) / 2
+    precision = len(geohash)
+    result = []
+    for dlat in (-1, 0, 1):
+        for dlng in (-1, 0, 1):
+            if dlat == 0 and dlng == 0:
+                continue
+            n_lat = lat + dlat * height
+            if not -90.0 < n_lat < 90.0:
+                continue
+            n_lng = (lng + dlng * width + 180.0) % 360.0 - 180.0
+            result.append(encode(n_lng, n_lat, precision))
+    return result
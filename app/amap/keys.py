@@ -0,0 +1,16 @@
+"""高德请求的规范化 key，供请求合并与缓存共用。"""
+
+
+def normalize_address(address: str) -> str:
+    """规范化地址：去除首尾空白并合并连续空白"""
+    return " ".join((address or "").split())
+
+
+def normalize_location(location: str, precision: int = 6) -> str:
+    """规范化 "lng,lat" 坐标字符串，统一小数位数"""
+    try:
+        lng_str, lat_str = location.split(",")
+        return f"{float(lng_str):.{precision}f},{float(lat_str):.{precision}f}"
+    except (ValueError, AttributeError):
+        return (location or "").strip()
+
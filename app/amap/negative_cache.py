@@ -0,0 +1,115 @@
+"""地理编码失败结果的短期缓存（negative cache）。
+
+解析失败是最慢的路径：一次 POI 文本检索加最多三次带退避的地理编码。同一个错别字或
+含糊地址被反复提交时，在短时间内直接复用上一次的失败结论，不再访问高德。
+
+只缓存确定性的失败：
+- not_found：高德正常返回但没有结果
+- quota：配额/并发超限（有效期更短，额度恢复后尽快重新尝试）
+网络异常、HTTP 错误等偶发失败不缓存。
+"""
+
+from typing import Any, Dict, Optional
+
+from app.amap.cache import LRUCache
+from app.logger import logger
+
+NOT_FOUND = "not_found"
+QUOTA = "quota"
+
+# 高德返回的配额/并发超限 info
+QUOTA_INFOS = frozenset({
+    "DAILY_QUERY_OVER_LIMIT",
+    "USER_DAILY_QUERY_OVER_LIMIT",
+    "ACCESS_TOO_FREQUENT",
+    "CUQPS_HAS_EXCEEDED_THE_LIMIT",
+    "CKQPS_HAS_EXCEEDED_THE_LIMIT",
+    "CQPS_HAS_EXCEEDED_THE_LIMIT",
+    "CUDAILY_QUERY_OVER_LIMIT",
+    "QUOTA_PLAN_RUN_OUT",
+})
+
+
+def is_quota_error(info: Optional[str]) -> bool:
+    return info in QUOTA_INFOS
+
+
+class NegativeCache:
+    """按规范化地址记录失败原因，不同原因使用不同有效期"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        not_found_ttl: float = 600,
+        quota_ttl: float = 60,
+        max_bytes: int = 256 * 1024,
+    ) -> None:
+        self.enabled = enabled
+        self.ttls: Dict[str, float] = {NOT_FOUND: not_found_ttl, QUOTA: quota_ttl}
+        self._cache = LRUCache("geocode_negative", max_bytes=max_bytes, default_ttl=not_found_ttl)
+        self._stats: Dict[str, int] = {
+            "recorded_not_found": 0,
+            "recorded_quota": 0,
+            "short_circuits": 0,
+            "requests_short_circuited": 0,
+        }
+
+    def get(self, key: str) -> Optional[str]:
+        """返回缓存的失败原因；命中即视为一次被跳过的上游解析"""
+        if not self.enabled:
+            return None
+        reason = self._cache.get(key)
+        if reason is not None:
+            self._stats["short_circuits"] += 1
+        return reason
+
+    def peek(self, key: str) -> Optional[str]:
+        """读取失败原因但不计入统计（用于生成错误提示）"""
+        if not self.enabled:
+            return None
+        return self._cache.peek(key)
+
+    def record(self, key: str, reason: str) -> None:
+        if not self.enabled:
+            return
+        self._cache.set(key, reason, ttl=self.ttls[reason])
+        self._stats[f"recorded_{reason}"] += 1
+        logger.debug(f"地理编码失败已缓存: {key} ({reason})")
+
+    def note_request_short_circuited(self) -> None:
+        """推荐请求因失败缓存直接返回错误时调用"""
+        self._stats["requests_short_circuited"] += 1
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        cache_stats = self._cache.stats()
+        return {
+            **self._stats,
+            "entries": cache_stats["entries"],
+            "bytes": cache_stats["bytes"],
+            "expirations": cache_stats["expirations"],
+            "enabled": self.enabled,
+            "not_found_ttl": self.ttls[NOT_FOUND],
+            "quota_ttl": self.ttls[QUOTA],
+        }
+
+
+_negative_cache: Optional[NegativeCache] = None
+
+
+def get_geocode_negative_cache() -> NegativeCache:
+    """获取进程级地理编码失败缓存（配置来自 [amap.negative_cache]）"""
+    global _negative_cache
+    if _negative_cache is None:
+        settings: Dict[str, Any] = {}
+        try:
+            from app.config import config
+
+            if config.amap is not None:
+                settings = config.amap.negative_cache.model_dump()
+        except Exception as e:
+            logger.warning(f"读取地理编码失败缓存配置失败，使用默认值: {e}")
+        _negative_cache = NegativeCache(**settings)
+    return _negative_cache
@@ -0,0 +1,136 @@
+"""排序流水线使用的精简场所模型。
+
+高德 POI 在进入排序时解析一次：坐标转为浮点数，评分/评论数转为数值，标签与照片
+只保留页面需要的部分。排序过程中产生的评分明细直接写入同一个对象的槽位，
+不再往原始字典上追加 `_score`、`_distance` 等字段。
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# 页面与评分只需要照片数量，url 最多保留 3 个
+MAX_PHOTOS = 3
+
+
+def _text(value: Any) -> str:
+    """高德对缺失字段返回空列表，统一转换为字符串"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value if item)
+    return "" if value is None else str(value)
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+@dataclass(slots=True)
+class Place:
+    """候选场所（输入字段 + 排序阶段写入的字段）"""
+
+    name: str
+    location: str = ""
+    lng: Optional[float] = None
+    lat: Optional[float] = None
+    id: str = ""
+    type: str = ""
+    address: str = ""
+    tel: str = ""
+    tag: str = ""
+    parking_type: str = ""
+    business_hours: str = ""
+    rating: float = 0.0  # 0 表示无评分
+    rating_text: str = ""  # 高德返回的原始评分文本，页面展示用
+    review_count: int = 0
+    cost: str = ""
+    photos: Tuple[str, ...] = ()
+    photo_count: int = 0
+
+    # 排序阶段写入
+    source_keyword: str = ""
+    distance: Optional[float] = None
+    transit_time: Optional[float] = None  # 参与者乘地铁到此处的最长耗时（秒）
+    cluster: Optional[int] = None  # 多中心模式下所属的组
+    raw_rating: float = 0.0
+    has_rating: bool = False
+    matched_scenario: str = ""
+    matched_requirements: List[str] = field(default_factory=list)
+    requirement_confidence: Dict[str, str] = field(default_factory=dict)
+    score: float = 0.0
+    score_breakdown: Dict[str, float] = field(default_factory=dict)
+    diversity_penalty: float = 0.0
+    recommendation_reason: str = ""
+    llm_score: float = 0.0
+    llm_reason: str = ""
+    final_score: Optional[float] = None
+
+    @classmethod
+    def from_amap(cls, poi: Dict[str, Any]) -> "Place":
+        """从高德 POI（或 Agent 传入的简化字典）构造场所"""
+        location = _text(poi.get("location"))
+        lng = lat = None
+        if "," in location:
+            lng_str, lat_str = location.split(",", 1)
+            try:
+                lng, lat = float(lng_str), float(lat_str)
+            except ValueError:
+                lng = lat = None
+        elif poi.get("lng") is not None and poi.get("lat") is not None:
+            try:
+                lng, lat = float(poi["lng"]), float(poi["lat"])
+                location = f"{lng},{lat}"
+            except (TypeError, ValueError):
+                lng = lat = None
+
+        biz_ext = poi.get("biz_ext") or {}
+        if not isinstance(biz_ext, dict):
+            biz_ext = {}
+        # Agent 的简化字典没有 biz_ext，评分放在顶层 rating
+        rating_text = _text(biz_ext.get("rating") if "rating" in biz_ext else poi.get("rating"))
+
+        photos = poi.get("photos") or []
+        if not isinstance(photos, list):
+            photos = []
+
+        return cls(
+            name=_text(poi.get("name")),
+            location=location,
+            lng=lng,
+            lat=lat,
+            id=_text(poi.get("id")),
+            type=_text(poi.get("type")),
+            address=_text(poi.get("address")),
+            tel=_text(poi.get("tel")),
+            tag=_text(poi.get("tag")),
+            parking_type=_text(poi.get("parking_type")),
+            business_hours=_text(poi.get("business_hours")),
+            rating=_to_float(rating_text),
+            rating_text=rating_text,
+            review_count=_to_int(biz_ext.get("review_count")),
+            cost=_text(biz_ext.get("cost")),
+            photos=tuple(
+                photo.get("url", "") for photo in photos[:MAX_PHOTOS] if isinstance(photo, dict)
+            ),
+            photo_count=len(photos),
+            source_keyword=_text(poi.get("_source_keyword")),
+        )
+
+    @property
+    def key(self) -> str:
+        """去重用的标识：优先高德 POI id，否则名称 + 坐标"""
+        return self.id or f"{self.name}_{self.location}"
+
+
+def as_place(place: Union[Place, Dict[str, Any]]) -> Place:
+    return place if isinstance(place, Place) else Place.from_amap(place)
@@ -0,0 +1,97 @@
+"""V2 多维度评分的列式实现（NumPy 向量化）。
+
+一批候选场所先整理为数值列（评分、评论数、照片数、距离、乘地铁耗时、场景分、
+需求分），五个维度的分数与总分各用几次数组运算一次算出，代替逐个场所调用评分函数：
+
+- 基础评分 30：rating（无评分按 3.5）× 6，rating 上限 5
+- 热度分 20：log10(评论数 + 1) × 5 + 照片数 × 2（照片分上限 6），合计上限 20
+- 距离分 25：500m 内满分，500~2500m 按 1.5 次幂衰减到 5 分，更远 5 分；有乘地铁
+  耗时时改为 20 分钟内满分、60 分钟及以上 5 分的线性衰减；坐标缺失 0 分
+- 场景匹配 15 与需求匹配 10 需要字符串匹配，由调用方逐个（去重后）算好后作为列传入
+
+总分按 基础 + 热度 + 距离 + 场景 + 需求 的顺序逐元素相加。NumPy 的 log10 与幂运算
+可能与 math 模块相差最后一位，总分与逐个计算的结果只有浮点舍入级别的差异。
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Sequence
+
+import numpy as np
+
+from app.amap.place import Place
+
+BREAKDOWN_KEYS = ("base", "popularity", "distance", "scenario", "requirement")
+
+# 无评分场所按该评分计算基础分
+DEFAULT_RATING = 3.5
+
+
+@dataclass
+class ScoreColumns:
+    """一批场所的数值列，长度均为场所数；距离、乘地铁耗时缺失时为 NaN"""
+
+    rating: np.ndarray
+    reviews: np.ndarray
+    photos: np.ndarray
+    distance: np.ndarray
+    transit_time: np.ndarray
+    scenario: np.ndarray
+    requirement: np.ndarray
+
+    @classmethod
+    def from_places(
+        cls, places: Sequence[Place], scenario: Sequence[float], requirement: Sequence[float]
+    ) -> "ScoreColumns":
+        """place.distance 须已写入（坐标缺失的场所除外）"""
+        count = len(places)
+        return cls(
+            rating=np.fromiter((p.rating for p in places), dtype=np.float64, count=count),
+            reviews=np.fromiter((p.review_count for p in places), dtype=np.float64, count=count),
+            photos=np.fromiter((p.photo_count for p in places), dtype=np.float64, count=count),
+            distance=np.fromiter(
+                (np.nan if p.lng is None or p.lat is None or p.distance is None else p.distance for p in places),
+                dtype=np.float64, count=count,
+            ),
+            transit_time=np.fromiter(
+                (np.nan if p.transit_time is None else p.transit_time for p in places),
+                dtype=np.float64, count=count,
+            ),
+            scenario=np.asarray(scenario, dtype=np.float64),
+            requirement=np.asarray(requirement, dtype=np.float64),
+        )
+
+
+def base_scores(rating: np.ndarray) -> np.ndarray:
+    """基础评分（满分 30）"""
+    return np.minimum(np.where(rating == 0, DEFAULT_RATING, rating), 5) * 6
+
+
+def popularity_scores(reviews: np.ndarray, photos: np.ndarray) -> np.ndarray:
+    """热度分（满分 20）"""
+    review_score = np.where(reviews > 0, np.log10(reviews + 1) * 5, 0.0)
+    return np.minimum(20, review_score + np.minimum(photos * 2, 6))
+
+
+def distance_scores(distance: np.ndarray, transit_time: np.ndarray) -> np.ndarray:
+    """距离分（满分 25）"""
+    ratio = np.clip((distance - 500) / 2000, 0.0, 1.0)
+    by_distance = np.where(distance <= 500, 25.0, np.where(distance <= 2500, 25 * (1 - ratio ** 1.5 * 0.8), 5.0))
+    by_transit = 25 - 20 * np.clip((transit_time - 1200) / 2400, 0.0, 1.0)
+    scores = np.where(np.isnan(transit_time), by_distance, by_transit)
+    return np.where(np.isnan(distance), 0.0, scores)
+
+
+def score_columns(columns: ScoreColumns) -> Dict[str, np.ndarray]:
+    """各维度分数与总分（键为 BREAKDOWN_KEYS 与 total）"""
+    scores = {
+        "base": base_scores(columns.rating),
+        "popularity": popularity_scores(columns.reviews, columns.photos),
+        "distance": distance_scores(columns.distance, columns.transit_time),
+        "scenario": columns.scenario,
+        "requirement": columns.requirement,
+    }
+    total = scores["base"] + scores["popularity"]
+    for key in BREAKDOWN_KEYS[2:]:
+        total = total + scores[key]
+    scores["total"] = total
+    return scores
@@ -0,0 +1,124 @@
+"""按 geohash 网格缓存周边搜索结果。
+
+周边搜索以网格中心为圆心向高德取数，半径放大半个网格对角线，保证网格内任意中心点
+的查询圆都落在取数圆内。高德按距离升序返回且只给一页，因此一次取数结果可以视为
+“以网格中心为圆心、半径为 complete_radius 的完整圆盘”：未截断时就是取数半径，
+截断时是最远一条结果的距离。
+
+查询时合并本网格与相邻网格的缓存条目，按到真实查询中心的距离在本地过滤排序。
+若查询圆（或其中最近的 offset 条结果所在的圆）完全落在某个完整圆盘内，结果与
+直接以查询中心调用高德一致；否则为查询所在网格补一次上游调用。热点区域的网格取数
+被截断、仍无法证明等价时，改为以查询中心直接取数（结果同样按查询点记入缓存），
+缓存不改变结果；只有上游失败或熔断时才退回缓存中的近似结果。
+"""
+
+import math
+from typing import Any, Dict, List, Tuple
+
+from app.amap import geohash
+from app.amap.distance import haversine_m
+
+# 高德周边搜索单页上限为 25；网格取数总是取满一页，让不同 offset 的查询共用同一次取数，
+# 也让截断时的完整圆盘尽量大
+MAX_PAGE_SIZE = 25
+MAX_RADIUS = 50000
+
+
+def cell_precision(radius: int) -> int:
+    """按查询半径选择网格精度：小半径用 7 位（约 150m），大半径用 6 位（约 1.2km×0.6km）"""
+    return 7 if radius <= 1500 else 6
+
+
+def poi_cell_key(cell: str, keywords: str, types: str) -> Tuple[str, str, str, str]:
+    return ("cell", cell, keywords, types)
+
+
+def poi_point_key(
+    location: str, radius: int, offset: int, keywords: str, types: str
+) -> Tuple[str, str, int, int, str, str]:
+    """以查询中心直接取数的缓存键：只有完全相同的查询才复用"""
+    return ("point", location, radius, offset, keywords, types)
+
+
+def plan_cell_fetch(cell: str, radius: int) -> Tuple[str, int, int]:
+    """返回网格取数参数 (center "lng,lat", 取数半径, 每页条数)"""
+    lng, lat = geohash.center(cell)
+    fetch_radius = min(MAX_RADIUS, int(math.ceil(radius + geohash.half_diagonal_m(cell))))
+    return f"{lng:.6f},{lat:.6f}", fetch_radius, MAX_PAGE_SIZE
+
+
+def covers_plan(entry: Dict[str, Any], fetch_radius: int, page_size: int) -> bool:
+    """已有条目是否至少以同样的半径与条数取过数（再取一次也不会更完整）"""
+    return entry["fetch_radius"] >= fetch_radius and entry["page_size"] >= page_size
+
+
+def build_entry(center: str, fetch_radius: int, page_size: int, pois: List[Dict]) -> Dict[str, Any]:
+    """由一次网格取数结果构造缓存条目"""
+    lng, lat = _parse_location(center)
+    complete_radius = float(fetch_radius)
+    if len(pois) >= page_size:
+        # 结果被截断，只有最远一条以内的范围是完整的
+        distances = [_distance_from(poi, lng, lat) for poi in pois]
+        complete_radius = max((d for d in distances if math.isfinite(d)), default=0.0)
+    return {
+        "lng": lng,
+        "lat": lat,
+        "fetch_radius": fetch_radius,
+        "page_size": page_size,
+        "complete_radius": complete_radius,
+        "pois": pois,
+    }
+
+
+def query_entries(
+    entries: List[Dict[str, Any]], lng: float, lat: float, radius: int, offset: int
+) -> Tuple[List[Dict], bool]:
+    """用缓存条目回答一次周边查询。
+
+    Returns:
+        (pois, exact): 距查询中心 radius 以内最近的 offset 条（已复制，distance 字段
+        改写为到查询中心的距离），以及结果是否与直接调用高德等价。
+    """
+    safe_radius = 0.0
+    merged: Dict[str, Tuple[float, Dict]] = {}
+    for entry in entries:
+        center_distance = haversine_m(lng, lat, entry["lng"], entry["lat"])
+        safe_radius = max(safe_radius, entry["complete_radius"] - center_distance)
+        for poi in entry["pois"]:
+            poi_key = poi.get("id") or f"{poi.get('name')}@{poi.get('location')}"
+            if poi_key in merged:
+                continue
+            distance = _distance_from(poi, lng, lat, use_field=False)
+            if distance <= radius:
+                merged[poi_key] = (distance, poi)
+
+    ranked = sorted(merged.values(), key=lambda item: item[0])[:offset]
+    exact = safe_radius >= radius or (
+        len(ranked) >= offset and ranked[-1][0] <= safe_radius
+    )
+    results = []
+    for distance, poi in ranked:
+        # 排序阶段会在场所字典上写入评分字段，共享的结果需要复制后再交给各请求
+        copied = dict(poi)
+        copied["distance"] = str(int(round(distance)))
+        results.append(copied)
+    return results, exact
+
+
+def _parse_location(location: str) -> Tuple[float, float]:
+    lng_str, lat_str = location.split(",")
+    return float(lng_str), float(lat_str)
+
+
+def _distance_from(poi: Dict, lng: float, lat: float, use_field: bool = True) -> float:
+    """POI 到给定点的距离；取数中心的距离优先用高德返回的 distance 字段"""
+    if use_field:
+        try:
+            return float(poi["distance"])
+        except (KeyError, TypeError, ValueError):
+            pass
+    try:
+        poi_lng, poi_lat = _parse_location(poi.get("location", ""))
+    except (ValueError, AttributeError):
+        return float("inf")
+    return haversine_m(lng, lat, poi_lng, poi_lat)
@@ -0,0 +1,192 @@
+"""进程内 POI 空间索引。
+
+所有周边搜索拿到的 POI 按高德 POI id 去重，精简为排序与页面渲染所需的字段后，
+按 geohash 区域（默认 6 位，约 1.2km×0.6km）分桶存放。每次网格取数（见
+app.amap.poi_cells）记录为一条覆盖记录：取数圆心、完整半径与结果 id 列表。
+周边查询先用覆盖记录在本地作答，只有覆盖不足或过期时才访问高德。
+
+内存按 POI 条数封顶；超限或过期时以区域为单位淘汰最久未刷新的区域，引用了被淘汰
+POI 的覆盖记录在下次读取时一并失效。精简 POI 的估算字节数在写入与淘汰时累计，
+读取统计时不再遍历全部 POI。
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+from app.amap import geohash
+from app.amap.cache import estimate_size
+from app.logger import logger
+
+# 排序、推荐理由与页面渲染会读取的字段
+COMPACT_FIELDS = (
+    "id", "name", "type", "typecode", "address", "location", "tel", "tag",
+    "business_area", "business_hours", "cityname", "adname", "pname", "parking_type",
+)
+BIZ_EXT_FIELDS = ("rating", "cost", "review_count", "open_time")
+
+
+def compact_poi(poi: Dict[str, Any]) -> Dict[str, Any]:
+    """只保留需要的字段；photos 仅保留 url（评分只用到照片数量）"""
+    record = {field: poi[field] for field in COMPACT_FIELDS if field in poi}
+    biz_ext = poi.get("biz_ext")
+    if isinstance(biz_ext, dict):
+        record["biz_ext"] = {field: biz_ext[field] for field in BIZ_EXT_FIELDS if field in biz_ext}
+    photos = poi.get("photos")
+    if isinstance(photos, list):
+        record["photos"] = [{"url": photo.get("url", "")} for photo in photos if isinstance(photo, dict)]
+    return record
+
+
+def poi_identity(poi: Dict[str, Any]) -> str:
+    return poi.get("id") or f"{poi.get('name')}@{poi.get('location')}"
+
+
+class POIIndex:
+    """按区域分桶、带新鲜度的 POI 索引"""
+
+    def __init__(self, max_pois: int = 20000, max_age: float = 1800, area_precision: int = 6) -> None:
+        self.max_pois = max_pois
+        self.max_age = max_age
+        self.area_precision = area_precision
+        # id -> (精简后的 POI, 所在区域, 估算字节数)
+        self._pois: Dict[str, Tuple[Dict[str, Any], str, int]] = {}
+        self._bytes = 0
+        # 区域 -> (最近刷新时间, POI id 集合)，按刷新时间从旧到新排列
+        self._areas: "OrderedDict[str, Tuple[float, Set[str]]]" = OrderedDict()
+        # 网格取数 key -> 覆盖记录，按取数时间从旧到新排列
+        self._coverage: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._stats: Dict[str, int] = {
+            "lookups": 0,
+            "covered": 0,
+            "expired": 0,
+            "invalidated": 0,
+            "evicted_areas": 0,
+            "evicted_pois": 0,
+        }
+
+    def get(self, cell_key: Hashable) -> Optional[Dict[str, Any]]:
+        """读取覆盖记录，返回带 POI 列表的条目（格式同 poi_cells.build_entry）"""
+        self._stats["lookups"] += 1
+        coverage = self._coverage.get(cell_key)
+        if coverage is None:
+            return None
+        if time.monotonic() - coverage["fetched_at"] > self.max_age:
+            del self._coverage[cell_key]
+            self._stats["expired"] += 1
+            return None
+        pois = []
+        for poi_id in coverage["ids"]:
+            item = self._pois.get(poi_id)
+            if item is None:
+                # 部分 POI 所在区域已被淘汰，这条覆盖记录不再完整
+                del self._coverage[cell_key]
+                self._stats["invalidated"] += 1
+                return None
+            pois.append(item[0])
+        self._stats["covered"] += 1
+        return {**coverage, "pois": pois}
+
+    def add(self, cell_key: Hashable, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """写入一次网格取数的结果，返回引用精简 POI 的条目"""
+        now = time.monotonic()
+        ids: List[str] = []
+        pois: List[Dict[str, Any]] = []
+        for poi in entry["pois"]:
+            record = compact_poi(poi)
+            poi_id = poi_identity(record)
+            area = self._area_of(record, entry)
+            previous = self._pois.get(poi_id)
+            if previous is not None:
+                self._bytes -= previous[2]
+                if previous[1] != area and previous[1] in self._areas:
+                    self._areas[previous[1]][1].discard(poi_id)
+            size = estimate_size(record)
+            self._pois[poi_id] = (record, area, size)
+            self._bytes += size
+            self._touch_area(area, now).add(poi_id)
+            ids.append(poi_id)
+            pois.append(record)
+
+        coverage = {key: value for key, value in entry.items() if key != "pois"}
+        coverage.update({"ids": ids, "fetched_at": now})
+        self._coverage.pop(cell_key, None)
+        self._coverage[cell_key] = coverage
+        self._evict(now)
+        return {**coverage, "pois": pois}
+
+    def clear(self) -> None:
+        self._pois.clear()
+        self._areas.clear()
+        self._coverage.clear()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._pois)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "pois": len(self._pois),
+            "areas": len(self._areas),
+            "coverage": len(self._coverage),
+            "bytes": self._bytes,
+            "max_pois": self.max_pois,
+            "max_age": self.max_age,
+        }
+
+    def _area_of(self, record: Dict[str, Any], entry: Dict[str, Any]) -> str:
+        try:
+            lng_str, lat_str = record["location"].split(",")
+            lng, lat = float(lng_str), float(lat_str)
+        except (KeyError, ValueError, AttributeError):
+            lng, lat = entry["lng"], entry["lat"]
+        return geohash.encode(lng, lat, self.area_precision)
+
+    def _touch_area(self, area: str, now: float) -> Set[str]:
+        _, ids = self._areas.pop(area, (now, set()))
+        self._areas[area] = (now, ids)
+        return ids
+
+    def _evict(self, now: float) -> None:
+        while self._areas:
+            area, (refreshed_at, _) = next(iter(self._areas.items()))
+            if len(self._pois) <= self.max_pois and now - refreshed_at <= self.max_age:
+                break
+            self._drop_area(area)
+        # 覆盖记录只保存 id，数量与 POI 上限同量级即可
+        while self._coverage:
+            cell_key, coverage = next(iter(self._coverage.items()))
+            if len(self._coverage) <= self.max_pois and now - coverage["fetched_at"] <= self.max_age:
+                break
+            del self._coverage[cell_key]
+            self._stats["expired"] += 1
+
+    def _drop_area(self, area: str) -> None:
+        _, ids = self._areas.pop(area)
+        for poi_id in ids:
+            item = self._pois.pop(poi_id, None)
+            if item is not None:
+                self._bytes -= item[2]
+        self._stats["evicted_areas"] += 1
+        self._stats["evicted_pois"] += len(ids)
+
+
+_index: Optional[POIIndex] = None
+
+
+def get_poi_index() -> POIIndex:
+    """获取进程级 POI 索引（容量与有效期来自 [amap.poi_index]）"""
+    global _index
+    if _index is None:
+        max_pois, max_age = 20000, 1800.0
+        try:
+            from app.config import config
+
+            if config.amap is not None:
+                max_pois = config.amap.poi_index.max_pois
+                max_age = config.amap.poi_index.max_age
+        except Exception as e:
+            logger.warning(f"读取POI索引配置失败，使用默认值: {e}")
+        _index = POIIndex(max_pois=max_pois, max_age=max_age)
+    return _index
@@ -0,0 +1,250 @@
+"""三层需求匹配（需求匹配分，满分 10）的预编译索引。
+
+原实现每个场所都重建需求别名表与 POI 标签规则，反复对同一批字符串做 lower()，
+并按顺序逐个品牌做子串查找。这里在导入时把词表编译好：
+
+- 需求用位掩码表示（REQUIREMENTS 中的下标），用户需求每个请求只解析一次
+- 需求别名、各字段的标签匹配值、品牌名、类型名各编译为一个 Aho-Corasick 自动机
+  （app.amap.address_matcher.PatternMatcher），扫描一遍文本即得到全部命中
+- 每个品牌 / 类型能满足的需求预先算成掩码，场所的三层结果只需查表与位运算
+
+三层匹配机制与原实现一致：
+- Layer 1: POI 标签硬匹配（高置信度 high，+4 分）
+- Layer 2: 品牌特征匹配（中置信度 medium，+2 分；取 BRAND_FEATURES 中最靠前的命中品牌）
+- Layer 3: 类型推断匹配（低置信度 low，+1 分；取最靠前的命中类型，类型或名称包含即可）
+同一需求只按最高一层计分。matched_requirements 按层、层内按 REQUIREMENTS 顺序排列。
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+from app.amap.address_matcher import PatternMatcher
+from app.amap.place import Place
+
+# 需求规范化映射（将各种表达方式统一），键的顺序即需求位的顺序
+REQUIREMENT_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "停车": ("停车", "车位", "停车场", "免费停车", "方便停车", "停车方便"),
+    "安静": ("安静", "环境好", "氛围", "静", "舒适", "环境安静"),
+    "商务": ("商务", "会议", "办公", "谈事", "工作"),
+    "交通": ("交通", "地铁", "公交", "方便", "交通便利"),
+    "包间": ("包间", "私密", "独立", "包厢", "有包间"),
+    "WiFi": ("wifi", "无线", "网络", "上网", "免费wifi"),
+    "可以久坐": ("久坐", "可以久坐", "坐着办公", "长时间"),
+    "适合儿童": ("儿童", "带娃", "亲子", "小孩", "适合儿童"),
+    "24小时营业": ("24小时", "通宵", "夜间", "凌晨"),
+}
+
+# POI 标签匹配规则（Layer 1）：需求 -> (检查的字段, 匹配值)
+POI_MATCH_RULES: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "停车": (("tag", "parking_type", "navi_poiid"), ("停车", "车位", "免费停车", "parking")),
+    "安静": (("tag",), ("安静", "环境", "氛围", "舒适", "优雅")),
+    "商务": (("tag", "type"), ("商务", "会议", "办公", "商务区")),
+    "交通": (("tag", "address"), ("地铁", "公交", "站", "枢纽")),
+    "包间": (("tag",), ("包间", "包厢", "私密", "独立房间")),
+    "WiFi": (("tag",), ("wifi", "无线", "免费WiFi", "网络")),
+}
+
+# ========== 品牌特征知识库 ==========
+# 用于三层匹配算法的第二层：基于品牌特征的需求推断
+# 分值范围 0.0-1.0，>=0.7 视为满足需求
+BRAND_FEATURES: Dict[str, Dict[str, float]] = {
+    # ========== 咖啡馆 (15个) ==========
+    "星巴克": {"安静": 0.8, "WiFi": 1.0, "商务": 0.7, "停车": 0.3, "可以久坐": 0.9},
+    "瑞幸": {"安静": 0.4, "WiFi": 0.7, "商务": 0.4, "停车": 0.3, "可以久坐": 0.5},
+    "Costa": {"安静": 0.9, "WiFi": 1.0, "商务": 0.8, "停车": 0.4, "可以久坐": 0.9},
+    "漫咖啡": {"安静": 0.9, "WiFi": 0.9, "商务": 0.6, "停车": 0.5, "可以久坐": 1.0},
+    "太平洋咖啡": {"安静": 0.8, "WiFi": 0.9, "商务": 0.7, "停车": 0.4, "可以久坐": 0.8},
+    "Manner": {"安静": 0.5, "WiFi": 0.6, "商务": 0.4, "停车": 0.2, "可以久坐": 0.3},
+    "Seesaw": {"安静": 0.8, "WiFi": 0.9, "商务": 0.6, "停车": 0.3, "可以久坐": 0.8},
+    "M Stand": {"安静": 0.7, "WiFi": 0.8, "商务": 0.5, "停车": 0.3, "可以久坐": 0.7},
+    "Tims": {"安静": 0.6, "WiFi": 0.8, "商务": 0.5, "停车": 0.4, "可以久坐": 0.6},
+    "上岛咖啡": {"安静": 0.9, "WiFi": 0.8, "商务": 0.8, "停车": 0.6, "可以久坐": 0.9, "包间": 0.7},
+    "Zoo Coffee": {"安静": 0.7, "WiFi": 0.8, "商务": 0.5, "停车": 0.4, "可以久坐": 0.8, "适合儿童": 0.6},
+    "猫屎咖啡": {"安静": 0.8, "WiFi": 0.8, "商务": 0.6, "停车": 0.4, "可以久坐": 0.8},
+    "皮爷咖啡": {"安静": 0.7, "WiFi": 0.8, "商务": 0.5, "停车": 0.3, "可以久坐": 0.7},
+    "咖世家": {"安静": 0.8, "WiFi": 0.9, "商务": 0.7, "停车": 0.4, "可以久坐": 0.8},
+    "挪瓦咖啡": {"安静": 0.5, "WiFi": 0.6, "商务": 0.4, "停车": 0.2, "可以久坐": 0.4},
+    # ========== 中餐厅 (15个) ==========
+    "海底捞": {"包间": 0.9, "停车": 0.8, "安静": 0.2, "适合儿童": 0.9, "24小时营业": 0.3},
+    "西贝": {"包间": 0.7, "停车": 0.6, "安静": 0.5, "适合儿童": 0.7},
+    "外婆家": {"包间": 0.5, "停车": 0.5, "安静": 0.3, "适合儿童": 0.6},
+    "绿茶": {"包间": 0.4, "停车": 0.5, "安静": 0.4, "适合儿童": 0.5},
+    "小龙坎": {"包间": 0.6, "停车": 0.5, "安静": 0.2, "适合儿童": 0.4},
+    "呷哺呷哺": {"包间": 0.0, "停车": 0.4, "安静": 0.3, "适合儿童": 0.5},
+    "大龙燚": {"包间": 0.5, "停车": 0.5, "安静": 0.2, "适合儿童": 0.4},
+    "眉州东坡": {"包间": 0.8, "停车": 0.7, "安静": 0.6, "适合儿童": 0.7, "商务": 0.7},
+    "全聚德": {"包间": 0.9, "停车": 0.7, "安静": 0.6, "适合儿童": 0.6, "商务": 0.8},
+    "大董": {"包间": 0.9, "停车": 0.8, "安静": 0.8, "商务": 0.9},
+    "鼎泰丰": {"包间": 0.5, "停车": 0.6, "安静": 0.6, "适合儿童": 0.7},
+    "南京大牌档": {"包间": 0.6, "停车": 0.5, "安静": 0.3, "适合儿童": 0.6},
+    "九毛九": {"包间": 0.4, "停车": 0.5, "安静": 0.4, "适合儿童": 0.6},
+    "太二酸菜鱼": {"包间": 0.0, "停车": 0.4, "安静": 0.3, "适合儿童": 0.4},
+    "湘鄂情": {"包间": 0.8, "停车": 0.7, "安静": 0.5, "商务": 0.7},
+    # ========== 西餐/快餐 (10个) ==========
+    "麦当劳": {"停车": 0.5, "WiFi": 0.8, "适合儿童": 0.9, "24小时营业": 0.8},
+    "肯德基": {"停车": 0.5, "WiFi": 0.7, "适合儿童": 0.9, "24小时营业": 0.6},
+    "必胜客": {"包间": 0.3, "停车": 0.5, "适合儿童": 0.8, "安静": 0.5},
+    "萨莉亚": {"停车": 0.4, "适合儿童": 0.7, "安静": 0.4},
+    "汉堡王": {"停车": 0.4, "WiFi": 0.6, "适合儿童": 0.7},
+    "赛百味": {"停车": 0.3, "WiFi": 0.5, "可以久坐": 0.4},
+    "棒约翰": {"停车": 0.4, "适合儿童": 0.7, "包间": 0.2},
+    "达美乐": {"停车": 0.3, "适合儿童": 0.6},
+    "DQ": {"适合儿童": 0.9, "停车": 0.4},
+    "哈根达斯": {"适合儿童": 0.7, "安静": 0.6, "可以久坐": 0.5},
+    # ========== 奶茶/饮品 (8个) ==========
+    "喜茶": {"安静": 0.4, "可以久坐": 0.5, "停车": 0.3},
+    "奈雪的茶": {"安静": 0.5, "可以久坐": 0.6, "停车": 0.4, "WiFi": 0.6},
+    "茶百道": {"安静": 0.3, "可以久坐": 0.3, "停车": 0.2},
+    "一点点": {"安静": 0.2, "可以久坐": 0.2, "停车": 0.2},
+    "蜜雪冰城": {"安静": 0.2, "可以久坐": 0.2, "停车": 0.2},
+    "茶颜悦色": {"安静": 0.4, "可以久坐": 0.4, "停车": 0.3},
+    "古茗": {"安静": 0.3, "可以久坐": 0.3, "停车": 0.2},
+    "CoCo": {"安静": 0.3, "可以久坐": 0.3, "停车": 0.2},
+    # ========== 场所类型默认特征 (以下划线开头) ==========
+    "_图书馆": {"安静": 1.0, "WiFi": 0.9, "可以久坐": 1.0},
+    "_书店": {"安静": 1.0, "可以久坐": 0.8, "WiFi": 0.5},
+    "_商场": {"停车": 0.9, "交通": 0.8, "适合儿童": 0.7},
+    "_酒店": {"安静": 0.9, "商务": 0.9, "停车": 0.8, "WiFi": 0.9, "包间": 0.8},
+    "_电影院": {"停车": 0.7, "适合儿童": 0.6},
+    "_KTV": {"包间": 1.0, "停车": 0.6, "24小时营业": 0.5},
+    "_健身房": {"停车": 0.6, "WiFi": 0.5},
+    "_网咖": {"WiFi": 1.0, "24小时营业": 0.8, "可以久坐": 0.9},
+    "_便利店": {"24小时营业": 0.9},
+}
+
+# 品牌特征 >= BRAND_THRESHOLD、类型默认特征 >= TYPE_THRESHOLD 视为满足需求
+BRAND_THRESHOLD = 0.7
+TYPE_THRESHOLD = 0.8
+LAYER_POINTS = (4, 2, 1)
+LAYER_CONFIDENCE = ("high", "medium", "low")
+MAX_REQUIREMENT_SCORE = 10
+
+
+@dataclass(frozen=True)
+class RequirementQuery:
+    """一次请求解析后的用户需求：需求掩码，以及 Layer 1 需要扫描的字段及其可命中的需求掩码"""
+
+    mask: int
+    fields: Tuple[Tuple[str, int], ...]
+
+
+class RequirementMatcher:
+    """编译好的三层需求匹配索引（导入时构建一次，见 REQUIREMENT_MATCHER）"""
+
+    def __init__(
+        self,
+        aliases: Mapping[str, Sequence[str]],
+        poi_rules: Mapping[str, Tuple[Sequence[str], Sequence[str]]],
+        features: Mapping[str, Mapping[str, float]],
+    ) -> None:
+        self.requirements: Tuple[str, ...] = tuple(aliases)
+        self.bits: Dict[str, int] = {req: 1 << i for i, req in enumerate(self.requirements)}
+
+        # 别名（小写）-> 需求掩码
+        self._alias_masks = self._pattern_masks(
+            (alias.lower(), self.bits[req]) for req, names in aliases.items() for alias in names
+        )
+        self._alias_matcher = PatternMatcher(self._alias_masks)
+
+        # Layer 1：每个字段一个自动机，匹配值（小写）-> 该字段规则所属的需求掩码
+        field_values: Dict[str, List[Tuple[str, int]]] = {}
+        self._field_rule_masks: Dict[str, int] = {}
+        for req, (fields, values) in poi_rules.items():
+            if req not in self.bits:
+                continue
+            for field_name in fields:
+                field_values.setdefault(field_name, []).extend((v.lower(), self.bits[req]) for v in values)
+                self._field_rule_masks[field_name] = self._field_rule_masks.get(field_name, 0) | self.bits[req]
+        self._field_masks = {name: self._pattern_masks(pairs) for name, pairs in field_values.items()}
+        self._field_matchers = {name: PatternMatcher(masks) for name, masks in self._field_masks.items()}
+
+        # Layer 2 / 3：品牌与类型按定义顺序编号，各自满足的需求预先算成掩码
+        brands = [(name, f) for name, f in features.items() if not name.startswith("_")]
+        types = [(name[1:], f) for name, f in features.items() if name.startswith("_")]
+        self._brand_matcher = PatternMatcher(name for name, _ in brands)
+        self._brand_masks = {name: self._feature_mask(f, BRAND_THRESHOLD) for name, f in brands}
+        self._type_matcher = PatternMatcher(name for name, _ in types)
+        self._type_order = {name: i for i, (name, _) in enumerate(types)}
+        self._type_masks = {name: self._feature_mask(f, TYPE_THRESHOLD) for name, f in types}
+
+    @staticmethod
+    def _pattern_masks(pairs) -> Dict[str, int]:
+        masks: Dict[str, int] = {}
+        for pattern, bit in pairs:
+            masks[pattern] = masks.get(pattern, 0) | bit
+        return masks
+
+    def _feature_mask(self, features: Mapping[str, float], threshold: float) -> int:
+        mask = 0
+        for req, value in features.items():
+            if req in self.bits and value >= threshold:
+                mask |= self.bits[req]
+        return mask
+
+    def parse(self, user_requirements: str) -> RequirementQuery:
+        """把用户需求文本解析为需求掩码（每个请求一次）"""
+        mask = 0
+        if user_requirements:
+            for alias in self._alias_matcher.matches(user_requirements.lower()):
+                mask |= self._alias_masks[alias]
+        fields = tuple(
+            (name, self._field_rule_masks[name] & mask)
+            for name in self._field_matchers
+            if self._field_rule_masks[name] & mask
+        )
+        return RequirementQuery(mask=mask, fields=fields)
+
+    def names(self, mask: int) -> List[str]:
+        """掩码 -> 需求名（按 REQUIREMENTS 顺序）"""
+        return [req for req in self.requirements if mask & self.bits[req]]
+
+    def brand_of(self, name: str) -> str:
+        """名称中出现的第一个品牌（按知识库顺序），没有时为空字符串"""
+        found = self._brand_matcher.matches(name)
+        return found[0] if found else ""
+
+    def type_of(self, place_type: str, name: str) -> str:
+        """类型或名称中出现的第一个场所类型（按知识库顺序），没有时为空字符串"""
+        found = self._type_matcher.matches(place_type) + self._type_matcher.matches(name)
+        return min(found, key=self._type_order.__getitem__) if found else ""
+
+    def score(self, place: Place, query: RequirementQuery) -> Tuple[int, List[str], Dict[str, str]]:
+        """(需求分, 匹配的需求列表, 需求 -> 置信度)"""
+        if not query.mask:
+            return 0, [], {}
+
+        high = 0
+        for field_name, rule_mask in query.fields:
+            if high & rule_mask == rule_mask:
+                continue
+            matcher, masks = self._field_matchers[field_name], self._field_masks[field_name]
+            for value in matcher.matches(str(getattr(place, field_name, "")).lower()):
+                high |= masks[value] & rule_mask
+        remaining = query.mask & ~high
+
+        medium = 0
+        if remaining:
+            brand = self.brand_of(place.name)
+            if brand:
+                medium = self._brand_masks[brand] & remaining
+                remaining &= ~medium
+
+        low = 0
+        if remaining:
+            type_name = self.type_of(place.type, place.name)
+            if type_name:
+                low = self._type_masks[type_name] & remaining
+
+        matched: List[str] = []
+        confidence: Dict[str, str] = {}
+        total = 0
+        for layer_mask, points, level in zip((high, medium, low), LAYER_POINTS, LAYER_CONFIDENCE):
+            for req in self.names(layer_mask):
+                matched.append(req)
+                confidence[req] = level
+                total += points
+        return min(MAX_REQUIREMENT_SCORE, total), matched, confidence
+
+
+REQUIREMENTS: Tuple[str, ...] = tuple(REQUIREMENT_ALIASES)
+REQUIREMENT_MATCHER = RequirementMatcher(REQUIREMENT_ALIASES, POI_MATCH_RULES, BRAND_FEATURES)
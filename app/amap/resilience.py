@@ -0,0 +1,193 @@
+"""高德 API 熔断与请求对冲（hedging）。
+
+- 熔断器：每个端点一个。连续失败达到阈值后打开，打开期间请求直接抛出
+  `AMapCircuitOpenError`，调用方退回缓存或降级结果，不再等待超时与重试；冷却期过后
+  放行一个探测请求（半开），成功即关闭，失败则重新打开。
+- 延迟统计：记录每个端点最近的响应耗时，供对冲请求选择等待时间（默认 p95）。
+
+只有网络异常、超时与 HTTP 错误计为失败；配额超限等业务错误由限流调度器处理。
+"""
+
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.logger import logger
+
+
+class CircuitBreaker:
+    """连续失败计数熔断器（closed -> open -> half_open -> closed）"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 enabled: bool = True) -> None:
+        self.name = name
+        self.enabled = enabled
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._stats: Dict[str, int] = {"successes": 0, "failures": 0, "opened": 0, "rejected": 0, "probes": 0}
+
+    @property
+    def is_open(self) -> bool:
+        return self.enabled and self.state == self.OPEN and not self._cooled_down()
+
+    def _cooled_down(self) -> bool:
+        return time.monotonic() - self._opened_at >= self.recovery_timeout
+
+    def allow(self) -> bool:
+        """是否放行一次请求；放行后必须以 record_success / record_failure / release 结束"""
+        if not self.enabled:
+            return True
+        if self.state == self.OPEN:
+            if not self._cooled_down():
+                self._stats["rejected"] += 1
+                return False
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                self._stats["rejected"] += 1
+                return False
+            self._probe_in_flight = True
+            self._stats["probes"] += 1
+        return True
+
+    def record_success(self) -> None:
+        self._stats["successes"] += 1
+        self._failures = 0
+        self._probe_in_flight = False
+        if self.state != self.CLOSED:
+            self.state = self.CLOSED
+            logger.info(f"高德API {self.name} 熔断恢复")
+
+    def record_failure(self) -> None:
+        self._stats["failures"] += 1
+        self._failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or (
+            self.state == self.CLOSED and self._failures >= self.failure_threshold
+        ):
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._stats["opened"] += 1
+            logger.warning(
+                f"高德API {self.name} 连续失败 {self._failures} 次，熔断 {self.recovery_timeout:.0f} 秒"
+            )
+
+    def release(self) -> None:
+        """请求被取消、没有结论时调用，释放半开状态的探测名额"""
+        self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "state": self.OPEN if self.is_open else (self.CLOSED if self.state == self.CLOSED else self.HALF_OPEN),
+            "consecutive_failures": self._failures,
+            "failure_threshold": self.failure_threshold,
+            "recovery_timeout": self.recovery_timeout,
+            "enabled": self.enabled,
+        }
+
+
+class LatencyTracker:
+    """滑动窗口内的响应耗时分位数"""
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+
+    def stats(self) -> Dict[str, Any]:
+        p50 = self.percentile(0.5)
+        p95 = self.percentile(0.95)
+        return {
+            "samples": len(self._samples),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+class HedgingPolicy:
+    """对冲请求策略：首个请求超过分位数耗时仍未返回时，再发一个相同请求"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.05,
+        max_delay: float = 3.0,
+        endpoints: Optional[List[str]] = None,
+    ) -> None:
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.endpoints = set(endpoints if endpoints is not None else ["geocode", "place_text", "place_around"])
+
+    def applies_to(self, endpoint: str) -> bool:
+        return self.enabled and endpoint in self.endpoints
+
+    def delay(self, latency: LatencyTracker) -> float:
+        """样本不足时用 initial_delay，否则取分位数耗时并限制在 [min_delay, max_delay]"""
+        if len(latency) < self.min_samples:
+            return self.initial_delay
+        value = latency.percentile(self.percentile) or self.initial_delay
+        return min(self.max_delay, max(self.min_delay, value))
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def _amap_settings():
+    try:
+        from app.config import config
+
+        return config.amap
+    except Exception as e:
+        logger.warning(f"读取高德熔断/对冲配置失败，使用默认值: {e}")
+        return None
+
+
+def get_circuit_breaker(endpoint: str) -> CircuitBreaker:
+    """获取端点的进程级熔断器（配置来自 [amap.circuit_breaker]）"""
+    breaker = _breakers.get(endpoint)
+    if breaker is None:
+        settings = _amap_settings()
+        kwargs = settings.circuit_breaker.model_dump() if settings is not None else {}
+        breaker = CircuitBreaker(endpoint, **kwargs)
+        _breakers[endpoint] = breaker
+    return breaker
+
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
+
+
+def load_hedging_policy() -> HedgingPolicy:
+    """读取 [amap.hedging] 配置"""
+    settings = _amap_settings()
+    if settings is None:
+        return HedgingPolicy()
+    return HedgingPolicy(**settings.hedging.model_dump())
@@ -0,0 +1,125 @@
+"""高德 API 令牌桶限流调度器。
+
+每个端点（geocode / place_text / place_around ...）一个令牌桶，所有请求在发出前
+先 `acquire`。令牌充足时立即放行，不足时按预约顺序排队等待，
+多个并发请求因此公平地共享同一份 QPS 配额。
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+from app.logger import logger
+
+
+class TokenBucket:
+    """预约式令牌桶
+
+    令牌可以透支：每次 `reserve` 都立即扣减一个令牌并返回需要等待的秒数，
+    后来者的等待时间自然排在先来者之后（FIFO），且不依赖具体事件循环。
+    """
+
+    def __init__(self, qps: float, burst: int) -> None:
+        self.qps = max(float(qps), 0.1)
+        self.burst = max(int(burst), 1)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._tokens = min(self.burst, self._tokens + elapsed * self.qps)
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        """预约一个令牌，返回需要等待的秒数（0 表示立即可用）"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.qps
+
+    def drain(self) -> None:
+        """清空令牌（上游返回超限时调用，让后续请求退让一个周期）"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0)
+
+
+class AMapRateScheduler:
+    """按端点分配令牌桶的限流调度器"""
+
+    # 默认配额按个人开发者 Key 的并发上限（3 次/秒）设置；配额更高的 Key 在 config.toml 中调高
+    DEFAULT_QPS = 3.0
+    DEFAULT_BURST = 3
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None) -> None:
+        self._limits = limits or {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _bucket(self, endpoint: str) -> TokenBucket:
+        bucket = self._buckets.get(endpoint)
+        if bucket is None:
+            limit = self._limits.get(endpoint, {})
+            bucket = TokenBucket(
+                qps=limit.get("qps", self.DEFAULT_QPS),
+                burst=limit.get("burst", self.DEFAULT_BURST),
+            )
+            self._buckets[endpoint] = bucket
+            self._stats[endpoint] = {"acquired": 0, "throttled": 0, "wait_seconds": 0.0, "drained": 0}
+        return bucket
+
+    async def acquire(self, endpoint: str) -> None:
+        """获取端点的一个令牌，必要时等待"""
+        bucket = self._bucket(endpoint)
+        stats = self._stats[endpoint]
+        stats["acquired"] += 1
+        wait = bucket.reserve()
+        if wait > 0:
+            stats["throttled"] += 1
+            stats["wait_seconds"] += wait
+            await asyncio.sleep(wait)
+
+    def report_limit_exceeded(self, endpoint: str) -> None:
+        """上游返回 CUQPS_HAS_EXCEEDED_THE_LIMIT 时调用"""
+        self._bucket(endpoint).drain()
+        self._stats[endpoint]["drained"] += 1
+        logger.warning(f"高德API {endpoint} 触发QPS限制，令牌桶已清空")
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """返回各端点的限流统计"""
+        result = {}
+        for endpoint, stats in self._stats.items():
+            bucket = self._buckets[endpoint]
+            result[endpoint] = {
+                **stats,
+                "wait_seconds": round(stats["wait_seconds"], 3),
+                "qps": bucket.qps,
+                "burst": bucket.burst,
+            }
+        return result
+
+
+_scheduler: Optional[AMapRateScheduler] = None
+
+
+def get_rate_scheduler() -> AMapRateScheduler:
+    """获取进程级共享的限流调度器（配额来自 config.toml 的 [amap.rate_limits]）"""
+    global _scheduler
+    if _scheduler is None:
+        limits: Dict[str, Dict[str, float]] = {}
+        try:
+            from app.config import config
+
+            if config.amap is not None:
+                limits = {
+                    name: limit.model_dump()
+                    for name, limit in config.amap.rate_limits.items()
+                }
+        except Exception as e:
+            logger.warning(f"读取高德限流配置失败，使用默认配额: {e}")
+        _scheduler = AMapRateScheduler(limits)
+    return _scheduler
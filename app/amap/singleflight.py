@@ -0,0 +1,59 @@
+"""进行中请求合并（single-flight）。
+
+同一时刻多个用户查询同一个地标或同一个中心点/关键词时，只有第一个调用者真正访问
+高德 API，其余调用者等待同一个任务的结果。
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """按 key 合并并发中的相同请求"""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._inflight: Dict[Tuple[int, Hashable], "asyncio.Task[Any]"] = {}
+        self._stats: Dict[str, int] = {"leaders": 0, "followers": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """执行 `fn`；若相同 key 的请求正在进行，则等待其结果
+
+        共享任务由 `asyncio.shield` 保护，单个调用者被取消不会影响其他等待者。
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        task = self._inflight.get(flight_key)
+        if task is None:
+            self._stats["leaders"] += 1
+            task = loop.create_task(fn())
+            self._inflight[flight_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(flight_key, None))
+        else:
+            self._stats["followers"] += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        """leaders 为实际上游调用次数，followers 为节省的调用次数"""
+        return {**self._stats, "inflight": len(self._inflight)}
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def get_flight_group(name: str) -> SingleFlight:
+    """获取（或创建）指定名称的进程级合并组"""
+    group = _groups.get(name)
+    if group is None:
+        group = SingleFlight(name)
+        _groups[name] = group
+    return group
+
+
+def singleflight_stats(name: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """返回所有合并组（或指定组）的统计"""
+    if name is not None:
+        return {name: get_flight_group(name).stats()}
+    return {group_name: group.stats() for group_name, group in _groups.items()}
@@ -0,0 +1,305 @@
+"""离线轨道交通线网：不经网络估算两点之间乘地铁的耗时。
+
+随应用发布的 `data/transit_graph.json` 按城市保存车站（名称、坐标）与线路（按顺序
+排列的车站编号），由 `tools/build_transit_graph.py` 从高德公交线路查询生成；城市
+范围与 `data/cities.json` 一致。文件缺失或某城市没有数据时对应查询返回 None，
+由调用方退回直线距离。
+
+图模型：每条线路在每个车站有一个“站台”节点，同一线路相邻站台之间的边权为区间
+运行时间（直线距离 / 线路速度 + 停站时间），同一车站的不同站台之间为换乘边。
+加载后（或首次查询时）以每个车站的全部站台为源点各跑一次多源 Dijkstra，得到车站
+× 车站的全源最短耗时表；之后的查询只查表：
+
+    耗时 = 进站（起点到附近车站）+ 候车 + 表[进站车站, 出站车站] + 出站（车站到终点）
+
+起终点各取最近的 ACCESS_STATIONS 个车站，取所有组合中的最小值，并与直接步行比较。
+进出站在 WALK_RADIUS 以内按步行计，超出部分按接驳（公交/骑行）速度计。
+"""
+
+import heapq
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.amap.distance import distance_matrix
+from app.logger import logger
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_PATH = PROJECT_ROOT / "data" / "transit_graph.json"
+
+FORMAT_VERSION = 1
+
+# 步行：1.2m/s，实际路程按直线距离 × DETOUR 计
+WALK_SPEED = 1.2
+DETOUR = 1.3
+# 进出站超过该直线距离的部分按接驳速度（约 15km/h）计
+WALK_RADIUS = 1000.0
+FEEDER_SPEED = 4.2
+ACCESS_STATIONS = 8
+# 候车（每次出行一次）、换乘、停站时间（秒）与线路默认速度（km/h）
+WAIT_SECONDS = 180.0
+TRANSFER_SECONDS = 240.0
+DWELL_SECONDS = 30.0
+DEFAULT_SPEED_KMH = 35.0
+# 点到某城市最近车站超过该距离时视为不在该城市线网范围内
+CITY_RADIUS_M = 30000.0
+
+
+def access_seconds(distance: np.ndarray) -> np.ndarray:
+    """直线距离（米）-> 进出站耗时（秒）：WALK_RADIUS 内步行，超出部分按接驳速度"""
+    walk = np.minimum(distance, WALK_RADIUS) * DETOUR / WALK_SPEED
+    feeder = np.maximum(distance - WALK_RADIUS, 0.0) * DETOUR / FEEDER_SPEED
+    return walk + feeder
+
+
+class TransitNetwork:
+    """一个城市的轨道交通线网"""
+
+    def __init__(self, city: str, stations: Sequence[Sequence[Any]], lines: Sequence[Dict[str, Any]]) -> None:
+        self.city = city
+        self.names: List[str] = [str(station[0]) for station in stations]
+        self.points: List[Tuple[float, float]] = [(float(s[1]), float(s[2])) for s in stations]
+        self.line_names: List[str] = []
+        # 站台 -> 所在车站；车站 -> 站台列表；站台邻接表 [(站台, 耗时)]
+        self._platform_station: List[int] = []
+        self._station_platforms: List[List[int]] = [[] for _ in self.points]
+        self._adjacency: List[List[Tuple[int, float]]] = []
+        self._table: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+        for line in lines:
+            self._add_line(line)
+        for platforms in self._station_platforms:
+            for a in platforms:
+                for b in platforms:
+                    if a != b:
+                        self._adjacency[a].append((b, TRANSFER_SECONDS))
+        # 没有线路经过的车站不作为进出站车站
+        self._served = np.array([bool(platforms) for platforms in self._station_platforms], dtype=bool)
+
+    def _add_line(self, line: Dict[str, Any]) -> None:
+        sequence = [i for i in line.get("stations") or [] if isinstance(i, int) and 0 <= i < len(self.points)]
+        if len(sequence) < 2:
+            return
+        speed = float(line.get("speed") or DEFAULT_SPEED_KMH) / 3.6
+        if line.get("loop") and sequence[0] != sequence[-1]:
+            sequence.append(sequence[0])
+        platforms: Dict[int, int] = {}
+        for station in sequence:
+            if station not in platforms:
+                platforms[station] = len(self._platform_station)
+                self._platform_station.append(station)
+                self._station_platforms[station].append(platforms[station])
+                self._adjacency.append([])
+        segments = distance_matrix([self.points[i] for i in sequence], [self.points[i] for i in sequence])
+        for k in range(len(sequence) - 1):
+            a, b = platforms[sequence[k]], platforms[sequence[k + 1]]
+            if a == b:
+                continue
+            seconds = float(segments[k, k + 1]) / speed + DWELL_SECONDS
+            self._adjacency[a].append((b, seconds))
+            self._adjacency[b].append((a, seconds))
+        self.line_names.append(str(line.get("name") or ""))
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @property
+    def platform_count(self) -> int:
+        return len(self._platform_station)
+
+    def shortest_from(self, sources: Dict[int, float]) -> np.ndarray:
+        """多源 Dijkstra：sources 为 站台 -> 初始耗时，返回到各站台的最短耗时（不可达为 inf）"""
+        best = np.full(self.platform_count, np.inf)
+        heap = [(cost, platform) for platform, cost in sources.items()]
+        heapq.heapify(heap)
+        for platform, cost in sources.items():
+            best[platform] = min(best[platform], cost)
+        while heap:
+            cost, platform = heapq.heappop(heap)
+            if cost > best[platform]:
+                continue
+            for neighbor, seconds in self._adjacency[platform]:
+                candidate = cost + seconds
+                if candidate < best[neighbor]:
+                    best[neighbor] = candidate
+                    heapq.heappush(heap, (candidate, neighbor))
+        return best
+
+    def precompute(self) -> np.ndarray:
+        """车站 × 车站全源最短耗时表（秒）：每个车站以其全部站台为源点跑一次多源 Dijkstra"""
+        with self._lock:
+            if self._table is None:
+                started = time.perf_counter()
+                platform_station = np.asarray(self._platform_station, dtype=np.int64)
+                table = np.full((len(self), len(self)), np.inf)
+                for station, platforms in enumerate(self._station_platforms):
+                    if not platforms:
+                        continue
+                    reached = self.shortest_from({platform: 0.0 for platform in platforms})
+                    # 到达某车站的耗时取其各站台的最小值
+                    np.minimum.at(table[station], platform_station, reached)
+                np.fill_diagonal(table, 0.0)
+                self._table = table
+                logger.info(
+                    f"{self.city} 轨道交通耗时表: {len(self)} 个车站, {self.platform_count} 个站台, "
+                    f"{len(self.line_names)} 条线路, 用时 {time.perf_counter() - started:.2f}s"
+                )
+            return self._table
+
+    def nearest_distance(self, points: Iterable[Tuple[float, float]]) -> np.ndarray:
+        """各点到最近车站的直线距离（米）"""
+        return self._distances(list(points)).min(axis=1)
+
+    def travel_times(
+        self,
+        origins: Sequence[Tuple[float, float]],
+        destinations: Sequence[Tuple[float, float]],
+    ) -> np.ndarray:
+        """origins × destinations 乘地铁（或直接步行，取较快者）的耗时矩阵（秒）"""
+        table = self.precompute()
+        k = min(ACCESS_STATIONS, int(self._served.sum()))
+        origin_stations, origin_access = self._access(origins, k)
+        destination_stations, destination_access = self._access(destinations, k)
+        # (起点, 进站车站, 终点, 出站车站) 四维组合取最小
+        ride = table[origin_stations[:, :, None, None], destination_stations[None, None, :, :]]
+        total = origin_access[:, :, None, None] + WAIT_SECONDS + ride + destination_access[None, None, :, :]
+        transit = total.min(axis=(1, 3))
+        walk = distance_matrix(origins, destinations) * DETOUR / WALK_SPEED
+        return np.minimum(transit, walk)
+
+    def _distances(self, points: Sequence[Tuple[float, float]]) -> np.ndarray:
+        """点 × 车站直线距离（米），没有线路经过的车站为 inf"""
+        distances = distance_matrix(points, self.points)
+        distances[:, ~self._served] = np.inf
+        return distances
+
+    def _access(self, points: Sequence[Tuple[float, float]], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """各点最近的 k 个车站及进出站耗时，形状均为 (点数, k)"""
+        distances = self._distances(points)
+        if k < len(self):
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        else:
+            nearest = np.tile(np.arange(len(self)), (len(distances), 1))
+        return nearest, access_seconds(np.take_along_axis(distances, nearest, axis=1))
+
+
+class TransitGraph:
+    """各城市线网的集合"""
+
+    def __init__(self, networks: Optional[Dict[str, TransitNetwork]] = None, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.networks: Dict[str, TransitNetwork] = dict(networks or {})
+        self._stats: Dict[str, int] = {"queries": 0, "uncovered": 0}
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_PATH, enabled: bool = True) -> "TransitGraph":
+        """读取线网文件；文件缺失或损坏时返回空线网（所有查询返回 None）"""
+        networks: Dict[str, TransitNetwork] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                payload = json.load(fh)
+            if payload.get("version") == FORMAT_VERSION:
+                for city, data in (payload.get("cities") or {}).items():
+                    network = TransitNetwork(city, data.get("stations") or [], data.get("lines") or [])
+                    if len(network) and network.platform_count:
+                        networks[city] = network
+            else:
+                logger.warning(f"轨道交通线网文件版本不兼容，忽略: {path}")
+        except FileNotFoundError:
+            logger.info(f"轨道交通线网文件不存在，不使用离线地铁耗时: {path}")
+        except (json.JSONDecodeError, TypeError, ValueError, IndexError) as e:
+            logger.warning(f"轨道交通线网文件解析失败: {e}")
+        graph = cls(networks, enabled=enabled)
+        if networks:
+            logger.info(f"轨道交通线网已加载: {', '.join(networks)}")
+        return graph
+
+    def precompute(self) -> int:
+        """为所有城市建好耗时表，返回城市数"""
+        if not self.enabled:
+            return 0
+        for network in self.networks.values():
+            network.precompute()
+        return len(self.networks)
+
+    def network_for(self, points: Sequence[Tuple[float, float]]) -> Optional[TransitNetwork]:
+        """全部点都在 CITY_RADIUS_M 内有车站的城市线网；没有时返回 None"""
+        if not self.enabled or not points:
+            return None
+        for network in self.networks.values():
+            if float(network.nearest_distance(points).max()) <= CITY_RADIUS_M:
+                return network
+        return None
+
+    def travel_times(
+        self,
+        origins: Sequence[Tuple[float, float]],
+        destinations: Sequence[Tuple[float, float]],
+    ) -> Optional[np.ndarray]:
+        """origins × destinations 的乘地铁耗时矩阵（秒）；不在任何城市线网范围内时返回 None"""
+        if not origins or not destinations:
+            return None
+        network = self.network_for(list(origins) + list(destinations))
+        if network is None:
+            self._stats["uncovered"] += 1
+            return None
+        self._stats["queries"] += 1
+        return network.travel_times(origins, destinations)
+
+    def __len__(self) -> int:
+        return len(self.networks)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "cities": {
+                city: {"stations": len(network), "lines": len(network.line_names),
+                       "table_ready": network._table is not None}
+                for city, network in self.networks.items()
+            },
+        }
+
+
+def to_payload(cities: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """城市 -> {"stations": [[名称, lng, lat], ...], "lines": [...]} 导出为文件格式"""
+    return {
+        "version": FORMAT_VERSION,
+        "generated_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "station_fields": ["name", "lng", "lat"],
+        "cities": dict(sorted(cities.items())),
+    }
+
+
+_transit_graph: Optional[TransitGraph] = None
+
+
+def _settings():
+    try:
+        from app.config import config
+
+        return config.amap.transit if config.amap is not None else None
+    except Exception as e:
+        logger.warning(f"读取轨道交通线网配置失败，使用默认值: {e}")
+        return None
+
+
+def get_transit_graph() -> TransitGraph:
+    """获取进程级轨道交通线网（首次调用时从 [amap.transit].path 加载）"""
+    global _transit_graph
+    if _transit_graph is None:
+        settings = _settings()
+        path, enabled = DEFAULT_PATH, True
+        if settings is not None:
+            enabled = settings.enabled
+            if settings.path:
+                path = Path(settings.path)
+                if not path.is_absolute():
+                    path = PROJECT_ROOT / path
+        _transit_graph = TransitGraph.load(path, enabled=enabled)
+    return _transit_graph
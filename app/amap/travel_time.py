@@ -0,0 +1,147 @@
+"""候选中心点与参与者之间的出行时间（高德距离测量 /v3/distance）。
+
+距离测量接口一次最多 100 个起点、1 个终点。智能中心点的候选远多于参与者，因此以
+候选点为起点、参与者为终点批量查询：每个参与者一次调用即可拿到最多 100 个候选的
+出行时间（与参与者前往中心点的方向相反，驾车时差异通常只有几分钟，视为近似）。
+
+结果按 (起点网格, 终点网格, 方式) 存入进程级共享缓存，网格为 7 位 geohash（约
+150m）。每次计算受上游调用预算约束：预算用尽或调用失败时，缺失的出行时间按已测得
+结果的“时间 / 直线距离”比值由直线距离估算；一个结果都没有（或算不出比值）时返回
+None，由调用方退回直线距离。
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.amap import geohash
+from app.amap.cache import get_cache
+from app.amap.client import get_amap_client
+from app.amap.distance import distance_matrix
+from app.exceptions import AMapError
+from app.logger import logger
+
+# 出行方式 -> 距离测量接口的 type 参数（步行仅支持 5km 以内）
+MODES: Dict[str, str] = {"driving": "1", "walking": "3"}
+MAX_ORIGINS = 100
+CELL_PRECISION = 7
+
+
+class CallBudget:
+    """一次计算允许的上游调用次数"""
+
+    def __init__(self, calls: int) -> None:
+        self.remaining = calls
+        self.used = 0
+
+    def take(self) -> bool:
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        self.used += 1
+        return True
+
+
+def _cell(point: Tuple[float, float]) -> str:
+    return geohash.encode(point[0], point[1], CELL_PRECISION)
+
+
+def _cache_key(origin_cell: str, destination_cell: str, mode: str) -> Tuple[str, str, str, str]:
+    return ("travel", origin_cell, destination_cell, mode)
+
+
+async def _measure(
+    api_key: str, origins: List[Tuple[float, float]], destination: Tuple[float, float], mode: str
+) -> Optional[List[Optional[float]]]:
+    """一次距离测量：各起点到终点的耗时（秒），失败时返回 None"""
+    params = {
+        "key": api_key,
+        "origins": "|".join(f"{lng:.6f},{lat:.6f}" for lng, lat in origins),
+        "destination": f"{destination[0]:.6f},{destination[1]:.6f}",
+        "type": MODES[mode],
+    }
+    try:
+        data = await get_amap_client().get_json("distance", params)
+    except AMapError as e:
+        logger.warning(f"距离测量失败: {e}")
+        return None
+    if data.get("status") != "1":
+        logger.warning(f"距离测量API返回错误: {data.get('info', '未知错误')}")
+        return None
+    durations: List[Optional[float]] = [None] * len(origins)
+    for item in data.get("results") or []:
+        try:
+            durations[int(item["origin_id"]) - 1] = float(item["duration"])
+        except (KeyError, TypeError, ValueError, IndexError):
+            continue
+    return durations
+
+
+async def travel_time_matrix(
+    candidates: List[Tuple[float, float]],
+    participants: List[Tuple[float, float]],
+    api_key: str,
+    budget: CallBudget,
+    mode: str = "driving",
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """候选 × 参与者出行时间矩阵（秒）
+
+    Returns:
+        (seconds, measured)：measured 为 False 的位置是由直线距离估算的；
+        没有任何实测结果（缓存或上游），或有缺失但实测结果都无法换算比值时返回 None
+    """
+    if mode not in MODES:
+        raise ValueError(f"未知的出行方式: {mode}，可选 {', '.join(MODES)}")
+    cache = get_cache("travel_time")
+    candidate_cells = [_cell(point) for point in candidates]
+    participant_cells = [_cell(point) for point in participants]
+    seconds = np.full((len(candidates), len(participants)), np.nan)
+
+    # 先查缓存，再按参与者分组，把缺失的候选网格每 MAX_ORIGINS 个合成一次调用
+    requests = []
+    for j, participant_cell in enumerate(participant_cells):
+        missing: Dict[str, Tuple[float, float]] = {}
+        for i, candidate_cell in enumerate(candidate_cells):
+            cached = cache.get(_cache_key(candidate_cell, participant_cell, mode))
+            if cached is not None:
+                seconds[i, j] = cached
+            elif candidate_cell not in missing:
+                missing[candidate_cell] = candidates[i]
+        cells = list(missing)
+        for start in range(0, len(cells), MAX_ORIGINS):
+            if not budget.take():
+                break
+            batch = cells[start:start + MAX_ORIGINS]
+            requests.append((j, batch, [missing[cell] for cell in batch]))
+
+    results = await asyncio.gather(*(
+        _measure(api_key, origins, participants[j], mode) for j, _, origins in requests
+    ))
+    measured_cells: Dict[Tuple[str, int], float] = {}
+    for (j, batch, _), durations in zip(requests, results):
+        if durations is None:
+            continue
+        for cell, duration in zip(batch, durations):
+            if duration is not None:
+                measured_cells[(cell, j)] = duration
+                cache.set(_cache_key(cell, participant_cells[j], mode), duration)
+    for i, candidate_cell in enumerate(candidate_cells):
+        for j in range(len(participants)):
+            duration = measured_cells.get((candidate_cell, j))
+            if duration is not None:
+                seconds[i, j] = duration
+
+    measured = ~np.isnan(seconds)
+    if not measured.any():
+        return None
+    if not measured.all():
+        # 缺失的位置：直线距离 × 实测的 时间/距离 比值（中位数）
+        straight = distance_matrix(candidates, participants)
+        usable = measured & (straight > 0)
+        if not usable.any():
+            # 实测的都是直线距离为 0 的位置，算不出比值；按 0 估算会让其余位置都显得“最公平”
+            return None
+        ratio = float(np.median(seconds[usable] / straight[usable]))
+        seconds = np.where(measured, seconds, straight * ratio)
+    return seconds, measured
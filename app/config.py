@@ -39,10 +39,114 @@ class SearchSettings(BaseModel):
     engine: str = Field(default="Google", description="Search engine the llm to use")
 
 
+class AMapRateLimitSettings(BaseModel):
+    """单个高德端点的限流配额"""
+    qps: float = Field(3.0, description="每秒允许的请求数（默认按个人开发者 Key 的配额）")
+    burst: int = Field(3, description="令牌桶容量（允许的瞬时突发请求数）")
+
+
+class AMapCacheSettings(BaseModel):
+    """进程级高德结果缓存的容量与有效期"""
+    max_bytes: int = Field(..., description="缓存字节预算")
+    ttl: float = Field(..., description="条目有效期（秒）")
+
+
+class AMapGeocodeStoreSettings(BaseModel):
+    """地理编码持久化缓存（SQLite）配置"""
+    enabled: bool = Field(True, description="是否启用持久化地理编码缓存")
+    ttl: float = Field(30 * 24 * 3600, description="持久化条目有效期（秒）")
+    warm_start: int = Field(500, description="启动时预热到内存缓存的热门地址数")
+
+
+class AMapNegativeCacheSettings(BaseModel):
+    """地理编码失败结果短期缓存配置"""
+    enabled: bool = Field(True, description="是否缓存失败的地理编码")
+    not_found_ttl: float = Field(600, description="地址无结果的缓存时间（秒）")
+    quota_ttl: float = Field(60, description="配额/并发超限的缓存时间（秒）")
+    max_bytes: int = Field(256 * 1024, description="缓存字节预算")
+
+
+class AMapCircuitBreakerSettings(BaseModel):
+    """按端点的熔断配置"""
+    enabled: bool = Field(True, description="是否启用熔断")
+    failure_threshold: int = Field(5, description="连续失败多少次后熔断")
+    recovery_timeout: float = Field(30, description="熔断后多久放行探测请求（秒）")
+
+
+class AMapHedgingSettings(BaseModel):
+    """对冲请求配置（仅用于幂等的 GET 端点）"""
+    enabled: bool = Field(False, description="是否启用对冲请求")
+    percentile: float = Field(0.95, description="首个请求超过该分位数耗时仍未返回时发出对冲请求")
+    min_samples: int = Field(20, description="延迟样本少于该数量时使用 initial_delay")
+    initial_delay: float = Field(1.0, description="样本不足时的对冲等待时间（秒）")
+    min_delay: float = Field(0.05, description="对冲等待时间下限（秒）")
+    max_delay: float = Field(3.0, description="对冲等待时间上限（秒）")
+    endpoints: List[str] = Field(
+        default_factory=lambda: ["geocode", "place_text", "place_around"],
+        description="允许对冲的端点",
+    )
+
+
+class AMapGazetteerSettings(BaseModel):
+    """离线地名表配置"""
+    enabled: bool = Field(True, description="是否优先使用离线地名表解析地址")
+    path: str = Field("data/gazetteer.json", description="地名表文件（相对项目根目录）")
+    refresh_min_hits: int = Field(3, description="启动时并入持久化缓存中命中不少于该次数的地址")
+    refresh_limit: int = Field(1000, description="启动时最多并入的地址数")
+
+
+class AMapTransitSettings(BaseModel):
+    """离线轨道交通线网配置"""
+    enabled: bool = Field(True, description="是否使用离线线网估算乘地铁耗时")
+    path: str = Field("data/transit_graph.json", description="线网文件（相对项目根目录）")
+
+
+class AMapPOIIndexSettings(BaseModel):
+    """进程内 POI 空间索引配置"""
+    max_pois: int = Field(20000, description="索引保存的 POI 条数上限")
+    max_age: float = Field(1800, description="POI 与覆盖记录的有效期（秒）")
+
+
 class AMapSettings(BaseModel):
     """高德地图API配置"""
     api_key: str = Field(..., description="高德地图API密钥")
     web_api_key: Optional[str] = Field(None, description="高德地图JavaScript API密钥")
+    rate_limits: Dict[str, AMapRateLimitSettings] = Field(
+        default_factory=dict,
+        description="按端点配置的限流配额，键为 geocode / place_text / place_around / distance",
+    )
+    cache: Dict[str, AMapCacheSettings] = Field(
+        default_factory=dict,
+        description="共享缓存预算，键为 geocode / travel_time",
+    )
+    geocode_store: AMapGeocodeStoreSettings = Field(
+        default_factory=AMapGeocodeStoreSettings,
+        description="地理编码持久化缓存配置",
+    )
+    poi_index: AMapPOIIndexSettings = Field(
+        default_factory=AMapPOIIndexSettings,
+        description="POI 空间索引配置",
+    )
+    negative_cache: AMapNegativeCacheSettings = Field(
+        default_factory=AMapNegativeCacheSettings,
+        description="地理编码失败缓存配置",
+    )
+    gazetteer: AMapGazetteerSettings = Field(
+        default_factory=AMapGazetteerSettings,
+        description="离线地名表配置",
+    )
+    transit: AMapTransitSettings = Field(
+        default_factory=AMapTransitSettings,
+        description="离线轨道交通线网配置",
+    )
+    circuit_breaker: AMapCircuitBreakerSettings = Field(
+        default_factory=AMapCircuitBreakerSettings,
+        description="熔断配置",
+    )
+    hedging: AMapHedgingSettings = Field(
+        default_factory=AMapHedgingSettings,
+        description="对冲请求配置",
+    )
 
 
 class BrowserSettings(BaseModel):
@@ -258,8 +362,11 @@ class Config:
         # 优先使用环境变量中的 AMAP_API_KEY
         if amap_api_key:
             amap_settings = AMapSettings(
-                api_key=amap_api_key,
-                security_js_code=os.getenv("AMAP_SECURITY_JS_CODE", amap_config.get("security_js_code", ""))
+                **{
+                    **amap_config,
+                    "api_key": amap_api_key,
+                    "security_js_code": os.getenv("AMAP_SECURITY_JS_CODE", amap_config.get("security_js_code", "")),
+                }
             )
         elif amap_config and amap_config.get("api_key"):
             amap_settings = AMapSettings(**amap_config)
@@ -1,11 +1,14 @@
 """常用数据库操作封装。"""
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.geocode_cache import GeocodeCacheEntry
 from app.models.user import User
 
 
@@ -48,3 +51,77 @@ async def touch_last_login(db: AsyncSession, user: User) -> None:
     user.last_login = datetime.utcnow()
     await db.commit()
 
+
+async def get_geocode_entry(
+    db: AsyncSession, address_key: str, now: datetime
+) -> Optional[GeocodeCacheEntry]:
+    """查询未过期的地理编码缓存（只读，命中次数由调用方批量累加）。"""
+    stmt = select(GeocodeCacheEntry).where(
+        GeocodeCacheEntry.address_key == address_key,
+        GeocodeCacheEntry.expires_at > now,
+    )
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+async def add_geocode_hits(db: AsyncSession, hits: Dict[str, int]) -> None:
+    """在一个事务内累加多条地理编码缓存的命中次数。"""
+    for address_key, count in hits.items():
+        await db.execute(
+            update(GeocodeCacheEntry)
+            .where(GeocodeCacheEntry.address_key == address_key)
+            .values(hits=GeocodeCacheEntry.hits + count)
+        )
+    await db.commit()
+
+
+async def upsert_geocode_entry(
+    db: AsyncSession,
+    address_key: str,
+    lng: float,
+    lat: float,
+    city: str,
+    district: str,
+    payload_json: str,
+    expires_at: datetime,
+) -> None:
+    """写入或刷新地理编码缓存（单条 INSERT ... ON CONFLICT，同一地址并发写入不会冲突）。"""
+    insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    values = {
+        "lng": lng,
+        "lat": lat,
+        "city": city,
+        "district": district,
+        "payload_json": payload_json,
+        "expires_at": expires_at,
+    }
+    stmt = insert(GeocodeCacheEntry).values(address_key=address_key, hits=1, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[GeocodeCacheEntry.address_key],
+        set_={**values, "updated_at": func.now()},
+    )
+    await db.execute(stmt)
+    await db.commit()
+
+
+async def list_hot_geocode_entries(
+    db: AsyncSession, now: datetime, limit: int
+) -> List[GeocodeCacheEntry]:
+    """按命中次数倒序列出未过期的地理编码缓存。"""
+    stmt = (
+        select(GeocodeCacheEntry)
+        .where(GeocodeCacheEntry.expires_at > now)
+        .order_by(GeocodeCacheEntry.hits.desc())
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    return list(result.scalars().all())
+
+
+async def purge_expired_geocode_entries(db: AsyncSession, now: datetime) -> int:
+    """删除已过期的地理编码缓存，返回删除条数。"""
+    result = await db.execute(
+        delete(GeocodeCacheEntry).where(GeocodeCacheEntry.expires_at <= now)
+    )
+    await db.commit()
+    return result.rowcount or 0
@@ -11,3 +11,17 @@ class OpenManusError(Exception):
 
 class TokenLimitExceeded(OpenManusError):
     """Exception raised when the token limit is exceeded"""
+
+
+class AMapError(Exception):
+    """Raised when an AMap Web API request fails."""
+
+    def __init__(self, message, endpoint: str = "", status: int = None):
+        super().__init__(message)
+        self.message = message
+        self.endpoint = endpoint
+        self.status = status
+
+
+class AMapCircuitOpenError(AMapError):
+    """Raised without contacting AMap while the endpoint's circuit breaker is open."""
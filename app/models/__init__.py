@@ -6,4 +6,5 @@ from app.db.database import Base  # noqa: F401
 from app.models.user import User  # noqa: F401
 from app.models.room import GatheringRoom, RoomParticipant  # noqa: F401
 from app.models.message import ChatMessage, VenueVote  # noqa: F401
+from app.models.geocode_cache import GeocodeCacheEntry  # noqa: F401
 
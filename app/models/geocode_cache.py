@@ -0,0 +1,19 @@
+"""持久化地理编码缓存模型。"""
+
+from sqlalchemy import Column, DateTime, Float, Integer, String, Text, func
+
+from app.db.database import Base
+
+
+class GeocodeCacheEntry(Base):
+    __tablename__ = "geocode_cache"
+
+    address_key = Column(String(255), primary_key=True)  # 规范化后的地址
+    lng = Column(Float, nullable=False)
+    lat = Column(Float, nullable=False)
+    city = Column(String(50), default="")
+    district = Column(String(50), default="")
+    payload_json = Column(Text, nullable=False)  # 精简后的地理编码结果（字段见 geocode_store.STORED_FIELDS）
+    hits = Column(Integer, default=0, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -3,15 +3,49 @@ import html
 import json
 import math
 import os
+import time
 import uuid
+from collections import deque
+from contextlib import aclosing
 from datetime import datetime
 from functools import lru_cache
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple, Union
 
 import aiofiles
-import aiohttp
+import numpy as np
 from pydantic import Field
 
+from app.amap import (
+    get_amap_client,
+    get_cache,
+    get_circuit_breaker,
+    get_flight_group,
+    get_gazetteer,
+    get_geocode_negative_cache,
+    get_geocode_store,
+    get_poi_index,
+    track_upstream_calls,
+)
+from app.amap import geohash, poi_cells
+from app.amap.area_sample import AreaSample
+from app.amap.center import OBJECTIVES as CENTER_OBJECTIVES, compute_center
+from app.amap.clustering import Cluster, cluster_participants
+from app.amap.distance import distance_matrix, distances_from, haversine_m
+from app.amap.transit_graph import get_transit_graph
+from app.amap.travel_time import CallBudget, travel_time_matrix
+from app.amap.address_matcher import (
+    ALIAS_TO_FULLNAME,
+    MAJOR_CITIES,
+    VAGUE_TERM_SUGGESTIONS,
+    cities_in,
+    vague_terms_in,
+)
+from app.amap.keys import normalize_address
+from app.amap.negative_cache import NOT_FOUND, QUOTA, is_quota_error
+from app.amap.place import Place, as_place
+from app.amap.place_scores import BREAKDOWN_KEYS, DEFAULT_RATING, ScoreColumns, score_columns
+from app.amap.requirement_matcher import REQUIREMENT_MATCHER
+from app.exceptions import AMapCircuitOpenError, AMapError
 from app.logger import logger
 from app.tool.base import BaseTool, ToolResult
 from app.config import config
@@ -71,6 +105,19 @@ class CafeRecommender(BaseTool):
                 "description": "(可选) 用户的额外需求，如'停车方便'，'环境安静'等",
                 "default": "",
             },
+            "center_objective": {
+                "type": "string",
+                "description": "(可选) 三人及以上时的中心点算法：'midpoint'(经纬度平均，默认)、'median'(总距离最短)、'minimax'(最远者距离最短)",
+                "enum": list(CENTER_OBJECTIVES),
+                "default": "midpoint",
+            },
+            "cluster_count": {
+                "type": "integer",
+                "description": "(可选) 多中心模式：人数较多、分布在全城时把参与者按位置分成几组，每组推荐一个会面点；0 或 1 为单中心",
+                "minimum": 0,
+                "maximum": 10,
+                "default": 0,
+            },
         },
         "required": ["locations"],
     }
@@ -78,79 +125,56 @@ class CafeRecommender(BaseTool):
     # 高德地图API密钥
     api_key: str = Field(default="")
 
-    # 缓存请求结果以减少API调用（路演模式：极限压缩防止OOM）
-    geocode_cache: Dict[str, Dict] = Field(default_factory=dict)
-    poi_cache: Dict[str, List] = Field(default_factory=dict)
-    GEOCODE_CACHE_MAX: int = 30  # 路演模式：减少到30个地址
-    POI_CACHE_MAX: int = 15  # 路演模式：减少到15个POI搜索结果
-
-    # ========== 品牌特征知识库 ==========
-    # 用于三层匹配算法的第二层：基于品牌特征的需求推断
-    # 分值范围 0.0-1.0，>=0.7 视为满足需求
-    BRAND_FEATURES: Dict[str, Dict[str, float]] = {
-        # ========== 咖啡馆 (15个) ==========
-        "星巴克": {"安静": 0.8, "WiFi": 1.0, "商务": 0.7, "停车": 0.3, "可以久坐": 0.9},
-        "瑞幸": {"安静": 0.4, "WiFi": 0.7, "商务": 0.4, "停车": 0.3, "可以久坐": 0.5},
-        "Costa": {"安静": 0.9, "WiFi": 1.0, "商务": 0.8, "停车": 0.4, "可以久坐": 0.9},
-        "漫咖啡": {"安静": 0.9, "WiFi": 0.9, "商务": 0.6, "停车": 0.5, "可以久坐": 1.0},
-        "太平洋咖啡": {"安静": 0.8, "WiFi": 0.9, "商务": 0.7, "停车": 0.4, "可以久坐": 0.8},
-        "Manner": {"安静": 0.5, "WiFi": 0.6, "商务": 0.4, "停车": 0.2, "可以久坐": 0.3},
-        "Seesaw": {"安静": 0.8, "WiFi": 0.9, "商务": 0.6, "停车": 0.3, "可以久坐": 0.8},
-        "M Stand": {"安静": 0.7, "WiFi": 0.8, "商务": 0.5, "停车": 0.3, "可以久坐": 0.7},
-        "Tims": {"安静": 0.6, "WiFi": 0.8, "商务": 0.5, "停车": 0.4, "可以久坐": 0.6},
-        "上岛咖啡": {"安静": 0.9, "WiFi": 0.8, "商务": 0.8, "停车": 0.6, "可以久坐": 0.9, "包间": 0.7},
-        "Zoo Coffee": {"安静": 0.7, "WiFi": 0.8, "商务": 0.5, "停车": 0.4, "可以久坐": 0.8, "适合儿童": 0.6},
-        "猫屎咖啡": {"安静": 0.8, "WiFi": 0.8, "商务": 0.6, "停车": 0.4, "可以久坐": 0.8},
-        "皮爷咖啡": {"安静": 0.7, "WiFi": 0.8, "商务": 0.5, "停车": 0.3, "可以久坐": 0.7},
-        "咖世家": {"安静": 0.8, "WiFi": 0.9, "商务": 0.7, "停车": 0.4, "可以久坐": 0.8},
-        "挪瓦咖啡": {"安静": 0.5, "WiFi": 0.6, "商务": 0.4, "停车": 0.2, "可以久坐": 0.4},
-        # ========== 中餐厅 (15个) ==========
-        "海底捞": {"包间": 0.9, "停车": 0.8, "安静": 0.2, "适合儿童": 0.9, "24小时营业": 0.3},
-        "西贝": {"包间": 0.7, "停车": 0.6, "安静": 0.5, "适合儿童": 0.7},
-        "外婆家": {"包间": 0.5, "停车": 0.5, "安静": 0.3, "适合儿童": 0.6},
-        "绿茶": {"包间": 0.4, "停车": 0.5, "安静": 0.4, "适合儿童": 0.5},
-        "小龙坎": {"包间": 0.6, "停车": 0.5, "安静": 0.2, "适合儿童": 0.4},
-        "呷哺呷哺": {"包间": 0.0, "停车": 0.4, "安静": 0.3, "适合儿童": 0.5},
-        "大龙燚": {"包间": 0.5, "停车": 0.5, "安静": 0.2, "适合儿童": 0.4},
-        "眉州东坡": {"包间": 0.8, "停车": 0.7, "安静": 0.6, "适合儿童": 0.7, "商务": 0.7},
-        "全聚德": {"包间": 0.9, "停车": 0.7, "安静": 0.6, "适合儿童": 0.6, "商务": 0.8},
-        "大董": {"包间": 0.9, "停车": 0.8, "安静": 0.8, "商务": 0.9},
-        "鼎泰丰": {"包间": 0.5, "停车": 0.6, "安静": 0.6, "适合儿童": 0.7},
-        "南京大牌档": {"包间": 0.6, "停车": 0.5, "安静": 0.3, "适合儿童": 0.6},
-        "九毛九": {"包间": 0.4, "停车": 0.5, "安静": 0.4, "适合儿童": 0.6},
-        "太二酸菜鱼": {"包间": 0.0, "停车": 0.4, "安静": 0.3, "适合儿童": 0.4},
-        "湘鄂情": {"包间": 0.8, "停车": 0.7, "安静": 0.5, "商务": 0.7},
-        # ========== 西餐/快餐 (10个) ==========
-        "麦当劳": {"停车": 0.5, "WiFi": 0.8, "适合儿童": 0.9, "24小时营业": 0.8},
-        "肯德基": {"停车": 0.5, "WiFi": 0.7, "适合儿童": 0.9, "24小时营业": 0.6},
-        "必胜客": {"包间": 0.3, "停车": 0.5, "适合儿童": 0.8, "安静": 0.5},
-        "萨莉亚": {"停车": 0.4, "适合儿童": 0.7, "安静": 0.4},
-        "汉堡王": {"停车": 0.4, "WiFi": 0.6, "适合儿童": 0.7},
-        "赛百味": {"停车": 0.3, "WiFi": 0.5, "可以久坐": 0.4},
-        "棒约翰": {"停车": 0.4, "适合儿童": 0.7, "包间": 0.2},
-        "达美乐": {"停车": 0.3, "适合儿童": 0.6},
-        "DQ": {"适合儿童": 0.9, "停车": 0.4},
-        "哈根达斯": {"适合儿童": 0.7, "安静": 0.6, "可以久坐": 0.5},
-        # ========== 奶茶/饮品 (8个) ==========
-        "喜茶": {"安静": 0.4, "可以久坐": 0.5, "停车": 0.3},
-        "奈雪的茶": {"安静": 0.5, "可以久坐": 0.6, "停车": 0.4, "WiFi": 0.6},
-        "茶百道": {"安静": 0.3, "可以久坐": 0.3, "停车": 0.2},
-        "一点点": {"安静": 0.2, "可以久坐": 0.2, "停车": 0.2},
-        "蜜雪冰城": {"安静": 0.2, "可以久坐": 0.2, "停车": 0.2},
-        "茶颜悦色": {"安静": 0.4, "可以久坐": 0.4, "停车": 0.3},
-        "古茗": {"安静": 0.3, "可以久坐": 0.3, "停车": 0.2},
-        "CoCo": {"安静": 0.3, "可以久坐": 0.3, "停车": 0.2},
-        # ========== 场所类型默认特征 (以下划线开头) ==========
-        "_图书馆": {"安静": 1.0, "WiFi": 0.9, "可以久坐": 1.0},
-        "_书店": {"安静": 1.0, "可以久坐": 0.8, "WiFi": 0.5},
-        "_商场": {"停车": 0.9, "交通": 0.8, "适合儿童": 0.7},
-        "_酒店": {"安静": 0.9, "商务": 0.9, "停车": 0.8, "WiFi": 0.9, "包间": 0.8},
-        "_电影院": {"停车": 0.7, "适合儿童": 0.6},
-        "_KTV": {"包间": 1.0, "停车": 0.6, "24小时营业": 0.5},
-        "_健身房": {"停车": 0.6, "WiFi": 0.5},
-        "_网咖": {"WiFi": 1.0, "24小时营业": 0.8, "可以久坐": 0.9},
-        "_便利店": {"24小时营业": 0.9},
+    # 地理编码结果缓存在进程级共享缓存（app.amap.cache）与持久化缓存中，POI 结果记入 app.amap.poi_index
+
+    # 高德批量地理编码单次最多 10 个地址
+    GEOCODE_BATCH_SIZE: int = 10
+    # 批量地理编码只采用这些精确级别的结果，其余级别改走逐个解析
+    PRECISE_GEOCODE_LEVELS: Tuple[str, ...] = ("门牌号", "单元号", "兴趣点")
+
+    # 智能中心点：同时评估的候选数与总耗时预算（秒）
+    SMART_CENTER_CONCURRENCY: int = 4
+    SMART_CENTER_BUDGET: float = 6.0
+    # 准备工作（区域取数、出行时间查询）最多占用的剩余预算比例
+    SMART_CENTER_PREP_SHARE: float = 0.5
+    # 候选评分中依赖高德搜索部分（POI 密度 + 交通）的满分，用于剪枝
+    CENTER_SEARCH_SCORE_MAX: float = 70.0
+    # 候选网格：粗网格（含原固定网格）+ 围绕前 TOP_K 个点逐级加密，见 _calculate_smart_center
+    SMART_CENTER_GRID: int = 1
+    SMART_CENTER_BASE_GRID: int = 3
+    SMART_CENTER_BASE_RADIUS: float = 1500.0
+    SMART_CENTER_TOP_K: int = 2
+    SMART_CENTER_LEVELS: int = 4
+    SMART_CENTER_MIN_RADIUS: float = 1500.0
+    SMART_CENTER_MAX_RADIUS: float = 5000.0
+    SMART_CENTER_MIN_STEP: float = 150.0
+    # 候选评分用到的周边搜索：类别 -> (关键词（空串为用户关键词）, 半径（米）, 条数)
+    CENTER_SEARCHES: Dict[str, Tuple[str, int, int]] = {
+        "poi": ("", 1500, 10),
+        "subway": ("地铁站", 1000, 5),
+        "bus": ("公交站", 500, 5),
     }
+    # 区域取数：按类别取一次数，各候选在本地计数（见 app.amap.area_sample）
+    SMART_CENTER_AREA_FETCH: bool = True
+    SMART_CENTER_AREA_MAX_POIS: int = 50
+    # 公平性：distance / travel_time / transit，出行时间见 app.amap.travel_time
+    CENTER_FAIRNESS: str = "distance"
+    TRAVEL_TIME_MODE: str = "driving"
+    TRAVEL_TIME_CALL_BUDGET: int = 8
+
+    # 三人及以上时的中心点算法（app.amap.center）：median / minimax / midpoint
+    CENTER_OBJECTIVE: str = "midpoint"
+    # 多中心模式（cluster_count >= 2，见 app.amap.clustering）：分组数上限与每组推荐的场所数
+    CLUSTER_MAX: int = 10
+    CLUSTER_PLACES: int = 3
+
+    # 分页获取候选场所：候选上限、预取页数，高分候选够数即停止翻页
+    POI_CANDIDATE_BUDGET: int = 75
+    POI_PAGE_CONCURRENCY: int = 2
+    HIGH_QUALITY_SCORE: float = 60.0
+    HIGH_QUALITY_TARGET: int = 12
+    # 场所距离分：distance（到中心点的直线距离）/ transit（离线线网的乘地铁耗时）
+    PLACE_DISTANCE_MODE: str = "distance"
 
     PLACE_TYPE_CONFIG: Dict[str, Dict[str, str]] = {
         "咖啡馆": {
@@ -404,28 +428,17 @@ class CafeRecommender(BaseTool):
                     return name
         return locations[0].get("city", "未知城市") if locations else "未知城市"
 
-    def _format_schema_payload(self, place: Dict, city_name: str) -> Dict:
+    def _format_schema_payload(self, place: Place, city_name: str) -> Dict:
         """构建LocalBusiness schema所需数据."""
-        lng = lat = None
-        location_str = place.get("location", "")
-        if location_str and "," in location_str:
-            lng_str, lat_str = location_str.split(",", 1)
-            try:
-                lng = float(lng_str)
-                lat = float(lat_str)
-            except ValueError:
-                lng = lat = None
-
-        biz_ext = place.get("biz_ext", {}) or {}
         return {
-            "name": place.get("name", ""),
-            "address": place.get("address", ""),
+            "name": place.name,
+            "address": place.address,
             "city": city_name,
-            "lat": lat,
-            "lng": lng,
-            "rating": biz_ext.get("rating", 4.5),
-            "review_count": biz_ext.get("review_count", 100),
-            "price_range": biz_ext.get("cost", "¥¥"),
+            "lat": place.lat,
+            "lng": place.lng,
+            "rating": place.rating_text or 4.5,
+            "review_count": place.review_count or 100,
+            "price_range": place.cost or "¥¥",
         }
 
     async def execute(
@@ -439,6 +452,39 @@ class CafeRecommender(BaseTool):
         max_distance: int = 100000,  # 最大距离筛选(米)
         price_range: str = "",  # 价格区间筛选
         pre_resolved_coords: List[dict] = None,  # 预解析坐标（来自前端 Autocomplete）
+        center_objective: str = "",  # 中心点算法，空则使用 CENTER_OBJECTIVE
+        cluster_count: int = 0,  # 多中心模式的分组数，0/1 为单中心
+    ) -> ToolResult:
+        with track_upstream_calls() as upstream_calls:
+            result = await self._execute(
+                locations,
+                keywords=keywords,
+                place_type=place_type,
+                user_requirements=user_requirements,
+                theme=theme,
+                min_rating=min_rating,
+                max_distance=max_distance,
+                price_range=price_range,
+                pre_resolved_coords=pre_resolved_coords,
+                center_objective=center_objective,
+                cluster_count=cluster_count,
+            )
+        logger.info(f"本次推荐高德调用 {sum(upstream_calls.values())} 次: {upstream_calls}")
+        return result
+
+    async def _execute(
+        self,
+        locations: List[str],
+        keywords: str = "咖啡馆",
+        place_type: str = "",
+        user_requirements: str = "",
+        theme: str = "",  # 添加主题参数
+        min_rating: float = 0.0,  # 最低评分筛选
+        max_distance: int = 100000,  # 最大距离筛选(米)
+        price_range: str = "",  # 价格区间筛选
+        pre_resolved_coords: List[dict] = None,  # 预解析坐标（来自前端 Autocomplete）
+        center_objective: str = "",  # 中心点算法，空则使用 CENTER_OBJECTIVE
+        cluster_count: int = 0,  # 多中心模式的分组数，0/1 为单中心
     ) -> ToolResult:
         # 尝试从多个来源获取API key
         if not self.api_key:
@@ -481,33 +527,22 @@ class CafeRecommender(BaseTool):
                         }
                     })
             else:
-                # 原有的 geocoding 逻辑
-                # 并行地理编码 - 大幅提升性能
-                async def geocode_with_delay(location: str, index: int):
-                    """带轻微延迟的地理编码，避免API限流"""
-                    if index > 0:
-                        await asyncio.sleep(0.05 * index)  # 50ms递增延迟，比原来的500ms快10倍
-                    return await self._geocode(location)
+                # 近期解析失败过的地址直接返回同样的错误，不再访问高德
+                negative = get_geocode_negative_cache()
+                for location in locations:
+                    if negative.get(normalize_address(location)):
+                        negative.note_request_short_circuited()
+                        logger.info(f"地址近期解析失败，直接返回错误: {location}")
+                        return self._geocode_failure_result(location)
 
-                # 使用 asyncio.gather 并行执行所有地理编码请求
-                geocode_tasks = [geocode_with_delay(loc, i) for i, loc in enumerate(locations)]
-                geocode_raw_results = await asyncio.gather(*geocode_tasks, return_exceptions=True)
+                # 原有的 geocoding 逻辑
+                # 批量地理编码：未缓存的地址每 10 个合并为一次请求，未命中的再逐个解析
+                geocode_raw_results = await self._geocode_many(locations)
 
                 # 处理结果并检查错误
                 for i, (location, result) in enumerate(zip(locations, geocode_raw_results)):
-                    if isinstance(result, Exception):
-                        logger.error(f"地理编码异常: {location} - {result}")
-                        result = None
-
                     if not result:
-                        # 检查是否为大学简称但地理编码失败
-                        enhanced_address = self._enhance_address(location)
-                        if enhanced_address != location:
-                            return ToolResult(output=f"无法找到地点: {location}\n\n识别为大学简称\n您输入的 '{location}' 可能是大学简称，但未能成功解析。\n\n建议尝试：\n完整名称：'{enhanced_address}'\n添加城市：'北京 {location}'、'上海 {location}'\n具体地址：'北京市海淀区{enhanced_address}'\n校区信息：如 '{location}本部'、'{location}新校区'")
-                        else:
-                            # 提供更详细的地址输入指导
-                            suggestions = self._get_address_suggestions(location)
-                            return ToolResult(output=f"无法找到地点: {location}\n\n地址解析失败\n系统无法识别您输入的地址，请检查以下几点：\n\n具体建议：\n{suggestions}\n\n标准地址格式示例：\n完整地址：'北京市海淀区中关村大街27号'\n知名地标：'北京大学'、'天安门广场'、'上海外滩'\n商圈区域：'三里屯'、'王府井'、'南京路步行街'\n交通枢纽：'北京南站'、'上海虹桥机场'\n\n常见错误避免：\n避免过于简短：'大学' -> '北京大学'\n避免拼写错误：'北大' -> '北京大学'\n避免模糊描述：'那个商场' -> '王府井百货大楼'\n\n如果仍有问题：\n检查网络连接是否正常\n尝试使用地址的官方全称\n确认地点确实存在且对外开放")
+                        return self._geocode_failure_result(location)
 
                     geocode_results.append({
                         "original_location": location,
@@ -560,13 +595,24 @@ class CafeRecommender(BaseTool):
                 error_msg += "• **注意**：完整地址（包含'市'、'区'、'县'）不会被拆分，如'北京市海淀区'\n"
                 return ToolResult(output=error_msg)
 
-            center_point = self._calculate_center_point(coordinates)
+            if cluster_count and cluster_count > 1:
+                if len(coordinates) > cluster_count:
+                    return await self._execute_clusters(
+                        location_info, coordinates, cluster_count, keywords, place_type,
+                        user_requirements, theme, min_rating, max_distance, center_objective
+                    )
+                logger.info(f"参与者 {len(coordinates)} 人不多于分组数 {cluster_count}，使用单中心")
+
+            center_point = self._calculate_center_point(coordinates, center_objective)
             
             # 处理多个关键词的搜索
             keywords_list = [kw.strip() for kw in keywords.split() if kw.strip()]
             primary_keyword = keywords_list[0] if keywords_list else "咖啡馆"
             
             searched_places = []
+            center_location = f"{center_point[0]},{center_point[1]}"
+            # 主搜索边翻页边筛选评分（见 _collect_scored_places）；fetched_count 为高德返回的原始数量
+            fetched_count = 0
             
             # 如果有多个关键词，使用并发搜索提高性能
             if len(keywords_list) > 1:
@@ -575,21 +621,23 @@ class CafeRecommender(BaseTool):
                 # 创建并发搜索任务
                 async def search_keyword(keyword):
                     logger.info(f"开始搜索场景: '{keyword}'")
-                    places = await self._search_pois(
-                        f"{center_point[0]},{center_point[1]}",
+                    # 为每个场所添加来源标记
+                    places, fetched = await self._collect_scored_places(
+                        center_location,
                         keyword,
-                        radius=5000,
-                        types=""
+                        center_point,
+                        user_requirements,
+                        keywords,
+                        min_rating=min_rating,
+                        max_distance=max_distance,
+                        source_keyword=keyword,
+                        participant_coords=coordinates
                     )
-                    if places:
-                        # 为每个场所添加来源标记
-                        for place in places:
-                            place['_source_keyword'] = keyword
-                        logger.info(f"'{keyword}' 找到 {len(places)} 个结果")
-                        return places
+                    if fetched:
+                        logger.info(f"'{keyword}' 找到 {fetched} 个结果，筛选后 {len(places)} 个")
                     else:
                         logger.info(f"'{keyword}' 未找到结果")
-                        return []
+                    return places, fetched
                 
                 # 并发执行所有搜索
                 tasks = [search_keyword(keyword) for keyword in keywords_list]
@@ -600,17 +648,16 @@ class CafeRecommender(BaseTool):
                 for i, result in enumerate(results):
                     if isinstance(result, Exception):
                         logger.error(f"搜索 '{keywords_list[i]}' 时出错: {result}")
-                    elif result:
-                        all_places.extend(result)
+                    else:
+                        all_places.extend(result[0])
+                        fetched_count += result[1]
                 
                 # 去重（基于场所名称和坐标位置，更宽松的去重策略）
                 seen = set()
                 unique_places = []
                 for place in all_places:
                     # 使用名称和坐标进行去重，而不是地址（地址可能格式不同）
-                    location = place.get('location', '')
-                    name = place.get('name', '')
-                    identifier = f"{name}_{location}"
+                    identifier = f"{place.name}_{place.location}"
                     
                     if identifier not in seen:
                         seen.add(identifier)
@@ -619,19 +666,29 @@ class CafeRecommender(BaseTool):
                 searched_places = unique_places
                 logger.info(f"多场景搜索完成，去重后共 {len(searched_places)} 个结果")
             else:
-                # 单个关键词的传统搜索
-                searched_places = await self._search_pois(
-                    f"{center_point[0]},{center_point[1]}",
-                    keywords, 
-                    radius=5000,
-                    types=place_type 
+                # 单个关键词搜索
+                searched_places, fetched_count = await self._collect_scored_places(
+                    center_location,
+                    keywords,
+                    center_point,
+                    user_requirements,
+                    keywords,
+                    types=place_type,
+                    min_rating=min_rating,
+                    max_distance=max_distance,
+                    participant_coords=coordinates
                 )
 
             # Fallback机制：确保始终有推荐结果
             fallback_used = False
             fallback_keyword = None
+            # 主搜索筛选后仍有场所时直接使用；无结果或结果都被筛掉时走以下 Fallback 搜索，
+            # 其返回的是未评分的原始结果，最后统一走 _rank_places
+            candidates_scored = bool(searched_places)
 
-            if not searched_places:
+            if not candidates_scored:
+                if fetched_count:
+                    logger.info(f"'{keywords}' 的 {fetched_count} 个结果均未通过筛选条件")
                 logger.info(f"使用 keywords '{keywords}' 和 types '{place_type}' 未找到结果，尝试仅使用 keywords 进行搜索。")
                 searched_places = await self._search_pois(
                     f"{center_point[0]},{center_point[1]}",
@@ -641,7 +698,7 @@ class CafeRecommender(BaseTool):
                 )
 
             # 如果仍无结果，启用 Fallback 搜索
-            if not searched_places:
+            if not searched_places and not candidates_scored:
                 logger.info(f"'{keywords}' 无结果，启用 Fallback 搜索机制")
                 fallback_categories = ["餐厅", "咖啡馆", "商场", "美食"]
 
@@ -660,7 +717,7 @@ class CafeRecommender(BaseTool):
                             break
 
             # 如果 Fallback 也失败，扩大搜索半径到不限制（API最大50km）
-            if not searched_places:
+            if not searched_places and not candidates_scored:
                 logger.info("Fallback 类别无结果，尝试不限距离搜索")
                 searched_places = await self._search_pois(
                     f"{center_point[0]},{center_point[1]}",
@@ -674,17 +731,23 @@ class CafeRecommender(BaseTool):
                     logger.info(f"扩大范围搜索成功：找到 {len(searched_places)} 个结果")
 
             # 如果所有尝试都失败，返回错误（极端情况）
-            if not searched_places:
+            if not searched_places and not candidates_scored:
                 center_lng, center_lat = center_point
                 error_msg = f"在该区域未能找到任何推荐场所。\n\n"
                 error_msg += f"搜索中心点：({center_lng:.4f}, {center_lat:.4f})\n"
                 error_msg += "该区域可能较为偏远，建议选择更靠近市中心的地点。"
                 return ToolResult(output=error_msg)
 
-            recommended_places = self._rank_places(
-                searched_places, center_point, user_requirements, keywords,
-                min_rating=min_rating, max_distance=max_distance, price_range=price_range
-            )
+            if candidates_scored:
+                recommended_places = self._finalize_ranking(searched_places)
+            else:
+                recommended_places = self._rank_places(
+                    searched_places, center_point, user_requirements, keywords,
+                    min_rating=min_rating, max_distance=max_distance, price_range=price_range,
+                    participant_coords=coordinates
+                )
+                if not recommended_places:
+                    logger.warning("筛选后无符合条件的场所")
 
             html_path = await self._generate_html_page(
                 location_info,
@@ -706,6 +769,80 @@ class CafeRecommender(BaseTool):
             logger.exception(f"场所推荐过程中发生错误: {str(e)}") 
             return ToolResult(output=f"推荐失败: {str(e)}")
 
+    async def _execute_clusters(
+        self,
+        location_info: List[Dict],
+        coordinates: List[Tuple[float, float]],
+        cluster_count: int,
+        keywords: str,
+        place_type: str,
+        user_requirements: str,
+        theme: str,
+        min_rating: float,
+        max_distance: int,
+        center_objective: str,
+    ) -> ToolResult:
+        """多中心模式：参与者分成 cluster_count 组，各组中心 × 各关键词的场所搜索全部并发发出，
+        所有候选一起排序后按组各取 CLUSTER_PLACES 个"""
+        clusters = cluster_participants(
+            coordinates, min(cluster_count, self.CLUSTER_MAX), center_objective or self.CENTER_OBJECTIVE
+        )
+        logger.info(
+            f"多中心模式: {len(coordinates)} 人分为 {len(clusters)} 组，"
+            f"各组人数 {[len(cluster.members) for cluster in clusters]}，"
+            f"最远成员距离 {max(cluster.max_distance for cluster in clusters):.0f}m"
+        )
+        keywords_list = [kw.strip() for kw in keywords.split() if kw.strip()] or [keywords]
+        multi_keyword = len(keywords_list) > 1
+
+        async def search(index: int, cluster: Cluster, keyword: str) -> List[Place]:
+            center = cluster.center
+            places, _ = await self._collect_scored_places(
+                f"{center[0]},{center[1]}",
+                keyword,
+                center,
+                user_requirements,
+                keywords,
+                types="" if multi_keyword else place_type,
+                min_rating=min_rating,
+                max_distance=max_distance,
+                source_keyword=keyword if multi_keyword else "",
+                participant_coords=[coordinates[i] for i in cluster.members]
+            )
+            for place in places:
+                place.cluster = index
+            return places
+
+        jobs = [(index, cluster, keyword) for index, cluster in enumerate(clusters) for keyword in keywords_list]
+        results = await asyncio.gather(*(search(*job) for job in jobs), return_exceptions=True)
+
+        # 同一场所出现在多个组的结果中时，归入离其会面中心最近的组
+        unique: Dict[str, Place] = {}
+        for (index, _, keyword), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                logger.error(f"第{index + 1}组搜索 '{keyword}' 时出错: {result}")
+                continue
+            for place in result:
+                kept = unique.get(place.key)
+                if kept is None or (
+                    place.distance is not None and kept.distance is not None and place.distance < kept.distance
+                ):
+                    unique[place.key] = place
+
+        groups = self._finalize_cluster_ranking(list(unique.values()), len(clusters))
+        recommended_places = [place for group in groups for place in group]
+        overall_center = self._calculate_center_point([cluster.center for cluster in clusters], center_objective)
+        html_path = await self._generate_html_page(
+            location_info,
+            recommended_places,
+            overall_center,
+            user_requirements,
+            keywords,
+            theme,
+            clusters=clusters
+        )
+        return ToolResult(output=self._format_cluster_result_text(location_info, clusters, groups, html_path, keywords))
+
     def _enhance_address(self, address: str) -> str:
         """对输入地址做轻量增强，减少歧义。
 
@@ -716,22 +853,7 @@ class CafeRecommender(BaseTool):
             return address
 
         normalized = address.strip()
-
-        alias_to_fullname: Dict[str, str] = {
-            # 常见高校简称
-            "北大": "北京市海淀区北京大学",
-            "清华": "北京市海淀区清华大学",
-            "人大": "北京市海淀区中国人民大学",
-            "北师大": "北京市海淀区北京师范大学",
-            "复旦": "上海市杨浦区复旦大学",
-            "上交": "上海市闵行区上海交通大学",
-            "浙大": "浙江省杭州市浙江大学",
-            "中大": "广东省广州市中山大学",
-            "华工": "广东省广州市华南理工大学",
-            "华科": "湖北省武汉市华中科技大学",
-        }
-
-        mapped = alias_to_fullname.get(normalized)
+        mapped = ALIAS_TO_FULLNAME.get(normalized)
         if mapped:
             logger.info(f"地址别名映射: '{normalized}' -> '{mapped}'")
             return mapped
@@ -740,19 +862,12 @@ class CafeRecommender(BaseTool):
 
     def _extract_city_hint(self, locations: List[str]) -> str:
         """从输入地点中抽取城市提示（用于 citylimit）。"""
-        city_keywords = [
-            "北京", "上海", "广州", "深圳", "杭州", "南京", "武汉", "成都", "西安", "天津",
-            "重庆", "苏州", "长沙", "郑州", "济南", "青岛", "大连", "厦门", "福州", "昆明",
-        ]
-
         votes: Dict[str, int] = {}
         for loc in locations:
             if not loc:
                 continue
-            full_loc = self._enhance_address(loc)
-            for city in city_keywords:
-                if city in loc or city in full_loc:
-                    votes[city] = votes.get(city, 0) + 1
+            for city in cities_in(loc):
+                votes[city] = votes.get(city, 0) + 1
 
         if not votes:
             return ""
@@ -767,7 +882,6 @@ class CafeRecommender(BaseTool):
         if not keyword:
             return None
 
-        url = "https://restapi.amap.com/v3/place/text"
         params: Dict[str, Any] = {
             "key": self.api_key,
             "keywords": keyword,
@@ -779,11 +893,7 @@ class CafeRecommender(BaseTool):
             params["citylimit"] = "true"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status != 200:
-                        return None
-                    data = await response.json()
+            data = await get_amap_client().get_json("place_text", params)
 
             if data.get("info") == "CUQPS_HAS_EXCEEDED_THE_LIMIT":
                 return None
@@ -832,26 +942,11 @@ class CafeRecommender(BaseTool):
         suggestions = []
         
         # 检查是否包含常见的模糊词汇
-        vague_terms = {
-            "大学": "**请输入完整大学名称**，如 '北京大学'、'清华大学'、'复旦大学'",
-            "学校": "**请输入具体学校全名**，如 '北京市第一中学'、'上海交通大学附属中学'",
-            "医院": "**请输入完整医院名称**，如 '北京协和医院'、'上海华山医院'",
-            "商场": "**请输入具体商场名称**，如 '王府井百货大楼'、'上海环球港'",
-            "火车站": "**请输入完整站名**，如 '北京站'、'上海虹桥站'、'广州南站'",
-            "机场": "**请输入完整机场名称**，如 '北京首都国际机场'、'上海浦东国际机场'",
-            "公园": "**请输入具体公园名称**，如 '颐和园'、'中山公园'、'西湖公园'",
-            "广场": "**请输入具体广场名称**，如 '天安门广场'、'人民广场'",
-            "地铁站": "**请输入完整地铁站名**，如 '中关村地铁站'、'人民广场地铁站'",
-            "购物中心": "**请输入具体购物中心名称**，如 '北京apm'、'上海iapm'"
-        }
-        
-        for term, suggestion in vague_terms.items():
-            if term in address:
-                suggestions.append(f"• {suggestion}")
+        for term in vague_terms_in(address):
+            suggestions.append(f"• {VAGUE_TERM_SUGGESTIONS[term]}")
         
         # 检查是否只是城市名
-        major_cities = ["北京", "上海", "广州", "深圳", "杭州", "南京", "武汉", "成都", "西安", "天津"]
-        if address in major_cities:
+        if address in MAJOR_CITIES:
             suggestions.append(f"• **城市名过于宽泛**，请添加具体区域，如 '{address}市海淀区中关村'")
             suggestions.append(f"• **或使用知名地标**，如 '{address}大学'、'{address}火车站'、'{address}机场'")
             suggestions.append(f"• **推荐格式**：'{address}市 + 区县 + 街道/地标'，如 '{address}市朝阳区三里屯'")
@@ -889,9 +984,34 @@ class CafeRecommender(BaseTool):
         
         return "\n".join(suggestions)
 
+    def _geocode_failure_result(self, location: str) -> ToolResult:
+        """地址解析失败时返回给用户的提示"""
+        if get_circuit_breaker("geocode").is_open:
+            return ToolResult(output=f"无法解析地点: {location}\n\n地图服务暂时不可用\n高德地图接口响应异常，请稍后再试。")
+        if get_geocode_negative_cache().peek(normalize_address(location)) == QUOTA:
+            return ToolResult(output=f"无法解析地点: {location}\n\n地图服务繁忙\n高德地图接口调用额度暂时用尽，请稍后再试。")
+
+        # 检查是否为大学简称但地理编码失败
+        enhanced_address = self._enhance_address(location)
+        if enhanced_address != location:
+            return ToolResult(output=f"无法找到地点: {location}\n\n识别为大学简称\n您输入的 '{location}' 可能是大学简称，但未能成功解析。\n\n建议尝试：\n完整名称：'{enhanced_address}'\n添加城市：'北京 {location}'、'上海 {location}'\n具体地址：'北京市海淀区{enhanced_address}'\n校区信息：如 '{location}本部'、'{location}新校区'")
+
+        # 提供更详细的地址输入指导
+        suggestions = self._get_address_suggestions(location)
+        return ToolResult(output=f"无法找到地点: {location}\n\n地址解析失败\n系统无法识别您输入的地址，请检查以下几点：\n\n具体建议：\n{suggestions}\n\n标准地址格式示例：\n完整地址：'北京市海淀区中关村大街27号'\n知名地标：'北京大学'、'天安门广场'、'上海外滩'\n商圈区域：'三里屯'、'王府井'、'南京路步行街'\n交通枢纽：'北京南站'、'上海虹桥机场'\n\n常见错误避免：\n避免过于简短：'大学' -> '北京大学'\n避免拼写错误：'北大' -> '北京大学'\n避免模糊描述：'那个商场' -> '王府井百货大楼'\n\n如果仍有问题：\n检查网络连接是否正常\n尝试使用地址的官方全称\n确认地点确实存在且对外开放")
+
     async def _geocode(self, address: str) -> Optional[Dict[str, Any]]:
-        if address in self.geocode_cache:
-            return self.geocode_cache[address]
+        # 离线地名表（常用地点与简称）无需访问网络
+        known = get_gazetteer().lookup(address)
+        if known is not None:
+            return known
+
+        cache_key = normalize_address(address)
+        cached = get_cache("geocode").get(cache_key)
+        if cached is not None:
+            return cached
+        if get_geocode_negative_cache().get(cache_key):
+            return None
 
         # 确保API密钥已设置
         if not self.api_key:
@@ -901,71 +1021,232 @@ class CafeRecommender(BaseTool):
                 logger.error("高德地图API密钥未配置")
                 return None
 
+        # 相同地址的并发请求合并为一次上游调用
+        result = await get_flight_group("geocode").do(
+            cache_key, lambda: self._load_geocode(cache_key, address)
+        )
+        if result:
+            get_cache("geocode").set(cache_key, result)
+        return result
+
+    async def _load_geocode(self, cache_key: str, address: str) -> Optional[Dict[str, Any]]:
+        """内存缓存未命中时：先查持久化缓存，再访问高德并回写"""
+        store = get_geocode_store()
+        result = await store.get(cache_key)
+        if result is not None:
+            return result
+        result = await self._fetch_geocode(address)
+        if result:
+            await store.put(cache_key, result)
+        return result
+
+    async def _fetch_geocode(self, address: str) -> Optional[Dict[str, Any]]:
+        """访问高德解析地址：POI 文本检索优先，失败时回退到 Geocode"""
         # 先尝试 POI 文本检索，降低同名跨城误解析
         poi_city_hint = ""
         poi_result = await self._geocode_via_poi(address, city_hint=poi_city_hint)
         if poi_result and poi_result.get("location"):
-            if len(self.geocode_cache) >= self.GEOCODE_CACHE_MAX:
-                oldest_key = next(iter(self.geocode_cache))
-                del self.geocode_cache[oldest_key]
-            self.geocode_cache[address] = poi_result
             return poi_result
 
         # POI 不可用时回退到 Geocode
         enhanced_address = self._enhance_address(address)
 
-        url = "https://restapi.amap.com/v3/geocode/geo"
         params = {"key": self.api_key, "address": enhanced_address, "output": "json"}
+        failures = get_geocode_negative_cache()
+        cache_key = normalize_address(address)
 
-        # 重试机制，最多重试3次（优化延迟以提升性能）
+        # 重试机制，最多重试3次；节奏由令牌桶调度器与熔断器控制，重试前不固定等待
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                # 首次请求无延迟，重试时添加较短延迟
-                if attempt > 0:
-                    await asyncio.sleep(0.2 * attempt)  # 200ms递增延迟（优化：原为1s）
-
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, params=params) as response:
-                        if response.status != 200:
-                            logger.error(
-                                f"高德地图API地理编码请求失败: {response.status}, 地址: {address}, 尝试: {attempt + 1}"
-                            )
-                            if attempt == max_retries - 1:
-                                return None
-                            continue
-
-                        data = await response.json()
-
-                        # 检查API限制错误
-                        if data.get("info") == "CUQPS_HAS_EXCEEDED_THE_LIMIT":
-                            logger.warning(f"API并发限制超出，地址: {address}, 尝试: {attempt + 1}, 等待后重试")
-                            if attempt == max_retries - 1:
-                                logger.error(f"地理编码失败: API并发限制超出，地址: {address}")
-                                return None
-                            await asyncio.sleep(0.5 * (attempt + 1))  # 500ms延迟（优化：原为2s）
-                            continue
-
-                        if data["status"] != "1" or not data["geocodes"]:
-                            logger.error(f"地理编码失败: {data.get('info', '未知错误')}, 地址: {address}")
-                            return None
-
-                        result = data["geocodes"][0]
-                        # 缓存大小限制：超限时删除最旧的条目
-                        if len(self.geocode_cache) >= self.GEOCODE_CACHE_MAX:
-                            oldest_key = next(iter(self.geocode_cache))
-                            del self.geocode_cache[oldest_key]
-                        self.geocode_cache[address] = result
-                        return result
+                try:
+                    data = await get_amap_client().get_json("geocode", params)
+                except AMapCircuitOpenError:
+                    # 端点熔断中，重试只会继续失败
+                    logger.warning(f"地理编码熔断中，跳过: {address}")
+                    return None
+                except AMapError as e:
+                    if e.status is None:
+                        raise
+                    logger.error(
+                        f"高德地图API地理编码请求失败: {e.status}, 地址: {address}, 尝试: {attempt + 1}"
+                    )
+                    if attempt == max_retries - 1:
+                        return None
+                    continue
+
+                # 检查API限制错误（调度器已清空令牌桶，重试会自动排队等待）
+                if data.get("info") == "CUQPS_HAS_EXCEEDED_THE_LIMIT":
+                    logger.warning(f"API并发限制超出，地址: {address}, 尝试: {attempt + 1}, 排队重试")
+                    if attempt == max_retries - 1:
+                        logger.error(f"地理编码失败: API并发限制超出，地址: {address}")
+                        failures.record(cache_key, QUOTA)
+                        return None
+                    continue
+
+                if data["status"] != "1" or not data["geocodes"]:
+                    logger.error(f"地理编码失败: {data.get('info', '未知错误')}, 地址: {address}")
+                    # 只缓存确定性的失败，网络/HTTP 异常下次仍会重试
+                    if is_quota_error(data.get("info")):
+                        failures.record(cache_key, QUOTA)
+                    elif data["status"] == "1":
+                        failures.record(cache_key, NOT_FOUND)
+                    return None
+
+                return data["geocodes"][0]
 
             except Exception as e:
                 logger.error(f"地理编码请求异常: {str(e)}, 地址: {address}, 尝试: {attempt + 1}")
                 if attempt == max_retries - 1:
                     return None
-                await asyncio.sleep(0.2 * (attempt + 1))  # 200ms递增延迟（优化：原为1s）
 
         return None
 
+    async def _geocode_many(self, addresses: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """批量解析地址，结果与输入一一对应
+
+        离线地名表或缓存（内存/持久化）命中的地址直接返回；能从输入推断出城市（`_extract_city_hint`）
+        时，其余地址按 GEOCODE_BATCH_SIZE 个一组带城市参数走高德批量地理编码，批量未命中、未解析到
+        精确级别（PRECISE_GEOCODE_LEVELS）或不在该城市的地址再逐个走 POI 优先的 `_geocode`。
+        推断不出城市时不走批量（不带城市的地理编码容易把同名地点解析到其他城市），全部逐个解析。
+        """
+        keys = [normalize_address(address) for address in addresses]
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        pending: Dict[str, str] = {}
+        geocode_cache = get_cache("geocode")
+        gazetteer = get_gazetteer()
+        for key, address in zip(keys, addresses):
+            if key in results or key in pending:
+                continue
+            known = gazetteer.lookup(address)
+            if known is not None:
+                results[key] = known
+                continue
+            cached = geocode_cache.get(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending[key] = address
+
+        if pending and not self.api_key:
+            if hasattr(config, "amap") and config.amap and hasattr(config.amap, "api_key"):
+                self.api_key = config.amap.api_key
+            else:
+                logger.error("高德地图API密钥未配置")
+                return [results.get(key) for key in keys]
+
+        negative = get_geocode_negative_cache()
+        for key in list(pending):
+            if negative.get(key):
+                results[key] = None
+                del pending[key]
+
+        store = get_geocode_store()
+        for key in list(pending):
+            stored = await store.get(key)
+            if stored is not None:
+                results[key] = stored
+                geocode_cache.set(key, stored)
+                del pending[key]
+
+        # 地址中写明了其他城市的，不放进带城市参数的批量请求
+        city_hint = self._extract_city_hint(list(pending.values())) if pending else ""
+        items = [
+            (key, address) for key, address in pending.items()
+            if city_hint and all(city == city_hint for city in cities_in(address))
+        ]
+        batches = [
+            items[i:i + self.GEOCODE_BATCH_SIZE]
+            for i in range(0, len(items), self.GEOCODE_BATCH_SIZE)
+        ]
+        batch_results = await asyncio.gather(
+            *(self._fetch_geocode_batch([address for _, address in batch], city_hint) for batch in batches),
+            return_exceptions=True,
+        )
+        for batch, fetched in zip(batches, batch_results):
+            if isinstance(fetched, Exception):
+                logger.error(f"批量地理编码异常: {fetched}")
+                continue
+            for (key, _), result in zip(batch, fetched):
+                if result:
+                    results[key] = result
+                    geocode_cache.set(key, result)
+                    await store.put(key, result)
+
+        # 批量未命中的地址逐个走 POI 优先的完整解析
+        misses = [(key, address) for key, address in pending.items() if key not in results]
+        if misses:
+            fallback_results = await asyncio.gather(
+                *(self._geocode(address) for _, address in misses), return_exceptions=True
+            )
+            for (key, address), result in zip(misses, fallback_results):
+                if isinstance(result, Exception):
+                    logger.error(f"地理编码异常: {address} - {result}")
+                    result = None
+                results[key] = result
+
+        return [results.get(key) for key in keys]
+
+    async def _fetch_geocode_batch(self, addresses: List[str], city: str) -> List[Optional[Dict[str, Any]]]:
+        """一次高德批量地理编码请求（最多 10 个地址，限定城市），未命中、未解析到精确级别
+        或不在该城市的位置为 None"""
+        misses: List[Optional[Dict[str, Any]]] = [None] * len(addresses)
+        # "|" 是批量请求的分隔符，地址内出现时替换为空格
+        params = {
+            "key": self.api_key,
+            "address": "|".join(self._enhance_address(address).replace("|", " ") for address in addresses),
+            "city": city,
+            "batch": "true",
+            "output": "json",
+        }
+
+        # 与逐个解析相同：节奏由令牌桶调度器与熔断器控制，重试前不固定等待
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                data = await get_amap_client().get_json("geocode", params)
+            except AMapCircuitOpenError:
+                logger.warning(f"地理编码熔断中，跳过批量请求, 地址数: {len(addresses)}")
+                return misses
+            except AMapError as e:
+                logger.error(f"批量地理编码请求失败: {e}, 地址数: {len(addresses)}, 尝试: {attempt + 1}")
+                if attempt == max_retries - 1:
+                    return misses
+                continue
+
+            if data.get("info") == "CUQPS_HAS_EXCEEDED_THE_LIMIT":
+                logger.warning(f"API并发限制超出，批量地理编码排队重试, 尝试: {attempt + 1}")
+                if attempt == max_retries - 1:
+                    self._record_quota_failures(addresses)
+                continue
+            if data.get("status") != "1":
+                logger.error(f"批量地理编码失败: {data.get('info', '未知错误')}")
+                if is_quota_error(data.get("info")):
+                    # 额度用尽时逐个回退也会失败，记入失败缓存让回退直接跳过
+                    self._record_quota_failures(addresses)
+                return misses
+
+            geocodes = data.get("geocodes") or []
+            if len(geocodes) != len(addresses):
+                logger.warning(f"批量地理编码结果数量不匹配: {len(geocodes)}/{len(addresses)}")
+                return misses
+            return [
+                geocode
+                if isinstance(geocode.get("location"), str)
+                and geocode["location"]
+                and geocode.get("level") in self.PRECISE_GEOCODE_LEVELS
+                and city in f"{geocode.get('province') or ''}{geocode.get('city') or ''}"
+                else None
+                for geocode in geocodes
+            ]
+
+        return misses
+
+    def _record_quota_failures(self, addresses: List[str]) -> None:
+        failures = get_geocode_negative_cache()
+        for address in addresses:
+            failures.record(normalize_address(address), QUOTA)
+
     async def _smart_city_inference(
         self,
         original_locations: List[str],
@@ -1021,7 +1302,7 @@ class CafeRecommender(BaseTool):
         # 当地点数量较少时，如果更像是跨城输入，直接跳过纠正。
         # 典型情况：两地相距很远（例如北京 + 广州），不应强行拉同城。
         if len(cities) <= 2:
-            if len(coords) == 2 and self._calculate_distance(coords[0], coords[1]) > 300000:
+            if len(coords) == 2 and haversine_m(*coords[0], *coords[1]) > 300000:
                 return geocode_results
 
         # 允许纠正的前提：城市提示（如果有）必须与主城市一致
@@ -1029,18 +1310,17 @@ class CafeRecommender(BaseTool):
             return geocode_results
 
         # 检测异常地点：距离其他地点过远（超过500公里）
-        updated_results = []
+        # 先找出所有需要重新解析的地点，再一次性批量解析
+        outliers = {}
+        pairwise = distance_matrix(coords, coords)
         for i, item in enumerate(geocode_results):
-            result = item["result"]
             location = item["original_location"]
             current_city = cities[i]
 
-            # 计算与其他地点的平均距离
+            # 计算与其他地点的平均距离（对角线为 0）
             if len(coords) > 1:
                 other_coords = [c for j, c in enumerate(coords) if j != i]
-                avg_distance = sum(
-                    self._calculate_distance(coords[i], c) for c in other_coords
-                ) / len(other_coords)
+                avg_distance = float(pairwise[i].sum()) / len(other_coords)
 
                 # 如果当前地点距离其他地点平均超过100公里，且城市不同，尝试重新解析
                 if avg_distance > 100000 and current_city != main_city:  # 100km = 100000m
@@ -1048,74 +1328,72 @@ class CafeRecommender(BaseTool):
                         f"检测到地点 '{location}' 被解析到远离其他地点的城市 "
                         f"({current_city})，尝试用 {main_city} 重新解析"
                     )
+                    outliers[i] = (other_coords, avg_distance)
 
-                    # 尝试用主流城市名作为前缀重新解析
-                    new_address = f"{main_city}{location}"
-                    new_result = await self._geocode(new_address)
-
-                    if new_result:
-                        new_lng, new_lat = new_result["location"].split(",")
-                        new_coord = (float(new_lng), float(new_lat))
-                        # 检查新结果是否更合理（距离其他地点更近）
-                        new_avg_distance = sum(
-                            self._calculate_distance(new_coord, c) for c in other_coords
-                        ) / len(other_coords)
-
-                        if new_avg_distance < avg_distance:
-                            logger.info(
-                                f"成功将 '{location}' 重新解析为 {new_result.get('formatted_address')}"
-                            )
-                            updated_results.append({
-                                "original_location": location,
-                                "result": new_result
-                            })
-                            continue
+        # 尝试用主流城市名作为前缀重新解析
+        outlier_indexes = list(outliers)
+        new_results = await self._geocode_many(
+            [f"{main_city}{geocode_results[i]['original_location']}" for i in outlier_indexes]
+        )
+        reresolved = dict(zip(outlier_indexes, new_results))
+
+        updated_results = []
+        for i, item in enumerate(geocode_results):
+            new_result = reresolved.get(i)
+            if new_result:
+                other_coords, avg_distance = outliers[i]
+                new_lng, new_lat = new_result["location"].split(",")
+                new_coord = (float(new_lng), float(new_lat))
+                # 检查新结果是否更合理（距离其他地点更近）
+                new_avg_distance = float(distances_from(new_coord, other_coords).mean())
+
+                if new_avg_distance < avg_distance:
+                    logger.info(
+                        f"成功将 '{item['original_location']}' 重新解析为 {new_result.get('formatted_address')}"
+                    )
+                    updated_results.append({
+                        "original_location": item["original_location"],
+                        "result": new_result
+                    })
+                    continue
 
             updated_results.append(item)
 
         return updated_results
 
-    def _calculate_center_point(self, coordinates: List[Tuple[float, float]]) -> Tuple[float, float]:
-        """计算多个坐标点的中心点（使用球面几何）"""
+    def _calculate_center_point(
+        self,
+        coordinates: List[Tuple[float, float]],
+        objective: str = "",
+    ) -> Tuple[float, float]:
+        """计算多个坐标点的中心点
+
+        objective 见 app.amap.center：midpoint（经纬度平均，默认）、median（几何中位数）、
+        minimax（最远者距离最小）。两人时均为球面中点。
+        """
         if not coordinates:
             raise ValueError("至少需要一个坐标来计算中心点。")
-
-        if len(coordinates) == 1:
-            return coordinates[0]
-
-        # 对于两个点，使用球面中点计算
-        if len(coordinates) == 2:
-            lat1, lng1 = math.radians(coordinates[0][1]), math.radians(coordinates[0][0])
-            lat2, lng2 = math.radians(coordinates[1][1]), math.radians(coordinates[1][0])
-
-            dLng = lng2 - lng1
-
-            Bx = math.cos(lat2) * math.cos(dLng)
-            By = math.cos(lat2) * math.sin(dLng)
-
-            lat3 = math.atan2(math.sin(lat1) + math.sin(lat2),
-                              math.sqrt((math.cos(lat1) + Bx) * (math.cos(lat1) + Bx) + By * By))
-            lng3 = lng1 + math.atan2(By, math.cos(lat1) + Bx)
-
-            return (math.degrees(lng3), math.degrees(lat3))
-
-        # 对于多个点，使用简单平均（可以进一步优化）
-        avg_lng = sum(lng for lng, _ in coordinates) / len(coordinates)
-        avg_lat = sum(lat for _, lat in coordinates) / len(coordinates)
-        return (avg_lng, avg_lat)
+        return compute_center(coordinates, objective or self.CENTER_OBJECTIVE)
 
     async def _calculate_smart_center(
         self,
         coordinates: List[Tuple[float, float]],
-        keywords: str = "咖啡馆"
+        keywords: str = "咖啡馆",
+        objective: str = "",
+        fairness_mode: str = "",
     ) -> Tuple[Tuple[float, float], Dict]:
         """智能中心点算法 - 考虑 POI 密度、交通便利性和公平性
 
         算法步骤：
-        1. 计算几何中心作为基准点
-        2. 在基准点周围生成候选点网格
-        3. 评估每个候选点：POI 密度 + 交通便利性 + 公平性
-        4. 返回最优中心点
+        1. 按 objective 计算几何中心作为基准点
+        2. 在基准点周围生成覆盖参与者范围的粗网格，并加入原来的 1.5km 固定网格
+        3. 评估每个候选点：POI 密度 + 交通便利性 + 公平性，先算本地的公平性，
+           总分上界不可能超过当前最优的候选不再发起搜索
+        4. 围绕得分最高的 SMART_CENTER_TOP_K 个点逐级加密网格（步长减半），
+           最多 SMART_CENTER_LEVELS 级
+        开启 SMART_CENTER_AREA_FETCH 时，密度与交通计数先用以几何中心为圆心的区域取数在本地计算；
+        fairness_mode（空则使用 CENTER_FAIRNESS）为 travel_time / transit 时公平性按出行时间计算
+        5. 返回最优中心点
 
         Returns:
             (最优中心点坐标, 评估详情)
@@ -1123,46 +1401,278 @@ class CafeRecommender(BaseTool):
         logger.info("使用智能中心点算法")
 
         # 1. 计算几何中心
-        geo_center = self._calculate_center_point(coordinates)
+        geo_center = self._calculate_center_point(coordinates, objective)
         logger.info(f"几何中心: {geo_center}")
-
-        # 2. 生成候选点网格（在几何中心周围 1.5km 范围内）
-        candidates = self._generate_candidate_points(geo_center, radius_km=1.5, grid_size=3)
-        candidates.insert(0, geo_center)  # 几何中心作为第一个候选
-
-        logger.info(f"生成了 {len(candidates)} 个候选中心点")
-
-        # 3. 评估每个候选点
-        best_candidate = geo_center
-        best_score = -1
-        evaluation_results = []
-
-        for candidate in candidates:
-            score, details = await self._evaluate_center_candidate(
-                candidate, coordinates, keywords
+        fairness_mode = fairness_mode or self.CENTER_FAIRNESS
+        if fairness_mode not in ("distance", "travel_time", "transit"):
+            raise ValueError(f"未知的公平性模式: {fairness_mode}，可选 distance, travel_time, transit")
+        if fairness_mode == "transit" and not len(get_transit_graph()):
+            logger.warning("离线轨道交通线网为空，transit 公平性改按直线距离计算")
+            fairness_mode = "distance"
+        travel_budget = CallBudget(self.TRAVEL_TIME_CALL_BUDGET) if fairness_mode == "travel_time" else None
+        travel_ratio: Optional[float] = None
+        travel_timed_out = False
+
+        # 全部候选按生成顺序编号，同分时编号小者优先
+        candidates: List[Tuple[float, float]] = []
+        fairness: List[Tuple[float, Dict]] = []
+        seen = set()
+        results: Dict[int, Dict[str, Any]] = {}
+        best = {"score": -1.0, "index": math.inf}
+        pruned = 0
+        budget_exhausted = False
+        started = time.monotonic()
+        deadline = started + self.SMART_CENTER_BUDGET
+        semaphore = asyncio.Semaphore(self.SMART_CENTER_CONCURRENCY)
+
+        def add_candidates(points: List[Tuple[float, float]]) -> List[int]:
+            """登记新候选（相邻网格加密时会生成重复点）"""
+            added = []
+            for point in points:
+                key = (round(point[0], 6), round(point[1], 6))
+                if key in seen:
+                    continue
+                seen.add(key)
+                candidates.append(point)
+                added.append(len(candidates) - 1)
+            return added
+
+        async def assess_fairness(indices: List[int]) -> None:
+            """计算一批新候选的公平性分；出行时间取不到或查询超时（最多占用剩余预算的
+            SMART_CENTER_PREP_SHARE）时退回直线距离，超时后的各级不再查询出行时间"""
+            nonlocal travel_ratio, travel_timed_out
+            points = [candidates[i] for i in indices]
+            if fairness_mode == "transit" and points:
+                batch = self._center_transit_fairness_batch(points, coordinates)
+                if batch is not None:
+                    fairness.extend(batch)
+                    return
+            if travel_budget is not None and points and not travel_timed_out:
+                timeout = max(0.0, deadline - time.monotonic()) * self.SMART_CENTER_PREP_SHARE
+                try:
+                    batch, travel_ratio = await asyncio.wait_for(
+                        self._center_travel_fairness_batch(points, coordinates, travel_budget, travel_ratio),
+                        timeout=timeout,
+                    )
+                except asyncio.TimeoutError:
+                    travel_timed_out = True
+                    logger.warning(f"出行时间查询超时（{timeout:.1f}s），公平性改按直线距离计算")
+                else:
+                    if batch is not None:
+                        fairness.extend(batch)
+                        return
+            fairness.extend(self._center_fairness_batch(points, coordinates))
+
+        def ahead_of_best(score: float, index: int) -> bool:
+            return score > best["score"] or (score == best["score"] and index < best["index"])
+
+        async def evaluate(index: int) -> None:
+            nonlocal pruned
+            async with semaphore:
+                # 总分上界 = 公平性 + CENTER_SEARCH_SCORE_MAX；取得并发名额时再判断，
+                # 此前完成的评估可能已抬高当前最优
+                if not ahead_of_best(fairness[index][0] + self.CENTER_SEARCH_SCORE_MAX, index):
+                    pruned += 1
+                    return
+                score, details = await self._evaluate_center_candidate(
+                    candidates[index], coordinates, keywords,
+                    fairness=fairness[index], known_counts=known_counts.get(index),
+                )
+            results[index] = {"point": candidates[index], "score": score, "details": details}
+            if ahead_of_best(score, index):
+                best.update(score=score, index=index)
+
+        async def evaluate_level(indices: List[int]) -> None:
+            """并发评估一级候选：同时最多 SMART_CENTER_CONCURRENCY 个（高德 QPS 仍由限流调度器
+            控制），按上界从高到低发起以便尽早剪枝；总耗时超出 SMART_CENTER_BUDGET 时取消未完成的评估"""
+            nonlocal budget_exhausted
+            order = sorted(indices, key=lambda index: -fairness[index][0])
+            tasks = [asyncio.create_task(evaluate(index)) for index in order]
+            if not tasks:
+                return
+            _, pending = await asyncio.wait(tasks, timeout=max(0.0, deadline - time.monotonic()))
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            budget_exhausted = budget_exhausted or bool(pending)
+
+        samples: Dict[str, AreaSample] = {}
+        known_counts: Dict[int, Dict[str, int]] = {}
+
+        def count_locally(indices: List[int]) -> None:
+            """用区域样本一次算出一批候选的各类计数，只保留与单独搜索等价的"""
+            if not samples or not indices:
+                return
+            points = [candidates[index] for index in indices]
+            for category, sample in samples.items():
+                _, radius, offset = self.CENTER_SEARCHES[category]
+                counts, exact = sample.counts(points, radius, offset)
+                for index, count, is_exact in zip(indices, counts, exact):
+                    if is_exact:
+                        known_counts.setdefault(index, {})[category] = int(count)
+
+        def top_k(indices: List[int]) -> List[int]:
+            scored = [index for index in indices if index in results]
+            scored.sort(key=lambda index: (-results[index]["score"], index))
+            return scored[:self.SMART_CENTER_TOP_K]
+
+        # 2. 粗网格：半径取参与者外包矩形的半边长，由近到远排列
+        radius_km = self._smart_center_radius(coordinates) / 1000
+        area_requests = 0
+        if self.SMART_CENTER_AREA_FETCH:
+            samples, area_requests = await self._fetch_center_samples(
+                geo_center, radius_km * 1000, keywords,
+                timeout=(deadline - time.monotonic()) * self.SMART_CENTER_PREP_SHARE,
             )
-            evaluation_results.append({
-                "point": candidate,
-                "score": score,
-                "details": details
-            })
-
-            if score > best_score:
-                best_score = score
-                best_candidate = candidate
-
-        # 排序结果
-        evaluation_results.sort(key=lambda x: x["score"], reverse=True)
-
-        logger.info(f"最优中心点: {best_candidate}, 评分: {best_score:.1f}")
+        step_km = radius_km / self.SMART_CENTER_GRID
+        if radius_km * 1000 <= self.SMART_CENTER_BASE_RADIUS:
+            # 粗网格落在固定网格内，从固定网格更细的步长开始加密
+            step_km = min(step_km, self.SMART_CENTER_BASE_RADIUS / 1000 / self.SMART_CENTER_BASE_GRID)
+        grid = self._generate_candidate_points(geo_center, radius_km=radius_km, grid_size=self.SMART_CENTER_GRID)
+        grid += self._generate_candidate_points(
+            geo_center, radius_km=self.SMART_CENTER_BASE_RADIUS / 1000, grid_size=self.SMART_CENTER_BASE_GRID
+        )
+        grid = [grid[i] for i in np.argsort(distances_from(geo_center, grid), kind="stable")]
+        level = add_candidates([geo_center] + grid)  # 几何中心作为第一个候选
+        await assess_fairness(level)
+        logger.info(f"粗网格: 半径 {radius_km:.2f}km，{len(level)} 个候选")
+        count_locally(level)
+        await evaluate_level(level)
+
+        # 3. 逐级加密：在当前最优的几个点周围以减半的步长各生成 3x3 网格，步长过小时停止
+        parents = top_k(level)
+        levels = 0
+        while levels < self.SMART_CENTER_LEVELS and parents and not budget_exhausted:
+            if step_km * 500 < self.SMART_CENTER_MIN_STEP:
+                break
+            levels += 1
+            step_km /= 2
+            children = []
+            for index in parents:
+                children += add_candidates(
+                    self._generate_candidate_points(candidates[index], radius_km=step_km, grid_size=1)
+                )
+            await assess_fairness(children)
+            count_locally(children)
+            await evaluate_level(children)
+            parents = top_k(parents + children)
+
+        evaluation_results = sorted(results.values(), key=lambda x: x["score"], reverse=True)
+        if best["index"] < len(candidates):
+            best_candidate, best_score = candidates[best["index"]], best["score"]
+        else:
+            best_candidate, best_score = geo_center, -1
+
+        elapsed = time.monotonic() - started
+        # 每个被剪枝的候选至少省下 POI 与地铁站两次搜索（公交站搜索视地铁结果而定，不计入），
+        # 本地算出的计数各省下一次搜索
+        searches = sum(result["details"]["searches"] for result in evaluation_results)
+        local_counts = sum(result["details"]["local_counts"] for result in evaluation_results)
+        searches_avoided = pruned * 2 + local_counts
+        if budget_exhausted:
+            logger.warning(
+                f"智能中心点评估超出预算 {self.SMART_CENTER_BUDGET:.1f}s，"
+                f"已评估 {len(evaluation_results)}/{len(candidates)} 个候选"
+            )
+        logger.info(
+            f"最优中心点: {best_candidate}, 评分: {best_score:.1f}, 耗时 {elapsed:.2f}s，"
+            f"加密 {levels} 级共 {len(candidates)} 个候选，评估 {len(evaluation_results)} 个，"
+            f"剪枝 {pruned} 个，区域取数 {area_requests} 次，单独搜索 {searches} 次，"
+            f"省下 {searches_avoided} 次搜索"
+        )
 
         return best_candidate, {
             "geo_center": geo_center,
             "best_candidate": best_candidate,
             "best_score": best_score,
+            "evaluated": len(evaluation_results),
+            "candidate_count": len(candidates),
+            "levels": levels,
+            "search_radius": round(radius_km * 1000),
+            "budget_exhausted": budget_exhausted,
+            "pruned": pruned,
+            "fairness_mode": fairness_mode,
+            "travel_time_requests": travel_budget.used if travel_budget else 0,
+            "area_requests": area_requests,
+            "searches": searches,
+            "searches_avoided": searches_avoided,
+            "elapsed": round(elapsed, 3),
             "all_candidates": evaluation_results[:5]  # 返回前5个
         }
 
+    async def _fetch_center_samples(
+        self,
+        center: Tuple[float, float],
+        grid_radius: float,
+        keywords: str,
+        timeout: Optional[float] = None,
+    ) -> Tuple[Dict[str, AreaSample], int]:
+        """以 center 为圆心按 CENTER_SEARCHES 的各类别各取一次数（可多页）
+
+        取数半径覆盖粗网格（半径 grid_radius 米）四角候选点的搜索圆。超过 timeout 秒
+        仍未取完的类别放弃（取消其请求），这些类别的计数由各候选单独搜索。
+
+        Returns:
+            (各类别样本（取数失败的类别缺省）, 上游请求数)
+        """
+        location = f"{center[0]:.6f},{center[1]:.6f}"
+        page_size = poi_cells.MAX_PAGE_SIZE
+        max_pages = max(1, math.ceil(self.SMART_CENTER_AREA_MAX_POIS / page_size))
+        requests = 0
+
+        async def fetch(category: str) -> Optional[AreaSample]:
+            nonlocal requests
+            keyword, radius, _ = self.CENTER_SEARCHES[category]
+            fetch_radius = min(poi_cells.MAX_RADIUS, int(math.ceil(grid_radius * math.sqrt(2) + radius)))
+            max_pois = max_pages * page_size
+            requests += 1
+            pages = [await self._fetch_pois(location, keyword or keywords, fetch_radius, "", page_size)]
+            if pages[0] is None:
+                return None
+            if len(pages[0]) == page_size and max_pages > 1:
+                # 第 1 页取满时并发取其余页
+                requests += max_pages - 1
+                pages += await asyncio.gather(*(
+                    self._fetch_pois(location, keyword or keywords, fetch_radius, "", page_size, page=page)
+                    for page in range(2, max_pages + 1)
+                ), return_exceptions=True)
+            pois: List[Dict] = []
+            for page in pages:
+                if page is None or isinstance(page, Exception):
+                    # 中间页失败（含网络错误/超时）：已取到的结果按截断处理
+                    max_pois = len(pois)
+                    break
+                pois.extend(page)
+                if len(page) < page_size:
+                    break
+            return AreaSample.from_fetch(location, fetch_radius, max_pois, pois)
+
+        tasks = {category: asyncio.create_task(fetch(category)) for category in self.CENTER_SEARCHES}
+        _, pending = await asyncio.wait(tasks.values(), timeout=None if timeout is None else max(0.0, timeout))
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        samples = {}
+        for category, task in tasks.items():
+            if task in pending:
+                logger.warning(f"区域取数超时（{timeout:.1f}s），改为单独搜索: {category}")
+            elif task.exception() is not None:
+                logger.debug(f"区域取数失败: {category}: {task.exception()}")
+            elif task.result() is not None:
+                samples[category] = task.result()
+        return samples, requests
+
+    def _smart_center_radius(self, coordinates: List[Tuple[float, float]]) -> float:
+        """智能中心点粗网格半径（米）：参与者外包矩形较长边的一半，限制在
+        [SMART_CENTER_MIN_RADIUS, SMART_CENTER_MAX_RADIUS] 内"""
+        lngs = [lng for lng, _ in coordinates]
+        lats = [lat for _, lat in coordinates]
+        mid_lat = (min(lats) + max(lats)) / 2
+        width = haversine_m(min(lngs), mid_lat, max(lngs), mid_lat)
+        height = haversine_m(lngs[0], min(lats), lngs[0], max(lats))
+        radius = max(width, height) / 2
+        return min(max(radius, self.SMART_CENTER_MIN_RADIUS), self.SMART_CENTER_MAX_RADIUS)
+
     def _generate_candidate_points(
         self,
         center: Tuple[float, float],
@@ -1201,7 +1711,9 @@ class CafeRecommender(BaseTool):
         self,
         candidate: Tuple[float, float],
         participant_coords: List[Tuple[float, float]],
-        keywords: str
+        keywords: str,
+        fairness: Optional[Tuple[float, Dict]] = None,
+        known_counts: Optional[Dict[str, int]] = None,
     ) -> Tuple[float, Dict]:
         """评估候选中心点的质量
 
@@ -1209,9 +1721,14 @@ class CafeRecommender(BaseTool):
         - POI 密度: 40分 - 周边是否有足够的目标场所
         - 交通便利性: 30分 - 是否靠近地铁站/公交站
         - 公平性: 30分 - 对所有参与者是否公平（最小化最大距离）
+
+        fairness 为 _center_fairness 的结果，调用方已算过时传入以免重复计算；
+        known_counts 为已在本地算出的 CENTER_SEARCHES 各类别计数，这些类别不再搜索。
         """
         lng, lat = candidate
         location_str = f"{lng},{lat}"
+        known_counts = known_counts or {}
+        used = {"searches": 0, "local_counts": 0}
 
         scores = {
             "poi_density": 0,
@@ -1220,35 +1737,35 @@ class CafeRecommender(BaseTool):
         }
         details = {}
 
-        # 1. POI 密度评分（40分）
-        try:
-            # 搜索目标场所
+        async def count_pois(category: str) -> int:
+            if category in known_counts:
+                used["local_counts"] += 1
+                return known_counts[category]
+            used["searches"] += 1
+            keyword, radius, offset = self.CENTER_SEARCHES[category]
             pois = await self._search_pois(
-                location=location_str,
-                keywords=keywords,
-                radius=1500,
-                offset=10
+                location=location_str, keywords=keyword or keywords, radius=radius, offset=offset
             )
-            poi_count = len(pois)
+            return len(pois)
 
+        # 目标场所与地铁站的搜索互不依赖，同时发出
+        poi_count, transit_count = await asyncio.gather(
+            count_pois("poi"), count_pois("subway"), return_exceptions=True
+        )
+
+        # 1. POI 密度评分（40分）
+        if isinstance(poi_count, Exception):
+            logger.debug(f"POI 搜索失败: {poi_count}")
+            scores["poi_density"] = 10  # 给个基础分
+        else:
             # 评分：0个=0分，5个=20分，10个=40分
             scores["poi_density"] = min(40, poi_count * 4)
             details["poi_count"] = poi_count
 
-        except Exception as e:
-            logger.debug(f"POI 搜索失败: {e}")
-            scores["poi_density"] = 10  # 给个基础分
-
         # 2. 交通便利性评分（30分）
         try:
-            # 搜索地铁站
-            transit_pois = await self._search_pois(
-                location=location_str,
-                keywords="地铁站",
-                radius=1000,
-                offset=5
-            )
-            transit_count = len(transit_pois)
+            if isinstance(transit_count, Exception):
+                raise transit_count
 
             # 有地铁站得高分
             if transit_count >= 2:
@@ -1257,13 +1774,7 @@ class CafeRecommender(BaseTool):
                 scores["transit"] = 20
             else:
                 # 搜索公交站
-                bus_pois = await self._search_pois(
-                    location=location_str,
-                    keywords="公交站",
-                    radius=500,
-                    offset=5
-                )
-                scores["transit"] = min(15, len(bus_pois) * 5)
+                scores["transit"] = min(15, await count_pois("bus") * 5)
 
             details["transit_count"] = transit_count
 
@@ -1272,34 +1783,122 @@ class CafeRecommender(BaseTool):
             scores["transit"] = 10
 
         # 3. 公平性评分（30分）
-        distances = []
-        for coord in participant_coords:
-            dist = self._calculate_distance(candidate, coord)
-            distances.append(dist)
-
-        max_distance = max(distances) if distances else 0
-        avg_distance = sum(distances) / len(distances) if distances else 0
-
-        # 最大距离越小越好，基于 3km 作为基准
-        # max_dist <= 1km: 30分, 2km: 20分, 3km: 10分, >3km: 5分
-        if max_distance <= 1000:
-            scores["fairness"] = 30
-        elif max_distance <= 2000:
-            scores["fairness"] = 25 - (max_distance - 1000) / 200
-        elif max_distance <= 3000:
-            scores["fairness"] = 15 - (max_distance - 2000) / 200
-        else:
-            scores["fairness"] = max(5, 10 - (max_distance - 3000) / 500)
-
-        details["max_distance"] = max_distance
-        details["avg_distance"] = avg_distance
-        details["distances"] = distances
+        scores["fairness"], fairness_details = fairness or self._center_fairness(candidate, participant_coords)
+        details.update(fairness_details)
+        details.update(used)
 
         total_score = sum(scores.values())
         details["scores"] = scores
 
         return total_score, details
 
+    def _center_fairness(
+        self,
+        candidate: Tuple[float, float],
+        participant_coords: List[Tuple[float, float]],
+    ) -> Tuple[float, Dict]:
+        """候选中心点的公平性评分（满分30，本地计算）及距离详情"""
+        return self._center_fairness_batch([candidate], participant_coords)[0]
+
+    def _center_fairness_batch(
+        self,
+        candidates: List[Tuple[float, float]],
+        participant_coords: List[Tuple[float, float]],
+    ) -> List[Tuple[float, Dict]]:
+        """一批候选的公平性评分：候选 × 参与者距离矩阵一次算出"""
+        if not candidates:
+            return []
+        if not participant_coords:
+            return [(30, {"max_distance": 0, "avg_distance": 0, "distances": []}) for _ in candidates]
+        matrix = distance_matrix(candidates, participant_coords)
+        results = []
+        for row in matrix:
+            distances = row.tolist()
+            max_distance = max(distances)
+            avg_distance = sum(distances) / len(distances)
+
+            # 最大距离越小越好，基于 3km 作为基准
+            # max_dist <= 1km: 30分, 2km: 20分, 3km: 10分, >3km: 5分
+            if max_distance <= 1000:
+                score = 30
+            elif max_distance <= 2000:
+                score = 25 - (max_distance - 1000) / 200
+            elif max_distance <= 3000:
+                score = 15 - (max_distance - 2000) / 200
+            else:
+                score = max(5, 10 - (max_distance - 3000) / 500)
+
+            results.append((score, {
+                "max_distance": max_distance,
+                "avg_distance": avg_distance,
+                "distances": distances,
+            }))
+        return results
+
+    async def _center_travel_fairness_batch(
+        self,
+        candidates: List[Tuple[float, float]],
+        participant_coords: List[Tuple[float, float]],
+        budget: CallBudget,
+        ratio: Optional[float] = None,
+    ) -> Tuple[Optional[List[Tuple[float, Dict]]], Optional[float]]:
+        """按出行时间计算一批候选的公平性分（满分30）：最远者 10 分钟内满分，60 分钟及以上 5 分
+
+        本批没有实测结果（预算用尽、调用失败）时，用此前批次的 时间/直线距离 比值 ratio
+        估算，保证同一次计算中各候选的分数可比。
+
+        Returns:
+            (各候选的 (分数, 详情)，无法估算时为 None; 本批的 时间/直线距离 比值)
+        """
+        straight = distance_matrix(candidates, participant_coords)
+        times = await travel_time_matrix(
+            candidates, participant_coords, self.api_key, budget, self.TRAVEL_TIME_MODE
+        )
+        if times is not None:
+            seconds, measured = times
+            usable = measured & (straight > 0)
+            if usable.any():
+                ratio = float(np.median(seconds[usable] / straight[usable]))
+        elif ratio is not None:
+            seconds, measured = straight * ratio, np.zeros(straight.shape, dtype=bool)
+        else:
+            return None, ratio
+
+        results = self._travel_time_fairness(seconds, straight)
+        for (_, details), measured_row in zip(results, measured):
+            details["measured"] = int(measured_row.sum())
+        return results, ratio
+
+    def _center_transit_fairness_batch(
+        self,
+        candidates: List[Tuple[float, float]],
+        participant_coords: List[Tuple[float, float]],
+    ) -> Optional[List[Tuple[float, Dict]]]:
+        """按离线线网估算的乘地铁耗时计算一批候选的公平性分；参与者或候选不在任何
+        城市线网范围内时返回 None"""
+        seconds = get_transit_graph().travel_times(participant_coords, candidates)
+        if seconds is None:
+            return None
+        return self._travel_time_fairness(seconds.T, distance_matrix(candidates, participant_coords))
+
+    @staticmethod
+    def _travel_time_fairness(seconds: np.ndarray, straight: np.ndarray) -> List[Tuple[float, Dict]]:
+        """候选 × 参与者耗时矩阵 -> 各候选的 (公平性分, 详情)：最远者 10 分钟内满分，60 分钟及以上 5 分"""
+        results = []
+        for time_row, distance_row in zip(seconds, straight):
+            max_time = float(time_row.max())
+            score = 30 - 25 * min(1.0, max(0.0, (max_time - 600) / 3000))
+            distances = distance_row.tolist()
+            results.append((score, {
+                "max_travel_time": max_time,
+                "avg_travel_time": float(time_row.mean()),
+                "travel_times": time_row.tolist(),
+                "max_distance": max(distances),
+                "avg_distance": sum(distances) / len(distances),
+                "distances": distances,
+            }))
+        return results
+
     async def _search_pois(
         self,
         location: str,
@@ -1308,133 +1907,211 @@ class CafeRecommender(BaseTool):
         types: str = "", 
         offset: int = 20
     ) -> List[Dict]:
-        cache_key = f"{location}_{keywords}_{radius}_{types}"
-        if cache_key in self.poi_cache:
-            return self.poi_cache[cache_key]
-        url = "https://restapi.amap.com/v3/place/around"
+        try:
+            lng_str, lat_str = location.split(",")
+            lng, lat = float(lng_str), float(lat_str)
+        except (ValueError, AttributeError):
+            logger.error(f"POI搜索中心点格式错误: {location}")
+            return []
+
+        # 结果按 geohash 网格记入 POI 索引：相邻中心点（包括智能中心的候选网格点）共用同一次取数
+        keywords_key = normalize_address(keywords)
+        types_key = (types or "").strip()
+        cell = geohash.encode(lng, lat, poi_cells.cell_precision(radius))
+        cell_key = poi_cells.poi_cell_key(cell, keywords_key, types_key)
+        poi_index = get_poi_index()
+        own_entry = poi_index.get(cell_key)
+        entries = [own_entry] if own_entry is not None else []
+        for neighbor in geohash.neighbors(cell):
+            entry = poi_index.get(poi_cells.poi_cell_key(neighbor, keywords_key, types_key))
+            if entry is not None:
+                entries.append(entry)
+
+        pois, exact = poi_cells.query_entries(entries, lng, lat, radius, offset)
+        if exact:
+            return pois
+        point_key = poi_cells.poi_point_key(location, radius, offset, keywords_key, types_key)
+        point_entry = poi_index.get(point_key)
+        if point_entry is not None:
+            return poi_cells.query_entries([point_entry], lng, lat, radius, offset)[0]
+
+        center, fetch_radius, page_size = poi_cells.plan_cell_fetch(cell, radius)
+        if own_entry is None or not poi_cells.covers_plan(own_entry, fetch_radius, page_size):
+            # 相同网格/关键词的并发请求合并为一次上游调用
+            fetched = await get_flight_group("poi").do(
+                (cell_key, fetch_radius, page_size),
+                lambda: self._fetch_pois(center, keywords, fetch_radius, types, page_size),
+            )
+            if fetched is None:
+                # 上游失败或熔断：退回缓存中的近似结果
+                return pois
+            own_entry = poi_index.add(
+                cell_key, poi_cells.build_entry(center, fetch_radius, page_size, fetched)
+            )
+            entries.append(own_entry)
+            pois, exact = poi_cells.query_entries(entries, lng, lat, radius, offset)
+            if exact:
+                return pois
+
+        # 热点区域网格取数被截断，缓存无法证明与直接调用等价：以查询中心直接取数
+        fetched = await get_flight_group("poi").do(
+            point_key,
+            lambda: self._fetch_pois(location, keywords, radius, types, offset),
+        )
+        if fetched is None:
+            return pois
+        point_entry = poi_index.add(
+            point_key, poi_cells.build_entry(location, radius, offset, fetched)
+        )
+        return poi_cells.query_entries([point_entry], lng, lat, radius, offset)[0]
+
+    async def _fetch_pois(
+        self,
+        location: str,
+        keywords: str,
+        radius: int,
+        types: str,
+        offset: int,
+        page: int = 1
+    ) -> Optional[List[Dict]]:
+        """访问高德周边搜索，返回原始 POI 列表（失败时为 None）"""
         params = {
             "key": self.api_key,
             "location": location,
             "keywords": keywords,
             "radius": radius,
             "offset": offset,
-            "page": 1,
+            "page": page,
             "extensions": "all"
         }
         if types: 
             params["types"] = types
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                if response.status != 200:
-                    logger.error(f"高德地图POI搜索失败: {response.status}, 参数: {params}")
-                    return []
-                data = await response.json()
-                if data["status"] != "1":
-                    logger.error(f"POI搜索API返回错误: {data.get('info', '未知错误')}, 参数: {params}")
-                    return []
-                pois = data.get("pois", [])
-                # 缓存大小限制：超限时删除最旧的条目
-                if len(self.poi_cache) >= self.POI_CACHE_MAX:
-                    oldest_key = next(iter(self.poi_cache))
-                    del self.poi_cache[oldest_key]
-                self.poi_cache[cache_key] = pois
-                return pois
-
-    # ========== V2 多维度评分系统 ==========
-
-    def _calculate_base_score(self, place: Dict) -> Tuple[float, float]:
-        """计算基础评分 (满分30分)
-
-        Returns:
-            (score, raw_rating): 评分和原始rating值
-        """
-        biz_ext = place.get("biz_ext", {}) or {}
-        rating_str = biz_ext.get("rating", "0") or "0"
         try:
-            rating = float(rating_str)
-        except (ValueError, TypeError):
-            rating = 0
-
-        # 无评分场所使用默认3.5分
-        if rating == 0:
-            rating = 3.5
-            place["_has_rating"] = False
-        else:
-            place["_has_rating"] = True
-
-        # 评分归一化到30分 (rating范围1-5)
-        score = min(rating, 5) * 6
-        return score, rating
-
-    def _calculate_popularity_score(self, place: Dict) -> Tuple[float, int, int]:
-        """计算热度分 (满分20分)
+            data = await get_amap_client().get_json("place_around", params)
+        except AMapCircuitOpenError:
+            # 熔断中：由调用方退回 POI 索引中的近似结果
+            logger.warning(f"周边搜索熔断中，使用缓存结果: {keywords}@{location}")
+            return None
+        except AMapError as e:
+            if e.status is None:
+                raise
+            logger.error(f"高德地图POI搜索失败: {e.status}, 参数: {params}")
+            return None
+        if data["status"] != "1":
+            logger.error(f"POI搜索API返回错误: {data.get('info', '未知错误')}, 参数: {params}")
+            return None
+        return data.get("pois", [])
 
-        基于评论数和图片数
-        Returns:
-            (score, review_count, photo_count): 热度分和原始数据
+    async def _iter_poi_pages(
+        self,
+        location: str,
+        keywords: str,
+        radius: int = 5000,
+        types: str = "",
+        max_candidates: Optional[int] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """按距离由近到远逐页产出周边搜索结果
+
+        第 1 页走 `_search_pois`（网格缓存 / POI 索引）；第 1 页取满时，以查询中心
+        并发预取后续页，直到候选数达到 max_candidates 或结果取尽。调用方提前结束迭代
+        时（需配合 contextlib.aclosing），尚未完成的预取请求会被取消。
         """
-        biz_ext = place.get("biz_ext", {}) or {}
-
-        # 评论数
-        review_count_str = biz_ext.get("review_count", "0") or "0"
-        try:
-            review_count = int(review_count_str)
-        except (ValueError, TypeError):
-            review_count = 0
-
-        # 图片数 (高德API的photos字段)
-        photos = place.get("photos", []) or []
-        photo_count = len(photos) if isinstance(photos, list) else 0
-
-        # 对数计算避免大数压倒一切
-        # log10(100) = 2, log10(1000) = 3
-        review_score = math.log10(review_count + 1) * 5 if review_count > 0 else 0
-        photo_score = min(photo_count * 2, 6)  # 最多3张图贡献6分
+        page_size = poi_cells.MAX_PAGE_SIZE
+        max_candidates = max_candidates or self.POI_CANDIDATE_BUDGET
+        max_pages = max(1, math.ceil(max_candidates / page_size))
 
-        score = min(20, review_score + photo_score)
-        return score, review_count, photo_count
+        first_page = await self._search_pois(location, keywords, radius, types, offset=page_size)
+        yield first_page
+        if len(first_page) < page_size or max_pages == 1:
+            return
 
-    def _calculate_distance_score_v2(
+        in_flight: Deque[asyncio.Task] = deque()
+        next_page = 2
+        try:
+            while next_page <= max_pages or in_flight:
+                while next_page <= max_pages and len(in_flight) < self.POI_PAGE_CONCURRENCY:
+                    in_flight.append(asyncio.create_task(
+                        self._fetch_pois(location, keywords, radius, types, page_size, page=next_page)
+                    ))
+                    next_page += 1
+                try:
+                    page = await in_flight.popleft()
+                except AMapError as e:
+                    # 后续页是可选的预取：网络错误/超时只截断分页，保留已产出的结果
+                    logger.warning(f"'{keywords}' 预取后续页失败，停止翻页: {e}")
+                    return
+                if not page:
+                    return
+                yield page
+                if len(page) < page_size:
+                    return
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def _collect_scored_places(
         self,
-        place: Dict,
-        center_point: Tuple[float, float]
-    ) -> Tuple[float, float]:
-        """计算距离分 (满分25分) - 非线性衰减
+        location: str,
+        keywords: str,
+        center_point: Tuple[float, float],
+        user_requirements: str,
+        scoring_keywords: str,
+        types: str = "",
+        min_rating: float = 0.0,
+        max_distance: int = 100000,
+        source_keyword: str = "",
+        participant_coords: Optional[List[Tuple[float, float]]] = None
+    ) -> Tuple[List[Place], int]:
+        """边分页获取边筛选评分，高质量候选足够或超出距离上限时停止翻页
+
+        每个 POI 在这里解析为 Place，之后的评分与页面渲染不再访问原始字典。
+        participant_coords 用于 PLACE_DISTANCE_MODE 为 transit 时的乘地铁耗时。
 
         Returns:
-            (score, distance): 距离分和实际距离(米)
+            (places, fetched): 已筛选并评分的场所，以及从高德取到的 POI 总数
         """
-        location = place.get("location", "")
-        if not location or "," not in location:
-            return 0, float('inf')
-
-        try:
-            lng_str, lat_str = location.split(",")
-            place_lng, place_lat = float(lng_str), float(lat_str)
-        except (ValueError, TypeError):
-            return 0, float('inf')
-
-        distance = self._calculate_distance(center_point, (place_lng, place_lat))
-        place["_distance"] = distance
-
-        # 非线性衰减：500米内满分，之后快速衰减
-        # 使用1.5次幂衰减曲线
-        if distance <= 500:
-            score = 25
-        elif distance <= 2500:
-            # (1 - (distance/2500)^1.5) * 25
-            ratio = (distance - 500) / 2000  # 归一化到0-1
-            decay = ratio ** 1.5
-            score = 25 * (1 - decay * 0.8)  # 最低保留20%
-        else:
-            score = 5  # 超远距离给最低分
+        places: List[Place] = []
+        seen = set()
+        fetched = 0
+        high_quality = 0
+        async with aclosing(self._iter_poi_pages(location, keywords, types=types)) as pages:
+            async for page in pages:
+                fetched += len(page)
+                page_places = [Place.from_amap(poi) for poi in page]
+                self._assign_distances(page_places, center_point)
+                self._assign_transit_times(page_places, participant_coords)
+                kept = []
+                for place in page_places:
+                    if place.key in seen:
+                        continue
+                    seen.add(place.key)
+                    if source_keyword:
+                        place.source_keyword = source_keyword
+                    if self._passes_filters(place, center_point, min_rating, max_distance):
+                        kept.append(place)
+                # 每页筛选后的场所一次评分
+                scores = self._score_places(kept, center_point, user_requirements, scoring_keywords)
+                high_quality += int((scores >= self.HIGH_QUALITY_SCORE).sum())
+                places.extend(kept)
+
+                if high_quality >= self.HIGH_QUALITY_TARGET:
+                    logger.info(f"'{keywords}' 已有 {high_quality} 个高质量候选，停止翻页")
+                    break
+                try:
+                    farthest = float(page[-1].get("distance") or 0) if page else 0
+                except (TypeError, ValueError):
+                    farthest = 0
+                if max_distance < 100000 and farthest > max_distance:
+                    logger.info(f"'{keywords}' 结果已超出距离上限 {max_distance} 米，停止翻页")
+                    break
+        return places, fetched
 
-        return score, distance
+    # ========== V2 多维度评分系统 ==========
 
     def _calculate_scenario_match_score(
         self,
-        place: Dict,
+        place: Place,
         keywords: str
     ) -> Tuple[float, str]:
         """计算场景匹配分 (满分15分)
@@ -1442,13 +2119,13 @@ class CafeRecommender(BaseTool):
         Returns:
             (score, matched_keyword): 场景分和匹配的关键词
         """
-        source_keyword = place.get('_source_keyword', '')
+        source_keyword = place.source_keyword
 
         if source_keyword and source_keyword in keywords:
             return 15, source_keyword
 
         # 部分匹配：检查type字段
-        place_type = place.get("type", "")
+        place_type = place.type
         keywords_list = keywords.replace("、", " ").split()
 
         for kw in keywords_list:
@@ -1459,134 +2136,28 @@ class CafeRecommender(BaseTool):
 
     def _calculate_requirement_score(
         self,
-        place: Dict,
+        place: Place,
         user_requirements: str
     ) -> Tuple[float, List[str], Dict[str, str]]:
         """计算需求匹配分 (满分10分) - 三层匹配算法
 
-        三层匹配机制：
+        三层匹配机制（见 app.amap.requirement_matcher）：
         - Layer 1: POI标签硬匹配 (高置信度 high, +4分)
         - Layer 2: 品牌特征匹配 (中置信度 medium, +2分)
         - Layer 3: 类型推断匹配 (低置信度 low, +1分)
 
+        批量评分时用户需求只解析一次，见 _score_places。
+
         Returns:
             (score, matched_requirements, confidence_map):
             需求分、匹配的需求列表、置信度字典
         """
-        if not user_requirements:
-            return 0, [], {}
-
-        # 需求规范化映射（将各种表达方式统一）
-        requirement_aliases = {
-            "停车": ["停车", "车位", "停车场", "免费停车", "方便停车", "停车方便"],
-            "安静": ["安静", "环境好", "氛围", "静", "舒适", "环境安静"],
-            "商务": ["商务", "会议", "办公", "谈事", "工作"],
-            "交通": ["交通", "地铁", "公交", "方便", "交通便利"],
-            "包间": ["包间", "私密", "独立", "包厢", "有包间"],
-            "WiFi": ["wifi", "无线", "网络", "上网", "免费wifi"],
-            "可以久坐": ["久坐", "可以久坐", "坐着办公", "长时间"],
-            "适合儿童": ["儿童", "带娃", "亲子", "小孩", "适合儿童"],
-            "24小时营业": ["24小时", "通宵", "夜间", "凌晨"],
-        }
-
-        # POI标签匹配规则（Layer 1）
-        poi_match_rules = {
-            "停车": {
-                "check_fields": ["tag", "parking_type", "navi_poiid"],
-                "match_values": ["停车", "车位", "免费停车", "parking"]
-            },
-            "安静": {
-                "check_fields": ["tag"],
-                "match_values": ["安静", "环境", "氛围", "舒适", "优雅"]
-            },
-            "商务": {
-                "check_fields": ["tag", "type"],
-                "match_values": ["商务", "会议", "办公", "商务区"]
-            },
-            "交通": {
-                "check_fields": ["tag", "address"],
-                "match_values": ["地铁", "公交", "站", "枢纽"]
-            },
-            "包间": {
-                "check_fields": ["tag"],
-                "match_values": ["包间", "包厢", "私密", "独立房间"]
-            },
-            "WiFi": {
-                "check_fields": ["tag"],
-                "match_values": ["wifi", "无线", "免费WiFi", "网络"]
-            },
-        }
-
-        # 识别用户需求
-        user_reqs = set()
-        user_requirements_lower = user_requirements.lower()
-        for req_name, aliases in requirement_aliases.items():
-            for alias in aliases:
-                if alias.lower() in user_requirements_lower:
-                    user_reqs.add(req_name)
-                    break
-
-        if not user_reqs:
-            return 0, [], {}
-
-        matched = []
-        confidence_map = {}  # 需求 -> 置信度 (high/medium/low)
-        total_score = 0
-        place_name = place.get("name", "")
-        place_type = place.get("type", "")
-
-        # ========== Layer 1: POI标签硬匹配（高置信度）==========
-        for req_name in user_reqs:
-            if req_name in matched:
-                continue
-            if req_name not in poi_match_rules:
-                continue
-            rule = poi_match_rules[req_name]
-            for field in rule["check_fields"]:
-                field_value = str(place.get(field, "")).lower()
-                if any(mv.lower() in field_value for mv in rule["match_values"]):
-                    matched.append(req_name)
-                    confidence_map[req_name] = "high"
-                    total_score += 4  # 高置信度 +4分
-                    break
-
-        # ========== Layer 2: 品牌特征匹配（中置信度）==========
-        for brand, features in self.BRAND_FEATURES.items():
-            if brand.startswith("_"):
-                continue  # 跳过类型默认值
-            if brand in place_name:
-                for req_name in user_reqs:
-                    if req_name in matched:
-                        continue
-                    score = features.get(req_name, 0)
-                    if score >= 0.7:  # 0.7以上视为满足
-                        matched.append(req_name)
-                        confidence_map[req_name] = "medium"
-                        total_score += 2  # 中置信度 +2分
-                break  # 只匹配第一个品牌
-
-        # ========== Layer 3: 类型推断匹配（低置信度）==========
-        for type_key, features in self.BRAND_FEATURES.items():
-            if not type_key.startswith("_"):
-                continue  # 只处理类型默认值
-            type_name = type_key[1:]  # 去掉下划线前缀
-            if type_name in place_type or type_name in place_name:
-                for req_name in user_reqs:
-                    if req_name in matched:
-                        continue
-                    score = features.get(req_name, 0)
-                    if score >= 0.8:  # 类型推断需要更高阈值
-                        matched.append(req_name)
-                        confidence_map[req_name] = "low"
-                        total_score += 1  # 低置信度 +1分
-                break  # 只匹配第一个类型
-
-        return min(10, total_score), matched, confidence_map
+        return REQUIREMENT_MATCHER.score(place, REQUIREMENT_MATCHER.parse(user_requirements))
 
     def _apply_diversity_adjustment(
         self,
-        places: List[Dict]
-    ) -> List[Dict]:
+        places: List[Place]
+    ) -> List[Place]:
         """应用多样性调整
 
         - 同名连锁店惩罚
@@ -1595,7 +2166,7 @@ class CafeRecommender(BaseTool):
         # 统计店名出现次数
         name_counts = {}
         for place in places:
-            name = place.get("name", "")
+            name = place.name
             # 提取品牌名（去掉括号内容和分店信息）
             brand_name = name.split("(")[0].split("（")[0]
             brand_name = brand_name.replace("店", "").replace("分店", "")
@@ -1604,7 +2175,7 @@ class CafeRecommender(BaseTool):
         # 应用惩罚
         seen_brands = {}
         for place in places:
-            name = place.get("name", "")
+            name = place.name
             brand_name = name.split("(")[0].split("（")[0].replace("店", "").replace("分店", "")
 
             if name_counts.get(brand_name, 0) > 1:
@@ -1612,16 +2183,16 @@ class CafeRecommender(BaseTool):
                 if seen_count > 0:
                     # 第二家及以后的同品牌店铺扣分
                     penalty = min(15, seen_count * 5)
-                    place["_score"] = place.get("_score", 0) - penalty
-                    place["_diversity_penalty"] = penalty
+                    place.score -= penalty
+                    place.diversity_penalty = penalty
                 seen_brands[brand_name] = seen_count + 1
 
         return places
 
     def _generate_recommendation_reason(
         self,
-        place: Dict,
-        all_places: List[Dict]
+        place: Place,
+        all_places: List[Place]
     ) -> str:
         """生成推荐理由
 
@@ -1629,11 +2200,11 @@ class CafeRecommender(BaseTool):
         """
         reasons = []
 
-        distance = place.get("_distance", float('inf'))
-        rating = place.get("_raw_rating", 0)
-        review_count = place.get("_review_count", 0)
-        matched_reqs = place.get("_matched_requirements", [])
-        scenario = place.get("_matched_scenario", "")
+        distance = place.distance if place.distance is not None else float('inf')
+        rating = place.raw_rating
+        review_count = place.review_count
+        matched_reqs = place.matched_requirements
+        scenario = place.matched_scenario
 
         # 距离优势
         if distance < 500:
@@ -1642,9 +2213,9 @@ class CafeRecommender(BaseTool):
             reasons.append(f"位置便利，约{int(distance)}米")
 
         # 评分优势
-        if rating >= 4.5 and place.get("_has_rating"):
+        if rating >= 4.5 and place.has_rating:
             reasons.append(f"口碑极佳，评分{rating}")
-        elif rating >= 4.0 and place.get("_has_rating"):
+        elif rating >= 4.0 and place.has_rating:
             reasons.append(f"评价良好，{rating}分")
 
         # 热度优势
@@ -1674,12 +2245,12 @@ class CafeRecommender(BaseTool):
 
     async def _llm_smart_ranking(
         self,
-        places: List[Dict],
+        places: List[Place],
         user_requirements: str,
         participant_locations: List[str],
         keywords: str,
         top_n: int = 8
-    ) -> List[Dict]:
+    ) -> List[Place]:
         """LLM 智能评分重排序
 
         使用 LLM 对候选场所进行智能评分和重排序，考虑：
@@ -1708,14 +2279,14 @@ class CafeRecommender(BaseTool):
         for i, place in enumerate(places[:15]):  # 最多分析15个
             summary = {
                 "id": i,
-                "name": place.get("name", ""),
-                "type": place.get("type", ""),
-                "rating": place.get("_raw_rating", 0),
-                "review_count": place.get("_review_count", 0),
-                "distance": round(place.get("_distance", 0)),
-                "address": place.get("address", ""),
-                "rule_score": round(place.get("_score", 0), 1),
-                "features": place.get("tag", "")[:100] if place.get("tag") else ""
+                "name": place.name,
+                "type": place.type,
+                "rating": place.raw_rating,
+                "review_count": place.review_count,
+                "distance": round(place.distance or 0),
+                "address": place.address,
+                "rule_score": round(place.score, 1),
+                "features": place.tag[:100]
             }
             places_summary.append(summary)
 
@@ -1774,22 +2345,22 @@ class CafeRecommender(BaseTool):
             for i, place in enumerate(places[:15]):
                 if i in id_to_llm_result:
                     llm_result = id_to_llm_result[i]
-                    place["_llm_score"] = llm_result.get("llm_score", 0)
-                    place["_llm_reason"] = llm_result.get("reason", "")
+                    place.llm_score = llm_result.get("llm_score", 0)
+                    place.llm_reason = llm_result.get("reason", "")
                     # 综合得分 = 规则得分 * 0.4 + LLM 得分 * 0.6
-                    place["_final_score"] = place.get("_score", 0) * 0.4 + place["_llm_score"] * 0.6
+                    place.final_score = place.score * 0.4 + place.llm_score * 0.6
                 else:
-                    place["_llm_score"] = 0
-                    place["_llm_reason"] = ""
-                    place["_final_score"] = place.get("_score", 0) * 0.4
+                    place.llm_score = 0
+                    place.llm_reason = ""
+                    place.final_score = place.score * 0.4
 
             # 按最终得分重排序
-            places_with_llm = [p for p in places[:15] if p.get("_llm_score", 0) > 0]
-            places_without_llm = [p for p in places[:15] if p.get("_llm_score", 0) == 0]
+            places_with_llm = [p for p in places[:15] if p.llm_score > 0]
+            places_without_llm = [p for p in places[:15] if p.llm_score == 0]
 
             # LLM 评分的排前面
-            places_with_llm.sort(key=lambda x: x.get("_final_score", 0), reverse=True)
-            places_without_llm.sort(key=lambda x: x.get("_score", 0), reverse=True)
+            places_with_llm.sort(key=lambda x: x.final_score or 0, reverse=True)
+            places_without_llm.sort(key=lambda x: x.score, reverse=True)
 
             result = places_with_llm + places_without_llm
             logger.info(f"LLM 智能排序完成，返回 {len(result[:top_n])} 个推荐")
@@ -1805,7 +2376,7 @@ class CafeRecommender(BaseTool):
 
     async def _llm_generate_transport_tips(
         self,
-        places: List[Dict],
+        places: List[Place],
         center_point: Tuple[float, float],
         participant_locations: List[str],
         keywords: str
@@ -1833,10 +2404,10 @@ class CafeRecommender(BaseTool):
             places_info = []
             for i, place in enumerate(places[:5]):
                 places_info.append({
-                    "name": place.get("name", ""),
-                    "address": place.get("address", ""),
-                    "distance": place.get("_distance", 0),
-                    "type": place.get("type", "")
+                    "name": place.name,
+                    "address": place.address,
+                    "distance": place.distance or 0,
+                    "type": place.type
                 })
 
             prompt = f"""你是一个本地出行专家。根据以下信息，生成个性化的交通与停车建议。
@@ -1914,7 +2485,7 @@ class CafeRecommender(BaseTool):
 
     async def _llm_generate_place_reasons(
         self,
-        places: List[Dict],
+        places: List[Place],
         user_requirements: str,
         participant_locations: List[str],
         keywords: str
@@ -1941,11 +2512,11 @@ class CafeRecommender(BaseTool):
             for i, place in enumerate(places[:8]):
                 places_info.append({
                     "id": i,
-                    "name": place.get("name", ""),
-                    "rating": place.get("_raw_rating", place.get("rating", 0)),
-                    "distance": round(place.get("_distance", 0)),
-                    "address": place.get("address", ""),
-                    "type": place.get("type", "")
+                    "name": place.name,
+                    "rating": place.raw_rating or place.rating,
+                    "distance": round(place.distance or 0),
+                    "address": place.address,
+                    "type": place.type
                 })
 
             prompt = f"""你是一个本地生活推荐专家。为以下场所生成简洁的推荐理由。
@@ -2001,7 +2572,7 @@ class CafeRecommender(BaseTool):
             result = {}
             for i, place in enumerate(places[:8]):
                 if str(i) in reasons_map:
-                    result[place.get("name", "")] = reasons_map[str(i)]
+                    result[place.name] = reasons_map[str(i)]
 
             logger.info(f"LLM 生成了 {len(result)} 条推荐理由")
             return result
@@ -2012,14 +2583,15 @@ class CafeRecommender(BaseTool):
 
     def _rank_places(
         self,
-        places: List[Dict],
+        places: List[Union[Dict, Place]],
         center_point: Tuple[float, float],
         user_requirements: str,
         keywords: str,
         min_rating: float = 0.0,
         max_distance: int = 100000,
-        price_range: str = ""
-    ) -> List[Dict]:
+        price_range: str = "",
+        participant_coords: Optional[List[Tuple[float, float]]] = None
+    ) -> List[Place]:
         """V2 多维度评分排序算法
 
         评分维度 (满分100分):
@@ -2033,115 +2605,175 @@ class CafeRecommender(BaseTool):
         - min_rating: 最低评分过滤
         - max_distance: 最大距离过滤(米)
         - price_range: 价格区间过滤
+
+        PLACE_DISTANCE_MODE 为 transit 且传入 participant_coords 时，距离分按乘地铁耗时计算
         """
         logger.info(f"开始V2多维度评分，共{len(places)}个场所")
 
-        # ========== 硬筛选阶段 ==========
-        original_count = len(places)
-
-        # 1. 评分筛选
-        if min_rating > 0:
-            places = [p for p in places if float(p.get("rating", 0) or 0) >= min_rating]
-            logger.info(f"评分筛选(>={min_rating}): {original_count} -> {len(places)}")
-
-        # 2. 距离筛选
-        if max_distance < 100000:
-            filtered_places = []
-            for p in places:
-                try:
-                    # Amap POI uses "location" field with "lng,lat" format
-                    location = p.get("location", "")
-                    if location and "," in location:
-                        lng_str, lat_str = location.split(",")
-                        place_lng, place_lat = float(lng_str), float(lat_str)
-                    else:
-                        # Fallback to separate fields
-                        place_lng = float(p.get("lng", 0))
-                        place_lat = float(p.get("lat", 0))
-                    dist = self._calculate_distance(center_point, (place_lng, place_lat))
-                    if dist <= max_distance:
-                        filtered_places.append(p)
-                except (ValueError, TypeError):
-                    pass
-            places = filtered_places
-            logger.info(f"距离筛选(<={max_distance}米): 剩余{len(places)}个")
-
-        # 3. 价格区间筛选（软筛选，作为排序权重）
+        # 价格区间筛选（软筛选，作为排序权重）
         price_weight_map = {
             "economy": ["¥", "人均20", "人均30", "人均40"],
             "mid": ["¥¥", "人均50", "人均60", "人均80", "人均100"],
             "high": ["¥¥¥", "¥¥¥¥", "人均150", "人均200", "人均300"]
         }
 
+        places = [as_place(p) for p in places]
+        self._assign_distances(places, center_point)
+        self._assign_transit_times(places, participant_coords)
+        places = self._filter_places(places, center_point, min_rating, max_distance)
         if not places:
             logger.warning("筛选后无符合条件的场所")
             return []
 
-        for place in places:
-            # 1. 基础评分 (满分30分)
-            base_score, raw_rating = self._calculate_base_score(place)
-            place["_raw_rating"] = raw_rating
+        self._score_places(places, center_point, user_requirements, keywords)
 
-            # 2. 热度分 (满分20分)
-            popularity_score, review_count, photo_count = self._calculate_popularity_score(place)
-            place["_review_count"] = review_count
-            place["_photo_count"] = photo_count
+        return self._finalize_ranking(places)
 
-            # 3. 距离分 (满分25分) - 非线性衰减
-            distance_score, distance = self._calculate_distance_score_v2(place, center_point)
+    def _assign_distances(self, places: List[Place], center_point: Tuple[float, float]) -> None:
+        """一次算出各场所到中心点的距离写入 place.distance（坐标缺失的保持 None）"""
+        if not places:
+            return
+        distances = distances_from(center_point, [(p.lng, p.lat) for p in places])
+        for place, distance in zip(places, distances.tolist()):
+            place.distance = None if place.lng is None or place.lat is None else distance
 
-            # 4. 场景匹配分 (满分15分)
-            scenario_score, matched_scenario = self._calculate_scenario_match_score(place, keywords)
-            place["_matched_scenario"] = matched_scenario
+    def _assign_transit_times(
+        self,
+        places: List[Place],
+        participant_coords: Optional[List[Tuple[float, float]]],
+    ) -> None:
+        """PLACE_DISTANCE_MODE 为 transit 时，把参与者到各场所乘地铁耗时的最大值写入
+        place.transit_time；不在离线线网范围内时不写入"""
+        if self.PLACE_DISTANCE_MODE != "transit" or not participant_coords:
+            return
+        located = [p for p in places if p.lng is not None and p.lat is not None]
+        if not located:
+            return
+        seconds = get_transit_graph().travel_times(participant_coords, [(p.lng, p.lat) for p in located])
+        if seconds is None:
+            return
+        for place, longest in zip(located, seconds.max(axis=0).tolist()):
+            place.transit_time = longest
+
+    def _place_distance(self, place: Place, center_point: Tuple[float, float]) -> float:
+        """place.distance（由 _assign_distances 成批写入），未写入时单独计算"""
+        if place.distance is None:
+            place.distance = haversine_m(*center_point, place.lng, place.lat)
+        return place.distance
+
+    def _filter_places(
+        self,
+        places: List[Place],
+        center_point: Tuple[float, float],
+        min_rating: float = 0.0,
+        max_distance: int = 100000
+    ) -> List[Place]:
+        """硬筛选：最低评分与最大距离"""
+        original_count = len(places)
+        places = [
+            p for p in places
+            if self._passes_filters(p, center_point, min_rating, max_distance)
+        ]
+        if min_rating > 0 or max_distance < 100000:
+            logger.info(
+                f"硬筛选(评分>={min_rating}, 距离<={max_distance}米): {original_count} -> {len(places)}"
+            )
+        return places
 
-            # 5. 需求匹配分 (满分10分) - 三层匹配算法
-            requirement_score, matched_reqs, confidence_map = self._calculate_requirement_score(place, user_requirements)
-            place["_matched_requirements"] = matched_reqs
-            place["_requirement_confidence"] = confidence_map  # 置信度映射
+    def _passes_filters(
+        self,
+        place: Place,
+        center_point: Tuple[float, float],
+        min_rating: float = 0.0,
+        max_distance: int = 100000
+    ) -> bool:
+        # 1. 评分筛选
+        if min_rating > 0 and place.rating < min_rating:
+            return False
 
-            # 汇总得分
-            total_score = base_score + popularity_score + distance_score + scenario_score + requirement_score
-            place["_score"] = total_score
+        # 2. 距离筛选
+        if max_distance < 100000:
+            if place.lng is None or place.lat is None:
+                return False
+            return self._place_distance(place, center_point) <= max_distance
 
-            # 记录评分明细用于调试
-            place["_score_breakdown"] = {
-                "base": round(base_score, 1),
-                "popularity": round(popularity_score, 1),
-                "distance": round(distance_score, 1),
-                "scenario": round(scenario_score, 1),
-                "requirement": round(requirement_score, 1)
-            }
+        return True
 
-            logger.debug(
-                f"{place.get('name')}: 总分{total_score:.1f} "
-                f"(基础{base_score:.1f}+热度{popularity_score:.1f}+"
-                f"距离{distance_score:.1f}+场景{scenario_score:.1f}+需求{requirement_score:.1f})"
-            )
+    def _score_places(
+        self,
+        places: List[Place],
+        center_point: Tuple[float, float],
+        user_requirements: str,
+        keywords: str
+    ) -> np.ndarray:
+        """计算一批场所的多维度总分（列式，见 app.amap.place_scores），并把评分明细写入场所
+
+        场景匹配与需求匹配需要字符串匹配，按 (来源关键词, 类型) 与场所各算一次后作为列传入；
+        用户需求只解析一次。
+
+        Returns:
+            各场所的总分
+        """
+        if not places:
+            return np.zeros(0)
+        self._assign_distances([p for p in places if p.distance is None], center_point)
 
+        requirement_query = REQUIREMENT_MATCHER.parse(user_requirements)
+        scenario_cache: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        scenario_scores = []
+        requirement_scores = []
+        for place in places:
+            scenario_key = (place.source_keyword, place.type)
+            if scenario_key not in scenario_cache:
+                scenario_cache[scenario_key] = self._calculate_scenario_match_score(place, keywords)
+            scenario_score, place.matched_scenario = scenario_cache[scenario_key]
+            scenario_scores.append(scenario_score)
+
+            requirement_score, matched_reqs, confidence_map = REQUIREMENT_MATCHER.score(place, requirement_query)
+            place.matched_requirements = matched_reqs
+            place.requirement_confidence = confidence_map  # 置信度映射
+            requirement_scores.append(requirement_score)
+
+        columns = ScoreColumns.from_places(places, scenario_scores, requirement_scores)
+        scores = score_columns(columns)
+        breakdown = {key: [round(value, 1) for value in scores[key].tolist()] for key in BREAKDOWN_KEYS}
+        totals = scores["total"].tolist()
+        raw_ratings = np.where(columns.rating == 0, DEFAULT_RATING, columns.rating).tolist()
+        for i, place in enumerate(places):
+            place.raw_rating = raw_ratings[i]
+            place.has_rating = place.rating != 0
+            place.score = totals[i]
+            # 记录评分明细用于调试
+            place.score_breakdown = {key: breakdown[key][i] for key in BREAKDOWN_KEYS}
+        logger.debug(f"列式评分 {len(places)} 个场所，最高 {max(totals):.1f} 分")
+        return scores["total"]
+
+    def _finalize_ranking(self, places: List[Place]) -> List[Place]:
+        """对已评分的场所排序，应用多样性调整并生成推荐理由"""
         # 初步排序
-        ranked_places = sorted(places, key=lambda x: x.get("_score", 0), reverse=True)
+        ranked_places = sorted(places, key=lambda x: x.score, reverse=True)
 
         # 应用多样性调整（惩罚连锁店）
         ranked_places = self._apply_diversity_adjustment(ranked_places)
 
         # 重新排序
-        ranked_places = sorted(ranked_places, key=lambda x: x.get("_score", 0), reverse=True)
+        ranked_places = sorted(ranked_places, key=lambda x: x.score, reverse=True)
 
         # 生成推荐理由（优先使用 LLM 生成的理由，否则使用规则生成）
         for place in ranked_places:
             # 如果 LLM 智能排序已经生成了理由，优先使用
-            if place.get("_llm_reason"):
-                place["_recommendation_reason"] = place["_llm_reason"]
+            if place.llm_reason:
+                place.recommendation_reason = place.llm_reason
             else:
-                place["_recommendation_reason"] = self._generate_recommendation_reason(place, ranked_places)
+                place.recommendation_reason = self._generate_recommendation_reason(place, ranked_places)
 
         # 对于多场景搜索，确保每个场景都有代表性
-        if any(place.get('_source_keyword') for place in ranked_places):
+        if any(place.source_keyword for place in ranked_places):
             logger.info("应用多场景平衡策略")
             # 按场景类型分组
             by_keyword = {}
             for place in ranked_places:
-                keyword = place.get('_source_keyword', '未知')
+                keyword = place.source_keyword or '未知'
                 if keyword not in by_keyword:
                     by_keyword[keyword] = []
                 by_keyword[keyword].append(place)
@@ -2156,31 +2788,38 @@ class CafeRecommender(BaseTool):
                 logger.info(f"从场景 '{keyword}' 选择了 {len(selected)} 个场所")
 
             # 按分数重新排序，但保持场景多样性
-            balanced_places = sorted(balanced_places, key=lambda x: x.get("_score", 0), reverse=True)
+            balanced_places = sorted(balanced_places, key=lambda x: x.score, reverse=True)
 
             # 记录最终推荐
             for i, p in enumerate(balanced_places[:8]):
-                logger.info(f"推荐#{i+1}: {p.get('name')} ({p.get('_score', 0):.1f}分) - {p.get('_recommendation_reason', '')}")
+                logger.info(f"推荐#{i+1}: {p.name} ({p.score:.1f}分) - {p.recommendation_reason}")
 
             return balanced_places[:8]  # 增加到8个推荐
         else:
             # 记录最终推荐
             for i, p in enumerate(ranked_places[:6]):
-                logger.info(f"推荐#{i+1}: {p.get('name')} ({p.get('_score', 0):.1f}分) - {p.get('_recommendation_reason', '')}")
+                logger.info(f"推荐#{i+1}: {p.name} ({p.score:.1f}分) - {p.recommendation_reason}")
 
             return ranked_places[:6]  # 单场景增加到6个
 
 
-    def _calculate_distance(
-        self,
-        point1: Tuple[float, float],
-        point2: Tuple[float, float]
-    ) -> float:
-        lng1, lat1 = point1
-        lng2, lat2 = point2
-        x = (lng2 - lng1) * 85000 
-        y = (lat2 - lat1) * 111000 
-        return math.sqrt(x*x + y*y)
+    def _finalize_cluster_ranking(self, places: List[Place], cluster_count: int) -> List[List[Place]]:
+        """多中心模式的排序：各组候选一起排序并做多样性调整（同一品牌跨组也会扣分），
+        再按 place.cluster 各取前 CLUSTER_PLACES 个并生成推荐理由"""
+        ranked_places = sorted(places, key=lambda x: x.score, reverse=True)
+        ranked_places = self._apply_diversity_adjustment(ranked_places)
+        ranked_places = sorted(ranked_places, key=lambda x: x.score, reverse=True)
+
+        groups: List[List[Place]] = [[] for _ in range(cluster_count)]
+        for place in ranked_places:
+            group = groups[place.cluster]
+            if len(group) >= self.CLUSTER_PLACES:
+                continue
+            group.append(place)
+            place.recommendation_reason = place.llm_reason or self._generate_recommendation_reason(place, ranked_places)
+        for index, group in enumerate(groups):
+            logger.info(f"第{index + 1}组推荐: {[f'{p.name} ({p.score:.1f}分)' for p in group]}")
+        return groups
 
     def _cleanup_old_html_files(self, directory: str, max_files: int = 50):
         """清理旧的 HTML 文件，保留最新的 max_files 个"""
@@ -2205,14 +2844,15 @@ class CafeRecommender(BaseTool):
     async def _generate_html_page(
         self,
         locations: List[Dict],
-        places: List[Dict],
+        places: List[Place],
         center_point: Tuple[float, float],
         user_requirements: str,
         keywords: str,
         theme: str = "",
         fallback_used: bool = False,
         fallback_keyword: Optional[str] = None,
-        participant_locations: Optional[List[str]] = None
+        participant_locations: Optional[List[str]] = None,
+        clusters: Optional[List[Cluster]] = None
     ) -> str:
         file_name_prefix = "place"
 
@@ -2222,7 +2862,7 @@ class CafeRecommender(BaseTool):
 
         html_content = await self._generate_html_content(
             locations, places, center_point, user_requirements, keywords,
-            theme, fallback_used, fallback_keyword, participant_locations
+            theme, fallback_used, fallback_keyword, participant_locations, clusters
         )
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         unique_id = str(uuid.uuid4())[:8]
@@ -2243,15 +2883,17 @@ class CafeRecommender(BaseTool):
     async def _generate_html_content(
         self,
         locations: List[Dict],
-        places: List[Dict],
+        places: List[Place],
         center_point: Tuple[float, float],
         user_requirements: str,
         keywords: str,
         theme: str = "",
         fallback_used: bool = False,
         fallback_keyword: Optional[str] = None,
-        participant_locations: Optional[List[str]] = None
+        participant_locations: Optional[List[str]] = None,
+        clusters: Optional[List[Cluster]] = None
     ) -> str:
+        """clusters 不为空时为多中心模式：每组一个会面点标记，参与者与场所的距离均相对本组会面点"""
         # 根据主题参数确定配置
         if theme:
             # 主题映射：前端theme -> 后端配置key
@@ -2342,29 +2984,43 @@ class CafeRecommender(BaseTool):
 
         place_markers = [] 
         for place in places:
-            lng_str, lat_str = place.get("location", ",").split(",")
-            if lng_str and lat_str:
+            if place.lng is not None and place.lat is not None:
                 place_markers.append({
-                    "name": place["name"],
-                    "position": [float(lng_str), float(lat_str)],
+                    "name": place.name,
+                    "position": [place.lng, place.lat],
                     "icon": "place" 
                 })
 
-        center_marker = {
+        center_markers = [{
             "name": "最佳会面点",
             "position": [center_point[0], center_point[1]],
             "icon": "center"
-        }
-        all_markers = [center_marker] + location_markers + place_markers
+        }]
+        # 多中心模式：参与者所属组的会面点
+        location_centers = [center_point] * len(locations)
+        if clusters:
+            center_markers = []
+            for index, cluster in enumerate(clusters):
+                center_markers.append({
+                    "name": f"第{index+1}组会面点（{len(cluster.members)}人）",
+                    "position": [cluster.center[0], cluster.center[1]],
+                    "icon": "center"
+                })
+                for member in cluster.members:
+                    location_centers[member] = cluster.center
+        all_markers = center_markers + location_markers + place_markers
 
         location_rows_html = ""
         for idx, loc in enumerate(locations):
             location_rows_html += f"<tr><td>{idx+1}</td><td>{loc['name']}</td><td>{loc['formatted_address']}</td></tr>"
 
         location_distance_html = ""
-        for loc in locations:
-            distance = self._calculate_distance(center_point, (loc['lng'], loc['lat']))/1000
-            location_distance_html += f"<li><i class='bx bx-map'></i><strong>{loc['name']}</strong>: 距离中心点约 <span class='distance'>{distance:.1f} 公里</span></li>"
+        location_distances = [
+            haversine_m(center[0], center[1], loc['lng'], loc['lat'])
+            for loc, center in zip(locations, location_centers)
+        ] if clusters else distances_from(center_point, [(loc['lng'], loc['lat']) for loc in locations]).tolist()
+        for loc, distance in zip(locations, location_distances):
+            location_distance_html += f"<li><i class='bx bx-map'></i><strong>{loc['name']}</strong>: 距离{'本组会面点' if clusters else '中心点'}约 <span class='distance'>{distance / 1000:.1f} 公里</span></li>"
 
         # LLM 动态生成交通与停车建议 (带超时保护)
         if participant_locations is None:
@@ -2379,25 +3035,25 @@ class CafeRecommender(BaseTool):
             transport_tips_html = self._generate_default_transport_tips(keywords)
 
         place_cards_html = "" 
-        for place in places:
-            rating = place.get("biz_ext", {}).get("rating", "暂无评分")
-            address = place.get("address", "地址未知")
-            business_hours = place.get("business_hours", "营业时间未知")
-            if isinstance(business_hours, list) and business_hours:
-                business_hours = "; ".join(business_hours)
-            tel = place.get("tel", "电话未知")
+        if clusters:
+            place_distances = [place.distance if place.distance is not None else 0.0 for place in places]
+        else:
+            place_distances = distances_from(center_point, [(p.lng, p.lat) for p in places]).tolist()
+        for place, place_distance in zip(places, place_distances):
+            rating = place.rating_text or "暂无评分"
+            address = place.address or "地址未知"
+            business_hours = place.business_hours or "营业时间未知"
+            tel = place.tel or "电话未知"
             
-            tags = place.get("tag", [])
-            if isinstance(tags, str): tags = tags.split(";") if tags else []
-            elif not isinstance(tags, list): tags = []
+            tags = place.tag.split(";") if place.tag else []
             
             tags_html = "".join([f"<span class='cafe-tag'>{tg.strip()}</span>" for tg in tags if tg.strip()])
             if not tags_html:
                 tags_html = f"<span class='cafe-tag'>{cfg['noun_singular']}</span>"
 
             # 需求匹配置信度标签
-            matched_reqs = place.get("_matched_requirements", [])
-            confidence_map = place.get("_requirement_confidence", {})
+            matched_reqs = place.matched_requirements
+            confidence_map = place.requirement_confidence
             requirement_match_html = ""
             if matched_reqs:
                 match_tags = []
@@ -2421,17 +3077,16 @@ class CafeRecommender(BaseTool):
                             {"".join(match_tags)}
                         </div>'''
 
-            lng_str, lat_str = place.get("location",",").split(",")
             distance_text = "未知距离"
             map_link_coords = ""
-            if lng_str and lat_str:
-                lng, lat = float(lng_str), float(lat_str)
-                distance = self._calculate_distance(center_point, (lng, lat))
-                distance_text = f"{distance/1000:.1f} 公里"
-                map_link_coords = f"{lng},{lat}"
+            if place.lng is not None and place.lat is not None:
+                distance_text = f"{place_distance/1000:.1f} 公里"
+                if clusters and place.cluster is not None:
+                    distance_text = f"第{place.cluster + 1}组 · {distance_text}"
+                map_link_coords = f"{place.lng},{place.lat}"
 
             # 获取推荐理由
-            recommendation_reason = place.get("_recommendation_reason", "")
+            recommendation_reason = place.recommendation_reason
             reason_html = ""
             if recommendation_reason:
                 reason_html = f'''
@@ -2441,8 +3096,7 @@ class CafeRecommender(BaseTool):
                         </div>'''
 
             # 获取评分明细用于tooltip（可选展示）
-            score_breakdown = place.get("_score_breakdown", {})
-            total_score = place.get("_score", 0)
+            total_score = place.score
             score_title = f"综合评分: {total_score:.0f}/100"
 
             place_cards_html += f'''
@@ -2453,7 +3107,7 @@ class CafeRecommender(BaseTool):
                 <div class="cafe-content">
                     <div class="cafe-header">
                         <div>
-                            <h3 class="cafe-name">{place['name']}</h3>
+                            <h3 class="cafe-name">{place.name}</h3>
                         </div>
                         <span class="cafe-rating">评分: {rating}</span>
                     </div>{reason_html}
@@ -2479,7 +3133,7 @@ class CafeRecommender(BaseTool):
                             <i class='bx bx-walk'></i> {distance_text}
                         </div>
                         <div class="cafe-actions">
-                            <a href="https://uri.amap.com/marker?position={map_link_coords}&name={place['name']}" target="_blank">
+                            <a href="https://uri.amap.com/marker?position={map_link_coords}&name={place.name}" target="_blank">
                                 <i class='bx bx-navigation'></i>导航
                             </a>
                         </div>
@@ -3055,7 +3709,7 @@ class CafeRecommender(BaseTool):
             <div class="transportation-info">
                 <div class="transport-card">
                     <h3 class="transport-title"><i class='bx bx-trip'></i>前往方式</h3>
-                    <p>最佳会面点位于<span class="center-coords">{center_point[0]:.6f}, {center_point[1]:.6f}</span>附近</p>
+                    {f'<p>参与者分为 {len(clusters)} 组，各组成员前往本组会面点</p>' if clusters else f'<p>最佳会面点位于<span class="center-coords">{center_point[0]:.6f}, {center_point[1]:.6f}</span>附近</p>'}
                     <ul class="transport-list">{location_distance_html}</ul>
                 </div>
                 <div class="transport-card">
@@ -3108,7 +3762,7 @@ class CafeRecommender(BaseTool):
                 var labelText = '';
                 if (item.icon === 'center') {{
                     color = '#2ecc71';
-                    labelText = '最佳会面点';
+                    labelText = item.name;
                 }} else if (item.icon === 'location') {{
                     color = '#3498db';
                     // Extract location name from "地点N: XXX" format
@@ -3191,7 +3845,7 @@ class CafeRecommender(BaseTool):
     def _format_result_text(
         self,
         locations: List[Dict],
-        places: List[Dict],
+        places: List[Place],
         html_path: str,
         keywords: str,
         fallback_used: bool = False,
@@ -3213,9 +3867,9 @@ class CafeRecommender(BaseTool):
 
         result.append(f"### 推荐{cfg['noun_plural']}:")
         for i, place in enumerate(places):
-            rating = place.get("biz_ext", {}).get("rating", "暂无评分")
-            address = place.get("address", "地址未知")
-            result.append(f"{i+1}. **{place['name']}** (评分: {rating})")
+            rating = place.rating_text or "暂无评分"
+            address = place.address or "地址未知"
+            result.append(f"{i+1}. **{place.name}** (评分: {rating})")
             result.append(f"   地址: {address}")
             result.append("")
         
@@ -3225,13 +3879,53 @@ class CafeRecommender(BaseTool):
 
         return "\n".join(result)
 
+    def _format_cluster_result_text(
+        self,
+        locations: List[Dict],
+        clusters: List[Cluster],
+        groups: List[List[Place]],
+        html_path: str,
+        keywords: str
+    ) -> str:
+        """多中心模式的结果文本：按组列出成员、会面中心与推荐场所"""
+        primary_keyword = keywords.split("、")[0] if keywords else "场所"
+        cfg = self._get_place_config(primary_keyword)
+
+        result = [
+            f"## 已将{len(locations)}位参与者分为{len(clusters)}组，为每组推荐附近的{cfg['noun_plural']}",
+            "",
+        ]
+        for index, (cluster, places) in enumerate(zip(clusters, groups)):
+            names = "、".join(locations[i]["name"] for i in cluster.members[:5])
+            if len(cluster.members) > 5:
+                names += f" 等{len(cluster.members)}人"
+            result.append(
+                f"### 第{index+1}组（{len(cluster.members)}人，成员最远约 {cluster.max_distance / 1000:.1f} 公里）"
+            )
+            result.append(f"成员: {names}")
+            result.append(f"会面中心: ({cluster.center[0]:.4f}, {cluster.center[1]:.4f})")
+            if not places:
+                result.append(f"该组附近未找到符合条件的{cfg['noun_plural']}")
+            for i, place in enumerate(places):
+                rating = place.rating_text or "暂无评分"
+                address = place.address or "地址未知"
+                result.append(f"{i+1}. **{place.name}** (评分: {rating})")
+                result.append(f"   地址: {address}")
+            result.append("")
+
+        html_file_basename = os.path.basename(html_path)
+        result.append(f"HTML页面: {html_file_basename}")
+        result.append(f"可在浏览器中打开查看详细地图和{cfg['noun_plural']}信息。")
+
+        return "\n".join(result)
+
     def _generate_search_process(
         self,
         locations: List[Dict],
         center_point: Tuple[float, float],
         user_requirements: str,
         keywords: str,
-        places: List[Dict] = None  # 新增：传入推荐结果用于显示评分详情
+        places: List[Place] = None  # 新增：传入推荐结果用于显示评分详情
     ) -> str:
         primary_keyword = keywords.split("、")[0] if keywords else "场所"
         cfg = self._get_place_config(primary_keyword)
@@ -3373,11 +4067,11 @@ class CafeRecommender(BaseTool):
         if places and len(places) > 0:
             top_places_html = "<div class='ai-top-results'>"
             for idx, place in enumerate(places[:3]):
-                name = place.get('name', '未知')
-                total_score = place.get('_score', 0)
-                breakdown = place.get('_score_breakdown', {})
-                matched_reqs = place.get('_matched_requirements', [])
-                confidence_map = place.get('_requirement_confidence', {})
+                name = place.name or '未知'
+                total_score = place.score
+                breakdown = place.score_breakdown
+                matched_reqs = place.matched_requirements
+                confidence_map = place.requirement_confidence
 
                 # 评分详情
                 base = breakdown.get('base_score', 0)
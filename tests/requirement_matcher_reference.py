@@ -0,0 +1,174 @@
+"""
+需求匹配的旧实现与随机输入
+
+旧实现与改动前的 CafeRecommender._calculate_requirement_score 逐行一致（每个场所重建别名表与
+标签规则、逐个品牌子串查找），供 tests/test_requirement_matcher.py 的一致性检查与
+tools/bench_requirement_matcher.py 的微基准共用。
+"""
+import random
+from typing import Dict, List, Tuple
+
+from app.amap.place import Place
+from app.amap.requirement_matcher import (
+    BRAND_FEATURES,
+    LAYER_CONFIDENCE,
+    POI_MATCH_RULES,
+    REQUIREMENT_ALIASES,
+)
+
+
+# ---- 旧实现（与改动前的 CafeRecommender._calculate_requirement_score 逐行一致） ----
+
+def old_requirement_score(place: Place, user_requirements: str) -> Tuple[float, List[str], Dict[str, str]]:
+    if not user_requirements:
+        return 0, [], {}
+
+    requirement_aliases = {
+        "停车": ["停车", "车位", "停车场", "免费停车", "方便停车", "停车方便"],
+        "安静": ["安静", "环境好", "氛围", "静", "舒适", "环境安静"],
+        "商务": ["商务", "会议", "办公", "谈事", "工作"],
+        "交通": ["交通", "地铁", "公交", "方便", "交通便利"],
+        "包间": ["包间", "私密", "独立", "包厢", "有包间"],
+        "WiFi": ["wifi", "无线", "网络", "上网", "免费wifi"],
+        "可以久坐": ["久坐", "可以久坐", "坐着办公", "长时间"],
+        "适合儿童": ["儿童", "带娃", "亲子", "小孩", "适合儿童"],
+        "24小时营业": ["24小时", "通宵", "夜间", "凌晨"],
+    }
+
+    poi_match_rules = {
+        "停车": {
+            "check_fields": ["tag", "parking_type", "navi_poiid"],
+            "match_values": ["停车", "车位", "免费停车", "parking"]
+        },
+        "安静": {
+            "check_fields": ["tag"],
+            "match_values": ["安静", "环境", "氛围", "舒适", "优雅"]
+        },
+        "商务": {
+            "check_fields": ["tag", "type"],
+            "match_values": ["商务", "会议", "办公", "商务区"]
+        },
+        "交通": {
+            "check_fields": ["tag", "address"],
+            "match_values": ["地铁", "公交", "站", "枢纽"]
+        },
+        "包间": {
+            "check_fields": ["tag"],
+            "match_values": ["包间", "包厢", "私密", "独立房间"]
+        },
+        "WiFi": {
+            "check_fields": ["tag"],
+            "match_values": ["wifi", "无线", "免费WiFi", "网络"]
+        },
+    }
+
+    user_reqs = set()
+    user_requirements_lower = user_requirements.lower()
+    for req_name, aliases in requirement_aliases.items():
+        for alias in aliases:
+            if alias.lower() in user_requirements_lower:
+                user_reqs.add(req_name)
+                break
+
+    if not user_reqs:
+        return 0, [], {}
+
+    matched = []
+    confidence_map = {}
+    total_score = 0
+    place_name = place.name
+    place_type = place.type
+
+    for req_name in user_reqs:
+        if req_name in matched:
+            continue
+        if req_name not in poi_match_rules:
+            continue
+        rule = poi_match_rules[req_name]
+        for field in rule["check_fields"]:
+            field_value = str(getattr(place, field, "")).lower()
+            if any(mv.lower() in field_value for mv in rule["match_values"]):
+                matched.append(req_name)
+                confidence_map[req_name] = "high"
+                total_score += 4
+                break
+
+    for brand, features in BRAND_FEATURES.items():
+        if brand.startswith("_"):
+            continue
+        if brand in place_name:
+            for req_name in user_reqs:
+                if req_name in matched:
+                    continue
+                score = features.get(req_name, 0)
+                if score >= 0.7:
+                    matched.append(req_name)
+                    confidence_map[req_name] = "medium"
+                    total_score += 2
+            break
+
+    for type_key, features in BRAND_FEATURES.items():
+        if not type_key.startswith("_"):
+            continue
+        type_name = type_key[1:]
+        if type_name in place_type or type_name in place_name:
+            for req_name in user_reqs:
+                if req_name in matched:
+                    continue
+                score = features.get(req_name, 0)
+                if score >= 0.8:
+                    matched.append(req_name)
+                    confidence_map[req_name] = "low"
+                    total_score += 1
+            break
+
+    return min(10, total_score), matched, confidence_map
+
+
+# ---- 随机输入 ----
+
+BRANDS = [name for name in BRAND_FEATURES if not name.startswith("_")]
+TYPE_NAMES = [name[1:] for name in BRAND_FEATURES if name.startswith("_")]
+ALIASES = [alias for aliases in REQUIREMENT_ALIASES.values() for alias in aliases]
+MATCH_VALUES = [value for _, values in POI_MATCH_RULES.values() for value in values]
+FILLERS = ["店", "(", ")", "（朝阳店）", "路", "号", "广场", "咖啡", ";", " ", "a", "X", "中心", "旁"]
+AMAP_TYPES = ["餐饮服务;咖啡厅;咖啡厅", "餐饮服务;中餐厅;火锅店", "购物服务;商场;购物中心",
+              "科教文化服务;图书馆;图书馆", "住宿服务;宾馆酒店;五星级宾馆", "体育休闲服务;娱乐场所;KTV"]
+
+
+def case_variant(text: str, rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.15:
+        return text.upper()
+    if roll < 0.3:
+        return text.lower()
+    return text
+
+
+def fragment_text(rng: random.Random, pools: List[List[str]], max_parts: int) -> str:
+    parts = []
+    for _ in range(rng.randint(0, max_parts)):
+        pool = rng.choice(pools)
+        parts.append(case_variant(rng.choice(pool), rng))
+    return "".join(parts)
+
+
+def make_place(rng: random.Random) -> Place:
+    return Place(
+        name=fragment_text(rng, [BRANDS, BRANDS, TYPE_NAMES, FILLERS, ALIASES], 4),
+        type=rng.choice(AMAP_TYPES) if rng.random() < 0.6 else fragment_text(rng, [TYPE_NAMES, MATCH_VALUES, FILLERS], 3),
+        tag=fragment_text(rng, [MATCH_VALUES, ALIASES, FILLERS], 4),
+        address=fragment_text(rng, [MATCH_VALUES, FILLERS, TYPE_NAMES], 3),
+        parking_type=rng.choice(["", "", "地下停车场", "收费", "Parking", "免费"]),
+    )
+
+
+def make_requirements(rng: random.Random) -> str:
+    if rng.random() < 0.05:
+        return ""
+    return fragment_text(rng, [ALIASES, ALIASES, FILLERS, BRANDS], 4)
+
+
+def layered(matched: List[str], confidence: Dict[str, str]) -> bool:
+    levels = [LAYER_CONFIDENCE.index(confidence[req]) for req in matched]
+    return levels == sorted(levels)
@@ -0,0 +1,54 @@
+"""
+需求匹配一致性检查
+
+随机化的性质检查：场所名称、类型、标签、地址与用户需求由品牌名、类型名、需求别名、标签匹配值
+（含大小写变体）与随机字符拼接而成，逐条核对当前实现（app.amap.requirement_matcher）与旧实现的
+需求分、命中的需求及其置信度完全一致（旧实现的需求顺序取决于集合遍历顺序，只比较集合），并检查
+当前实现的命中列表按 high / medium / low 分层排列。
+"""
+import random
+
+import pytest
+
+from app.amap.place import Place
+from app.amap.requirement_matcher import REQUIREMENT_MATCHER
+from tests.requirement_matcher_reference import (
+    layered,
+    make_place,
+    make_requirements,
+    old_requirement_score,
+)
+
+CASES = 20000
+
+
+def assert_same(place: Place, requirements: str):
+    old_score, old_matched, old_confidence = old_requirement_score(place, requirements)
+    score, matched, confidence = REQUIREMENT_MATCHER.score(place, REQUIREMENT_MATCHER.parse(requirements))
+    case = f"{place.name!r} / {place.type!r} / {place.tag!r} / {place.address!r} 需求 {requirements!r}"
+    assert score == old_score, case
+    assert set(matched) == set(old_matched) and len(matched) == len(old_matched), case
+    assert confidence == old_confidence, case
+    assert layered(matched, confidence), case
+
+
+@pytest.mark.parametrize("seed", [7, 2024])
+def test_matches_old_implementation(seed):
+    rng = random.Random(seed)
+    matched_cases = 0
+    for _ in range(CASES):
+        place, requirements = make_place(rng), make_requirements(rng)
+        assert_same(place, requirements)
+        matched_cases += bool(old_requirement_score(place, requirements)[1])
+    # 随机输入要覆盖到有命中的情况，否则检查没有意义
+    assert matched_cases > CASES // 10
+
+
+@pytest.mark.parametrize("place, requirements", [
+    (Place(name="星巴克(国贸店)", type="餐饮服务;咖啡厅;咖啡厅", tag="免费WiFi;安静"), "安静 wifi 停车"),
+    (Place(name="海底捞火锅", type="餐饮服务;中餐厅;火锅店", address="地铁站旁"), "带娃 包间 交通方便"),
+    (Place(name="某某图书馆", type="科教文化服务;图书馆;图书馆", parking_type="地下停车场"), "停车 安静"),
+    (Place(name="咖啡店", type="", tag=""), ""),
+])
+def test_typical_places(place, requirements):
+    assert_same(place, requirements)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+地址匹配微基准
+
+对比地址增强、城市提示与输入建议三处文本匹配的旧实现（每次调用重建词表、逐词子串查找）
+与当前实现（导入时编译的 Aho-Corasick 自动机），并逐条核对两者结果一致。
+
+测试地址由 data/cities.json 的地标、高校群、商圈与高校简称组合而成，混入城市前缀、
+区县、门牌号、模糊词与纯城市名等常见输入。
+
+使用方法:
+    python tools/bench_address_matcher.py [--count 5000] [--repeat 5]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.amap.address_matcher import (  # noqa: E402
+    MAJOR_CITIES,
+    VAGUE_TERM_SUGGESTIONS,
+    PatternMatcher,
+    vague_terms_in,
+)
+from app.logger import logger  # noqa: E402
+from app.tool.meetspot_recommender import CafeRecommender  # noqa: E402
+
+DISTRICTS = ["朝阳区", "海淀区", "浦东新区", "天河区", "南山区", "西湖区", "鼓楼区", "武侯区"]
+SUFFIXES = ["", "地铁站", "附近", "购物中心", "广场", "大学", "医院", "公园", "火车站", "B座"]
+ALIASES = ["北大", "清华", "人大", "北师大", "复旦", "上交", "浙大", "中大", "华工", "华科"]
+
+
+# ---- 旧实现（与改动前的 CafeRecommender 方法逐行一致，仅去掉日志） ----
+
+def old_enhance_address(address: str) -> str:
+    if not address:
+        return address
+
+    normalized = address.strip()
+
+    alias_to_fullname: Dict[str, str] = {
+        "北大": "北京市海淀区北京大学",
+        "清华": "北京市海淀区清华大学",
+        "人大": "北京市海淀区中国人民大学",
+        "北师大": "北京市海淀区北京师范大学",
+        "复旦": "上海市杨浦区复旦大学",
+        "上交": "上海市闵行区上海交通大学",
+        "浙大": "浙江省杭州市浙江大学",
+        "中大": "广东省广州市中山大学",
+        "华工": "广东省广州市华南理工大学",
+        "华科": "湖北省武汉市华中科技大学",
+    }
+
+    mapped = alias_to_fullname.get(normalized)
+    if mapped:
+        return mapped
+
+    return normalized
+
+
+def old_extract_city_hint(locations: List[str]) -> str:
+    city_keywords = [
+        "北京", "上海", "广州", "深圳", "杭州", "南京", "武汉", "成都", "西安", "天津",
+        "重庆", "苏州", "长沙", "郑州", "济南", "青岛", "大连", "厦门", "福州", "昆明",
+    ]
+
+    votes: Dict[str, int] = {}
+    for loc in locations:
+        if not loc:
+            continue
+        full_loc = old_enhance_address(loc)
+        for city in city_keywords:
+            if city in loc or city in full_loc:
+                votes[city] = votes.get(city, 0) + 1
+
+    if not votes:
+        return ""
+
+    return max(votes, key=votes.get)
+
+
+def old_vague_suggestions(address: str) -> List[str]:
+    """旧 _get_address_suggestions 中模糊词与纯城市名两段"""
+    suggestions = []
+    vague_terms = {
+        "大学": "**请输入完整大学名称**，如 '北京大学'、'清华大学'、'复旦大学'",
+        "学校": "**请输入具体学校全名**，如 '北京市第一中学'、'上海交通大学附属中学'",
+        "医院": "**请输入完整医院名称**，如 '北京协和医院'、'上海华山医院'",
+        "商场": "**请输入具体商场名称**，如 '王府井百货大楼'、'上海环球港'",
+        "火车站": "**请输入完整站名**，如 '北京站'、'上海虹桥站'、'广州南站'",
+        "机场": "**请输入完整机场名称**，如 '北京首都国际机场'、'上海浦东国际机场'",
+        "公园": "**请输入具体公园名称**，如 '颐和园'、'中山公园'、'西湖公园'",
+        "广场": "**请输入具体广场名称**，如 '天安门广场'、'人民广场'",
+        "地铁站": "**请输入完整地铁站名**，如 '中关村地铁站'、'人民广场地铁站'",
+        "购物中心": "**请输入具体购物中心名称**，如 '北京apm'、'上海iapm'"
+    }
+    for term, suggestion in vague_terms.items():
+        if term in address:
+            suggestions.append(f"• {suggestion}")
+    major_cities = ["北京", "上海", "广州", "深圳", "杭州", "南京", "武汉", "成都", "西安", "天津"]
+    if address in major_cities:
+        suggestions.append("city")
+    return suggestions
+
+
+def new_vague_suggestions(address: str) -> List[str]:
+    """当前 _get_address_suggestions 中对应的两段"""
+    suggestions = [f"• {VAGUE_TERM_SUGGESTIONS[term]}" for term in vague_terms_in(address)]
+    if address in MAJOR_CITIES:
+        suggestions.append("city")
+    return suggestions
+
+
+# ---- 测试数据 ----
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def load_cities() -> List[Dict]:
+    with open(DATA_DIR / "cities.json", "r", encoding="utf-8") as fh:
+        return json.load(fh)["cities"]
+
+
+def full_vocabulary() -> List[str]:
+    """cities.json 的城市、地标、高校群、商圈与 address_aliases.json 的全部简称"""
+    words = []
+    for city in load_cities():
+        words.append(city["name"])
+        for field in ("landmarks", "university_clusters", "business_districts"):
+            words.extend(city.get(field, []))
+    with open(DATA_DIR / "address_aliases.json", "r", encoding="utf-8") as fh:
+        aliases = json.load(fh)
+    for section in ("university_aliases", "landmark_aliases"):
+        words.extend(aliases.get(section, {}))
+    return list(dict.fromkeys(words))
+
+
+def make_addresses(count: int, rng: random.Random) -> List[str]:
+    cities = load_cities()
+
+    places = []
+    for city in cities:
+        for field in ("landmarks", "university_clusters", "business_districts"):
+            places.extend((city["name"], name) for name in city.get(field, []))
+
+    addresses = []
+    for _ in range(count):
+        roll = rng.random()
+        city, place = rng.choice(places)
+        if roll < 0.1:
+            address = rng.choice(ALIASES)
+        elif roll < 0.15:
+            address = city
+        elif roll < 0.45:
+            address = f"{city}{place}{rng.choice(SUFFIXES)}"
+        elif roll < 0.7:
+            address = f"{city}市{rng.choice(DISTRICTS)}{place}{rng.randint(1, 300)}号"
+        else:
+            address = f"{place}{rng.choice(SUFFIXES)}"
+        if rng.random() < 0.05:
+            address = f" {address} "
+        addresses.append(address)
+    return addresses
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="地址匹配微基准")
+    parser.add_argument("--count", type=int, default=5000, help="测试地址数")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数（取最快一次）")
+    args = parser.parse_args()
+
+    logger.remove()
+    rng = random.Random(7)
+    addresses = make_addresses(args.count, rng)
+    groups = [addresses[i:i + rng.randint(2, 4)] for i in range(0, len(addresses), 3)]
+    recommender = CafeRecommender()
+
+    def suggestion_lines(address: str) -> List[str]:
+        text = recommender._get_address_suggestions(address)
+        vague = {f"• {suggestion}" for suggestion in VAGUE_TERM_SUGGESTIONS.values()}
+        return [line for line in text.split("\n") if line in vague]
+
+    # 结果一致性
+    mismatches = 0
+    for address in addresses:
+        if recommender._enhance_address(address) != old_enhance_address(address):
+            mismatches += 1
+        old = old_vague_suggestions(address)
+        if new_vague_suggestions(address) != old:
+            mismatches += 1
+        if suggestion_lines(address) != [s for s in old if s != "city"]:
+            mismatches += 1
+    for group in groups:
+        if recommender._extract_city_hint(group) != old_extract_city_hint(group):
+            mismatches += 1
+    print(f"地址数: {len(addresses)}，城市提示分组: {len(groups)}，结果不一致: {mismatches}")
+
+    cases = [
+        ("地址增强", lambda: [old_enhance_address(a) for a in addresses],
+         lambda: [recommender._enhance_address(a) for a in addresses], len(addresses)),
+        ("城市提示", lambda: [old_extract_city_hint(g) for g in groups],
+         lambda: [recommender._extract_city_hint(g) for g in groups], len(groups)),
+        ("模糊词检测", lambda: [old_vague_suggestions(a) for a in addresses],
+         lambda: [new_vague_suggestions(a) for a in addresses], len(addresses)),
+    ]
+    print(f"{'场景':<10}{'旧实现':>12}{'当前实现':>12}{'加速':>8}")
+    for label, old_fn, new_fn, n in cases:
+        old_t = timed(old_fn, args.repeat)
+        new_t = timed(new_fn, args.repeat)
+        print(f"{label:<10}{old_t / n * 1e6:>10.2f}µs{new_t / n * 1e6:>10.2f}µs{old_t / new_t:>7.1f}x")
+
+    # 词表规模：逐词子串查找随词数线性增长，自动机只与输入长度有关
+    vocabulary = full_vocabulary()
+    print(f"\n{'词表规模':<10}{'逐词查找':>12}{'自动机':>12}{'加速':>8}")
+    for size in (20, 100, len(vocabulary)):
+        words = vocabulary[:size]
+        matcher = PatternMatcher(words)
+        assert all(matcher.matches(a) == [w for w in matcher.patterns if w in a] for a in addresses)
+        old_t = timed(lambda: [[w for w in words if w in a] for a in addresses], args.repeat)
+        new_t = timed(lambda: [matcher.matches(a) for a in addresses], args.repeat)
+        n = len(addresses)
+        print(f"{size:<14}{old_t / n * 1e6:>10.2f}µs{new_t / n * 1e6:>10.2f}µs{old_t / new_t:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
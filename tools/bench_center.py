@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+中心点算法基准
+
+对比三人及以上时旧的经纬度平均与 app.amap.center 各目标的耗时与效果：
+- 总距离：所有人到中心的直线距离之和（median 最优）
+- 最远距离：离中心最远的人的距离（minimax 最优）
+
+参与者分布模拟同城聚会：若干人集中在一个区域，少数人住得较远。
+
+使用方法:
+    python tools/bench_center.py [--sizes 3,5,10,100,500] [--trials 200]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.amap.center import OBJECTIVES, compute_center, distances_m  # noqa: E402
+
+CITY_CENTER = (116.4074, 39.9042)
+
+
+def average_center(coordinates: List[Tuple[float, float]]) -> Tuple[float, float]:
+    """改动前三人及以上时的算法"""
+    avg_lng = sum(lng for lng, _ in coordinates) / len(coordinates)
+    avg_lat = sum(lat for _, lat in coordinates) / len(coordinates)
+    return (avg_lng, avg_lat)
+
+
+def make_group(size: int, rng: np.random.Generator) -> List[Tuple[float, float]]:
+    """约 80% 的人在 3km 范围内，其余分散在 25km 范围内"""
+    near = rng.normal(scale=0.03, size=(size, 2))
+    far = rng.normal(scale=0.25, size=(size, 2))
+    offsets = np.where(rng.random(size)[:, None] < 0.8, near, far)
+    points = np.asarray(CITY_CENTER) + offsets
+    return [(float(lng), float(lat)) for lng, lat in points]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="中心点算法基准")
+    parser.add_argument("--sizes", default="3,5,10,100,500", help="参与人数，逗号分隔")
+    parser.add_argument("--trials", type=int, default=200, help="每个人数的随机分组数")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    methods = [("average", average_center)] + [
+        (objective, lambda coords, objective=objective: compute_center(coords, objective))
+        for objective in OBJECTIVES
+    ]
+
+    print(f"{'人数':<6}{'算法':<10}{'耗时':>10}{'总距离':>12}{'最远距离':>12}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        groups = [make_group(size, rng) for _ in range(args.trials)]
+        baseline_sum = baseline_max = None
+        for label, fn in methods:
+            start = time.perf_counter()
+            centers = [fn(group) for group in groups]
+            elapsed = (time.perf_counter() - start) / len(groups)
+            total = np.mean([distances_m(c, g).sum() for c, g in zip(centers, groups)])
+            worst = np.mean([distances_m(c, g).max() for c, g in zip(centers, groups)])
+            if baseline_sum is None:
+                baseline_sum, baseline_max = total, worst
+            print(
+                f"{size:<8}{label:<10}{elapsed * 1e6:>8.1f}µs"
+                f"{total / baseline_sum:>11.1%}{worst / baseline_max:>13.1%}"
+            )
+    print("\n总距离、最远距离以 average 为 100%，越低越好")
+
+
+if __name__ == "__main__":
+    main()
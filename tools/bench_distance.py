@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+距离计算基准
+
+1. 耗时：场所 × 参与者（默认 1000 × 20）距离矩阵，对比
+   - 旧实现：逐对调用固定系数的平面近似（经度 1 度按 85km）
+   - 标量 haversine：逐对调用 app.amap.distance.haversine_m
+   - 向量化：app.amap.distance.distance_matrix
+2. 误差：旧近似在不同纬度城市相对 haversine 的偏差（东西向 5km）
+
+使用方法:
+    python tools/bench_distance.py [--rows 1000] [--cols 20] [--repeat 5]
+"""
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.amap.distance import distance_matrix  # noqa: E402
+from app.amap.distance import haversine_m  # noqa: E402
+
+CITIES = [("广州", 113.2644, 23.1291), ("上海", 121.4737, 31.2304),
+          ("北京", 116.4074, 39.9042), ("哈尔滨", 126.5349, 45.8038)]
+
+
+def old_distance(point1: Tuple[float, float], point2: Tuple[float, float]) -> float:
+    """改动前的 CafeRecommender._calculate_distance"""
+    lng1, lat1 = point1
+    lng2, lat2 = point2
+    x = (lng2 - lng1) * 85000
+    y = (lat2 - lat1) * 111000
+    return math.sqrt(x * x + y * y)
+
+
+def loop_matrix(fn: Callable, rows: List[Tuple[float, float]], cols: List[Tuple[float, float]]) -> np.ndarray:
+    return np.array([[fn(a, b) for b in cols] for a in rows])
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="距离计算基准")
+    parser.add_argument("--rows", type=int, default=1000, help="场所数")
+    parser.add_argument("--cols", type=int, default=20, help="参与者数")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数（取最快一次）")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    _, lng0, lat0 = CITIES[2]
+    rows = [(lng0 + dx, lat0 + dy) for dx, dy in rng.normal(scale=0.05, size=(args.rows, 2))]
+    cols = [(lng0 + dx, lat0 + dy) for dx, dy in rng.normal(scale=0.05, size=(args.cols, 2))]
+
+    def scalar_haversine(a, b):
+        return haversine_m(a[0], a[1], b[0], b[1])
+
+    expected = loop_matrix(scalar_haversine, rows, cols)
+    assert np.allclose(distance_matrix(rows, cols), expected, rtol=1e-9, atol=1e-6)
+
+    cases = [
+        ("旧实现(循环)", lambda: loop_matrix(old_distance, rows, cols)),
+        ("haversine(循环)", lambda: loop_matrix(scalar_haversine, rows, cols)),
+        ("distance_matrix", lambda: distance_matrix(rows, cols)),
+    ]
+    print(f"{args.rows} x {args.cols} 距离矩阵")
+    baseline = None
+    for label, fn in cases:
+        elapsed = timed(fn, args.repeat)
+        baseline = baseline or elapsed
+        print(f"  {label:<18}{elapsed * 1e3:>9.2f}ms{baseline / elapsed:>8.1f}x")
+
+    print("\n旧近似的误差（东西向 5km）")
+    for name, lng, lat in CITIES:
+        dlng = 5000 / (haversine_m(lng, lat, lng + 1, lat))
+        true = haversine_m(lng, lat, lng + dlng, lat)
+        approx = old_distance((lng, lat), (lng + dlng, lat))
+        print(f"  {name:<6}{lat:>6.1f}°N  {approx:>7.0f}m  {(approx - true) / true:>+7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Place 记录内存基准
+
+对比排序流水线在两种候选表示下的单次请求内存峰值：
+- dict：复制高德 POI 字典，评分结果以 `_score`、`_distance` 等键写回字典（旧流水线）
+- Place：解析为 app.amap.place.Place，评分结果写入槽位（当前流水线）
+
+候选来源分别取 extensions=all 的完整高德 POI 与 POI 索引中的精简记录，
+规模按多场景搜索（3 个关键词 × 75 个候选）构造。
+
+使用方法:
+    python tools/bench_place_memory.py [--candidates 75] [--keywords 3]
+"""
+import argparse
+import json
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.amap.place import Place  # noqa: E402
+from app.amap.poi_index import compact_poi  # noqa: E402
+
+CENTER = (116.4074, 39.9042)
+
+
+def make_amap_poi(i: int, rng: random.Random) -> Dict[str, Any]:
+    """构造一条接近真实 extensions=all 响应的 POI（经 JSON 往返，字符串对象与线上一致）"""
+    lng = CENTER[0] + rng.uniform(-0.03, 0.03)
+    lat = CENTER[1] + rng.uniform(-0.03, 0.03)
+    poi = {
+        "id": f"B0FFG{i:05d}",
+        "parent": [],
+        "childtype": [],
+        "name": f"示例咖啡馆({rng.choice(['国贸', '三里屯', '望京', '中关村'])}店){i}",
+        "type": "餐饮服务;咖啡厅;咖啡厅",
+        "typecode": "050500",
+        "biz_type": "diner",
+        "address": f"朝阳区建国路{rng.randint(1, 300)}号{rng.randint(1, 20)}层{rng.randint(100, 999)}室",
+        "location": f"{lng:.6f},{lat:.6f}",
+        "tel": f"010-{rng.randint(10000000, 99999999)};{rng.randint(13000000000, 13999999999)}",
+        "postcode": [],
+        "website": [],
+        "email": [],
+        "pcode": "110000",
+        "pname": "北京市",
+        "citycode": "010",
+        "cityname": "北京市",
+        "adcode": "110105",
+        "adname": "朝阳区",
+        "importance": [],
+        "shopid": [],
+        "shopinfo": "0",
+        "poiweight": [],
+        "gridcode": str(rng.randint(5900000000, 5999999999)),
+        "distance": str(rng.randint(50, 3000)),
+        "navi_poiid": f"J50F{rng.randint(100000, 999999)}_{i}",
+        "entr_location": f"{lng + 0.0001:.6f},{lat + 0.0001:.6f}",
+        "business_area": rng.choice(["国贸", "三里屯", "望京", "中关村"]),
+        "exit_location": [],
+        "match": "0",
+        "recommend": "0",
+        "timestamp": "2024-05-01 12:00:00",
+        "alias": [],
+        "indoor_map": "0",
+        "indoor_data": {"cpid": [], "floor": [], "truefloor": [], "cmsid": []},
+        "groupbuy_num": "0",
+        "discount_num": "0",
+        "biz_ext": {
+            "rating": f"{rng.uniform(3.5, 5.0):.1f}",
+            "cost": str(rng.randint(25, 120)),
+            "meal_ordering": "0",
+            "seat_ordering": "0",
+            "ticket_ordering": "0",
+            "hotel_ordering": "0",
+            "review_count": str(rng.randint(0, 5000)),
+            "open_time": "08:00-22:00",
+        },
+        "event": [],
+        "children": [],
+        "photos": [
+            {
+                "title": [],
+                "url": f"http://store.is.autonavi.com/showpic/{rng.getrandbits(128):032x}",
+                "provider": [],
+            }
+            for _ in range(rng.randint(1, 6))
+        ],
+        "tag": "拿铁,手冲,免费wifi,可久坐",
+        "business_hours": "08:00-22:00",
+        "parking_type": rng.choice(["", "免费", "收费"]),
+    }
+    return json.loads(json.dumps(poi, ensure_ascii=False))
+
+
+def score_dict(place: Dict[str, Any], rng: random.Random) -> None:
+    """按旧流水线写入的评分键注解字典"""
+    place["_source_keyword"] = "咖啡馆"
+    place["_raw_rating"] = float(place.get("biz_ext", {}).get("rating") or 3.5)
+    place["_has_rating"] = True
+    place["_review_count"] = int(place.get("biz_ext", {}).get("review_count") or 0)
+    place["_photo_count"] = len(place.get("photos", []))
+    place["_distance"] = rng.uniform(50, 3000)
+    place["_matched_scenario"] = "咖啡馆"
+    place["_matched_requirements"] = ["WiFi"]
+    place["_requirement_confidence"] = {"WiFi": "high"}
+    place["_score"] = rng.uniform(40, 95)
+    place["_score_breakdown"] = {
+        "base": 27.0, "popularity": 15.2, "distance": 21.3, "scenario": 15.0, "requirement": 4.0,
+    }
+    place["_recommendation_reason"] = "位置便利，约650米；口碑极佳，评分4.7"
+
+
+def score_place(place: Place, rng: random.Random) -> None:
+    """与 score_dict 写入同样的评分结果"""
+    place.source_keyword = "咖啡馆"
+    place.raw_rating = place.rating or 3.5
+    place.has_rating = True
+    place.distance = rng.uniform(50, 3000)
+    place.matched_scenario = "咖啡馆"
+    place.matched_requirements = ["WiFi"]
+    place.requirement_confidence = {"WiFi": "high"}
+    place.score = rng.uniform(40, 95)
+    place.score_breakdown = {
+        "base": 27.0, "popularity": 15.2, "distance": 21.3, "scenario": 15.0, "requirement": 4.0,
+    }
+    place.recommendation_reason = "位置便利，约650米；口碑极佳，评分4.7"
+
+
+def run_dict(pois: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    rng = random.Random(1)
+    places = []
+    for poi in pois:
+        place = dict(poi)
+        score_dict(place, rng)
+        places.append(place)
+    return places
+
+
+def run_place(pois: List[Dict[str, Any]]) -> List[Place]:
+    rng = random.Random(1)
+    places = []
+    for poi in pois:
+        place = Place.from_amap(poi)
+        score_place(place, rng)
+        places.append(place)
+    return places
+
+
+def measure(fn: Callable[[List[Dict[str, Any]]], Any], pois: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """返回 (峰值字节, 结束时仍持有的字节)；输入 POI 在测量前已存在，不计入"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    result = fn(pois)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak - base, current - base
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Place 记录内存基准")
+    parser.add_argument("--candidates", type=int, default=75, help="每个关键词的候选数")
+    parser.add_argument("--keywords", type=int, default=3, help="并发搜索的关键词数")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    count = args.candidates * args.keywords
+    raw = [make_amap_poi(i, rng) for i in range(count)]
+    compact = [compact_poi(poi) for poi in raw]
+
+    print(f"候选数: {count} ({args.keywords} 个关键词 × {args.candidates})")
+    print(f"{'来源':<10}{'表示':<8}{'峰值':>12}{'持有':>12}{'每条':>10}")
+    for source, pois in (("完整POI", raw), ("索引记录", compact)):
+        results = {}
+        for label, fn in (("dict", run_dict), ("Place", run_place)):
+            peak, retained = measure(fn, pois)
+            results[label] = peak
+            print(f"{source:<10}{label:<8}{peak / 1024:>10.1f}KB{retained / 1024:>10.1f}KB{retained / count:>9.0f}B")
+        saved = 1 - results["Place"] / results["dict"]
+        print(f"{source:<10}峰值下降 {saved:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+场所评分基准
+
+对比 V2 多维度评分的两种实现（默认 20 / 200 / 2000 个候选）：
+- 逐个：改动前的 CafeRecommender._score_place，每个场所依次调用五个评分函数
+- 列式：CafeRecommender._score_places（app.amap.place_scores），一批场所整理为 NumPy 列后一次算出
+
+两种实现的评分明细与排序须完全一致，总分只允许浮点舍入误差（NumPy 的 log10 / 幂运算
+与 math 模块可能相差最后一位）；分别统计有/无用户需求时的耗时
+（需求匹配为逐个场所的字符串匹配，两种实现共用）。
+
+使用方法:
+    python tools/bench_place_scoring.py [--sizes 20,200,2000] [--repeat 5]
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.amap.place import Place  # noqa: E402
+from app.logger import logger  # noqa: E402
+from app.tool.meetspot_recommender import CafeRecommender  # noqa: E402
+
+CENTER = (116.4074, 39.9042)
+KEYWORDS = "咖啡馆 餐厅"
+BRANDS = ["星巴克", "瑞幸", "Costa", "漫咖啡", "海底捞", "示例"]
+TAGS = ["安静;环境优雅", "免费停车", "wifi;可以久坐", "包间", "", "地铁站附近"]
+TYPES = ["餐饮服务;咖啡厅;咖啡厅", "餐饮服务;中餐厅;火锅店", "购物服务;商场"]
+
+
+def make_places(count: int, rng: random.Random) -> List[Place]:
+    places = []
+    for i in range(count):
+        located = rng.random() > 0.03
+        lng = CENTER[0] + rng.uniform(-0.04, 0.04) if located else None
+        lat = CENTER[1] + rng.uniform(-0.04, 0.04) if located else None
+        places.append(Place(
+            name=f"{rng.choice(BRANDS)}({i}店)",
+            location=f"{lng},{lat}" if located else "",
+            lng=lng,
+            lat=lat,
+            id=f"B0{i:06d}",
+            type=rng.choice(TYPES),
+            address=rng.choice(["朝阳区建国路", "海淀区地铁站旁", "东城区"]),
+            tag=rng.choice(TAGS),
+            rating=rng.choice([0.0, 3.8, 4.2, 4.5, 4.9, 5.0]),
+            review_count=rng.choice([0, 3, 120, 880, 5400]),
+            photo_count=rng.randint(0, 3),
+            source_keyword=rng.choice(["咖啡馆", "餐厅", ""]),
+            transit_time=rng.choice([None, None, 900.0, 2600.0, 4000.0]),
+        ))
+    return places
+
+
+def copy_places(places: List[Place]) -> List[Place]:
+    return [Place(**{slot: getattr(p, slot) for slot in Place.__slots__}) for p in places]
+
+
+# ========== 改动前的逐个评分（参照实现） ==========
+
+def old_base_score(place: Place) -> Tuple[float, float]:
+    rating = place.rating
+    if rating == 0:
+        rating = 3.5
+        place.has_rating = False
+    else:
+        place.has_rating = True
+    return min(rating, 5) * 6, rating
+
+
+def old_popularity_score(place: Place) -> float:
+    review_score = math.log10(place.review_count + 1) * 5 if place.review_count > 0 else 0
+    return min(20, review_score + min(place.photo_count * 2, 6))
+
+
+def old_distance_score(recommender: CafeRecommender, place: Place, center_point) -> float:
+    if place.lng is None or place.lat is None:
+        return 0
+    distance = recommender._place_distance(place, center_point)
+    if place.transit_time is not None:
+        return 25 - 20 * min(1.0, max(0.0, (place.transit_time - 1200) / 2400))
+    if distance <= 500:
+        return 25
+    if distance <= 2500:
+        return 25 * (1 - ((distance - 500) / 2000) ** 1.5 * 0.8)
+    return 5
+
+
+def old_score_place(recommender: CafeRecommender, place: Place, center_point, user_requirements, keywords) -> float:
+    base_score, place.raw_rating = old_base_score(place)
+    popularity_score = old_popularity_score(place)
+    distance_score = old_distance_score(recommender, place, center_point)
+    scenario_score, place.matched_scenario = recommender._calculate_scenario_match_score(place, keywords)
+    requirement_score, place.matched_requirements, place.requirement_confidence = \
+        recommender._calculate_requirement_score(place, user_requirements)
+    place.score = base_score + popularity_score + distance_score + scenario_score + requirement_score
+    place.score_breakdown = {
+        "base": round(base_score, 1),
+        "popularity": round(popularity_score, 1),
+        "distance": round(distance_score, 1),
+        "scenario": round(scenario_score, 1),
+        "requirement": round(requirement_score, 1),
+    }
+    return place.score
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="场所评分基准")
+    parser.add_argument("--sizes", default="20,200,2000", help="逗号分隔的候选数")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数（取最快一次）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+    logger.remove()
+
+    recommender = CafeRecommender()
+    rng = random.Random(args.seed)
+    print(f"{'候选数':>6}  {'用户需求':<10}{'逐个':>10}{'列式':>10}{'加速':>8}")
+    for size in (int(s) for s in args.sizes.split(",") if s):
+        template = make_places(size, rng)
+        recommender._assign_distances(template, CENTER)
+        for requirements in ("", "安静 停车 wifi"):
+            old, new = copy_places(template), copy_places(template)
+            for place in old:
+                old_score_place(recommender, place, CENTER, requirements, KEYWORDS)
+            recommender._score_places(new, CENTER, requirements, KEYWORDS)
+            for a, b in zip(old, new):
+                assert math.isclose(a.score, b.score, rel_tol=0, abs_tol=1e-9), (a.name, a.score, b.score)
+                assert a.score_breakdown == b.score_breakdown, (a.name, a.score_breakdown, b.score_breakdown)
+                assert (a.raw_rating, a.has_rating, a.matched_scenario) == (b.raw_rating, b.has_rating, b.matched_scenario)
+                assert a.matched_requirements == b.matched_requirements
+            order = sorted(range(size), key=lambda i: (-round(old[i].score, 9), i))
+            assert order == sorted(range(size), key=lambda i: (-round(new[i].score, 9), i))
+
+            def run_old():
+                for place in old:
+                    old_score_place(recommender, place, CENTER, requirements, KEYWORDS)
+
+            elapsed_old = timed(run_old, args.repeat)
+            elapsed_new = timed(lambda: recommender._score_places(new, CENTER, requirements, KEYWORDS), args.repeat)
+            print(
+                f"{size:>8}  {requirements or '（无）':<10}{elapsed_old * 1e3:>8.2f}ms"
+                f"{elapsed_new * 1e3:>8.2f}ms{elapsed_old / elapsed_new:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+需求匹配微基准
+
+对比三层需求匹配的旧实现（每个场所重建别名表与标签规则、逐个品牌子串查找）与当前实现
+（app.amap.requirement_matcher：导入时编译的索引，用户需求每个请求解析一次）的单个场所耗时。
+两者结果一致由 tests/test_requirement_matcher.py 检查。
+
+使用方法:
+    python tools/bench_requirement_matcher.py [--places 2000] [--repeat 5] [--seed 7]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.amap.requirement_matcher import REQUIREMENT_MATCHER  # noqa: E402
+from app.logger import logger  # noqa: E402
+from tests.requirement_matcher_reference import make_place, old_requirement_score  # noqa: E402
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="需求匹配微基准")
+    parser.add_argument("--places", type=int, default=2000, help="基准中每个请求的候选数")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数（取最快一次）")
+    parser.add_argument("--seed", type=int, default=7, help="随机种子")
+    args = parser.parse_args()
+
+    logger.remove()
+    rng = random.Random(args.seed)
+
+    # 微基准：一个请求的全部候选，用户需求固定
+    places = [make_place(rng) for _ in range(args.places)]
+    print(f"{'用户需求':<14}{'旧实现':>12}{'当前实现':>12}{'加速':>8}")
+    for requirements in ("安静", "安静 停车 wifi", "带娃 包间 24小时 商务会议 地铁方便"):
+        def run_new():
+            query = REQUIREMENT_MATCHER.parse(requirements)
+            return [REQUIREMENT_MATCHER.score(p, query) for p in places]
+
+        old_t = timed(lambda: [old_requirement_score(p, requirements) for p in places], args.repeat)
+        new_t = timed(run_new, args.repeat)
+        n = len(places)
+        print(f"{requirements:<14}{old_t / n * 1e6:>10.2f}µs{new_t / n * 1e6:>10.2f}µs{old_t / new_t:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+智能中心点搜索基准
+
+在模拟城市（成簇分布的目标场所、沿线路分布的地铁站、均匀分布的公交站）上对比：
+- fixed：改动前的固定 7x7 网格（几何中心周围 1.5km），逐个完整评估
+- fixed+prune：固定网格 + 公平性上界剪枝
+- adaptive：CafeRecommender._calculate_smart_center（粗网格与固定网格 + 逐级加密 + 剪枝），逐个候选搜索
+- adaptive+area：同上，密度与交通计数先用以几何中心为圆心的区域取数在本地计算
+
+统计每次请求的候选评估次数、周边搜索请求数（含区域取数，不计网格缓存）与最优中心点评分。
+搜索由本地模拟数据应答，不访问高德。
+
+使用方法:
+    python tools/bench_smart_center.py [--requests 200] [--seed 7]
+"""
+import argparse
+import asyncio
+import math
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.amap.distance import haversine_m  # noqa: E402
+from app.logger import logger  # noqa: E402
+from app.tool.meetspot_recommender import CafeRecommender  # noqa: E402
+
+CITY_CENTER = (116.4074, 39.9042)
+M_PER_DEG_LAT = 111000.0
+M_PER_DEG_LNG = 111000.0 * math.cos(math.radians(CITY_CENTER[1]))
+
+# 参与者分布：(名称, 散布标准差 m)
+SPREADS = [("tight", 800), ("city", 3000), ("spread", 8000)]
+
+WORLD: Dict[str, np.ndarray] = {}
+
+
+def make_world(rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """各类 POI 在以城市中心为原点的平面坐标（米）"""
+    hubs = rng.normal(scale=6000, size=(40, 2))
+    cafes = hubs[rng.integers(len(hubs), size=4000)] + rng.normal(scale=600, size=(4000, 2))
+    lines = []
+    for angle in rng.uniform(0, math.pi, size=8):
+        t = np.arange(-15000, 15000, 1200.0)
+        offset = rng.normal(scale=3000, size=2)
+        lines.append(np.stack([t * math.cos(angle), t * math.sin(angle)], axis=1) + offset)
+    subway = np.concatenate(lines)
+    bus = rng.uniform(-20000, 20000, size=(6000, 2))
+    return {"cafe": cafes, "地铁站": subway, "公交站": bus}
+
+
+def to_xy(lng: float, lat: float) -> np.ndarray:
+    return np.array([(lng - CITY_CENTER[0]) * M_PER_DEG_LNG, (lat - CITY_CENTER[1]) * M_PER_DEG_LAT])
+
+
+class SimulatedRecommender(CafeRecommender):
+    """_search_pois / _fetch_pois 由模拟 POI 应答并计数"""
+
+    searches: int = 0
+
+    async def _search_pois(self, location: str, keywords: str, radius: int = 2000,
+                           types: str = "", offset: int = 20) -> List[Dict]:
+        return await self._fetch_pois(location, keywords, radius, types, offset)
+
+    async def _fetch_pois(self, location: str, keywords: str, radius: int, types: str,
+                          offset: int, page: int = 1) -> List[Dict]:
+        """按距离升序分页返回，与高德周边搜索一致"""
+        self.searches += 1
+        lng, lat = map(float, location.split(","))
+        points = WORLD.get(keywords, WORLD["cafe"])
+        dist = np.hypot(*(points - to_xy(lng, lat)).T)
+        inside = np.flatnonzero(dist <= radius)
+        ranked = inside[np.argsort(dist[inside], kind="stable")][(page - 1) * offset:page * offset]
+        return [
+            {
+                "id": f"{keywords}{i}",
+                "location": f"{CITY_CENTER[0] + points[i, 0] / M_PER_DEG_LNG:.6f},"
+                            f"{CITY_CENTER[1] + points[i, 1] / M_PER_DEG_LAT:.6f}",
+                "distance": str(int(dist[i])),
+            }
+            for i in ranked
+        ]
+
+
+def make_group(rng: np.random.Generator, spread: float) -> List[Tuple[float, float]]:
+    size = int(rng.integers(2, 7))
+    origin = rng.normal(scale=4000, size=2)
+    xy = origin + rng.normal(scale=spread, size=(size, 2))
+    return [(CITY_CENTER[0] + x / M_PER_DEG_LNG, CITY_CENTER[1] + y / M_PER_DEG_LAT) for x, y in xy]
+
+
+async def fixed_grid(recommender: SimulatedRecommender, coords, prune: bool) -> Tuple[float, int]:
+    """改动前的固定网格，prune=True 时按公平性上界剪枝；返回 (最优评分, 评估次数)"""
+    geo_center = recommender._calculate_center_point(coords)
+    candidates = recommender._generate_candidate_points(geo_center, radius_km=1.5, grid_size=3)
+    candidates.sort(key=lambda point: haversine_m(*geo_center, *point))
+    candidates.insert(0, geo_center)
+    fairness = [recommender._center_fairness(c, coords) for c in candidates]
+    order = sorted(range(len(candidates)), key=lambda i: -fairness[i][0]) if prune else range(len(candidates))
+    best, evaluated = -1.0, 0
+    for index in order:
+        if prune and fairness[index][0] + recommender.CENTER_SEARCH_SCORE_MAX <= best:
+            continue
+        score, _ = await recommender._evaluate_center_candidate(
+            candidates[index], coords, "cafe", fairness=fairness[index]
+        )
+        evaluated += 1
+        best = max(best, score)
+    return best, evaluated
+
+
+async def run(args) -> None:
+    rng = np.random.default_rng(args.seed)
+    WORLD.update(make_world(rng))
+    recommender = SimulatedRecommender()
+    recommender.SMART_CENTER_BUDGET = 1e9
+
+    print(f"{'分布':<8}{'方法':<16}{'评估/请求':>10}{'搜索/请求':>10}{'平均评分':>10}{'不低于fixed':>12}")
+    for label, spread in SPREADS:
+        groups = [make_group(rng, spread) for _ in range(args.requests)]
+        rows = {}
+        for method in ("fixed", "fixed+prune", "adaptive", "adaptive+area"):
+            scores, evaluations = [], 0
+            recommender.searches = 0
+            recommender.SMART_CENTER_AREA_FETCH = method == "adaptive+area"
+            for coords in groups:
+                if method.startswith("adaptive"):
+                    _, details = await recommender._calculate_smart_center(coords, "cafe")
+                    scores.append(details["best_score"])
+                    evaluations += details["evaluated"]
+                else:
+                    score, evaluated = await fixed_grid(recommender, coords, prune=method == "fixed+prune")
+                    scores.append(score)
+                    evaluations += evaluated
+            rows[method] = np.array(scores)
+            not_worse = np.mean(rows[method] >= rows["fixed"] - 1e-9)
+            print(
+                f"{label:<10}{method:<17}{evaluations / len(groups):>9.1f}"
+                f"{recommender.searches / len(groups):>11.1f}{np.mean(scores):>11.2f}{not_worse:>12.0%}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="智能中心点搜索基准")
+    parser.add_argument("--requests", type=int, default=200, help="每种分布的请求数")
+    parser.add_argument("--seed", type=int, default=7, help="随机种子")
+    args = parser.parse_args()
+    logger.remove()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
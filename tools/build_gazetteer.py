@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+离线地名表生成工具
+
+从持久化地理编码缓存（geocode_cache 表）导出命中最多的地址，与现有
+data/gazetteer.json 合并后写回。简称映射取自 data/address_aliases.json，
+坐标离所属城市中心（data/cities.json）过远的缓存结果会被丢弃。
+
+发布前在生产库上运行，使最常用的地址随应用发布、不再访问网络。
+--refresh-existing 用高德 POI 文本检索（限定记录所在城市）重新解析表中已有的地点，
+需要 config.toml 中的高德 Key。
+
+使用方法:
+    python tools/build_gazetteer.py [--min-hits 3] [--limit 5000] [--output data/gazetteer.json] [--dry-run]
+    python tools/build_gazetteer.py --refresh-existing
+    DATABASE_URL=sqlite+aiosqlite:///path/to/meetspot.db python tools/build_gazetteer.py
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.amap.gazetteer import (  # noqa: E402
+    DEFAULT_PATH,
+    Gazetteer,
+    load_city_centers,
+    plausible,
+    record_from_result,
+)
+from app.amap.client import close_amap_client  # noqa: E402
+from app.db import crud  # noqa: E402
+from app.db.database import AsyncSessionLocal, init_db  # noqa: E402
+
+
+async def refresh_existing(gazetteer: Gazetteer, city_centers) -> int:
+    """重新解析地名表中已有的地点，返回更新条数；解析失败或不可信的保留原记录"""
+    from app.config import config
+    from app.tool.meetspot_recommender import CafeRecommender
+
+    recommender = CafeRecommender()
+    recommender.api_key = config.amap.api_key
+    updated = 0
+    try:
+        for key, record in gazetteer.items():
+            result = await recommender._geocode_via_poi(key, city_hint=record[2])
+            fresh = record_from_result(result) if result else None
+            if fresh is None or not plausible(fresh, city_centers):
+                print(f"  保留原记录: {key}")
+                continue
+            gazetteer.add(key, fresh)
+            updated += 1
+    finally:
+        await close_amap_client()
+    return updated
+
+
+async def build(args) -> int:
+    output = Path(args.output)
+    gazetteer = Gazetteer.load(output)
+    before = len(gazetteer)
+
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        entries = await crud.list_hot_geocode_entries(session, datetime.utcnow(), args.limit)
+
+    city_centers = load_city_centers()
+    added = updated = rejected = 0
+    for entry in entries:
+        if entry.hits < args.min_hits:
+            continue
+        record = record_from_result(json.loads(entry.payload_json))
+        if record is None or not plausible(record, city_centers):
+            rejected += 1
+            print(f"  跳过: {entry.address_key} ({record[2] if record else '坐标无效'})")
+            continue
+        if entry.address_key not in gazetteer:
+            added += 1
+        else:
+            updated += 1
+        gazetteer.add(entry.address_key, record)
+
+    print(f"缓存热门地址: {len(entries)} 条（命中 >= {args.min_hits} 次才收录）")
+    print(f"地名表: {before} -> {len(gazetteer)} 条（新增 {added}，更新 {updated}，丢弃 {rejected}）")
+    if args.refresh_existing:
+        refreshed = await refresh_existing(gazetteer, city_centers)
+        print(f"重新解析: {refreshed}/{len(gazetteer)} 条已按高德结果更新")
+    if args.dry_run:
+        print("dry-run：未写入文件")
+        return 0
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(gazetteer.to_payload(), fh, ensure_ascii=False, separators=(",", ":"))
+        fh.write("\n")
+    print(f"已写入 {output}（{output.stat().st_size / 1024:.1f}KB）")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="从持久化地理编码缓存生成离线地名表")
+    parser.add_argument("--min-hits", type=int, default=3, help="收录所需的最少命中次数")
+    parser.add_argument("--limit", type=int, default=5000, help="最多读取的热门地址数")
+    parser.add_argument("--output", default=str(DEFAULT_PATH), help="输出文件")
+    parser.add_argument("--dry-run", action="store_true", help="只统计，不写文件")
+    parser.add_argument("--refresh-existing", action="store_true", help="用高德重新解析表中已有的地点")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(build(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+离线轨道交通线网生成工具
+
+用高德公交线路关键字查询（/v3/bus/linename，extensions=all）拉取 data/cities.json
+中各城市的地铁/轻轨线路与车站，写入 data/transit_graph.json 供
+app.amap.transit_graph 使用：
+- 同一线路的上下行只保留一条（站数较多者）
+- 同名且相距不超过 --merge-radius 米的车站视为同一车站（换乘站）
+- 离所属城市中心超过 150km 的车站视为误匹配，整条线路丢弃
+写入后加载一遍并建好各城市的全源耗时表，报告车站数与建表耗时。
+
+需要 config/config.toml 中的高德 API key。
+
+使用方法:
+    python tools/build_transit_graph.py [--cities 北京,上海] [--keywords 地铁,轨道交通] [--output data/transit_graph.json] [--dry-run]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.amap.client import close_amap_client, get_amap_client  # noqa: E402
+from app.amap.gazetteer import MAX_CITY_DISTANCE_M, load_city_centers  # noqa: E402
+from app.amap.distance import haversine_m  # noqa: E402
+from app.amap.transit_graph import DEFAULT_PATH, TransitGraph, to_payload  # noqa: E402
+from app.config import config  # noqa: E402
+from app.exceptions import AMapError  # noqa: E402
+
+PAGE_SIZE = 50
+MAX_PAGES = 10
+RAIL_TYPES = ("地铁", "轻轨", "轨道", "磁悬浮")
+
+
+async def fetch_lines(api_key: str, city: str, keyword: str) -> List[Dict]:
+    """按关键字分页查询某城市的线路（含车站）"""
+    lines: List[Dict] = []
+    for page in range(1, MAX_PAGES + 1):
+        params = {"key": api_key, "keywords": keyword, "city": city, "offset": PAGE_SIZE,
+                  "page": page, "extensions": "all"}
+        try:
+            data = await get_amap_client().get_json("bus_linename", params)
+        except AMapError as e:
+            print(f"  {city} '{keyword}' 第 {page} 页查询失败: {e}")
+            break
+        if data.get("status") != "1":
+            print(f"  {city} '{keyword}' 查询失败: {data.get('info', '未知错误')}")
+            break
+        buslines = data.get("buslines") or []
+        lines.extend(buslines)
+        if len(buslines) < PAGE_SIZE:
+            break
+    return lines
+
+
+def parse_stops(line: Dict) -> List[Tuple[str, float, float]]:
+    stops = []
+    for stop in sorted(line.get("busstops") or [], key=lambda s: int(s.get("sequence") or 0)):
+        try:
+            lng_str, lat_str = stop["location"].split(",")
+            stops.append((str(stop["name"]), float(lng_str), float(lat_str)))
+        except (KeyError, ValueError, AttributeError):
+            continue
+    return stops
+
+
+def build_city(
+    raw_lines: List[Dict], center: Optional[Tuple[float, float]], merge_radius: float
+) -> Tuple[Dict, int]:
+    """高德线路 -> {"stations": [...], "lines": [...]}，以及因坐标不可信丢弃的线路数"""
+    # 上下行："地铁1号线(古城--环球度假区)" 与 "地铁1号线(环球度假区--古城)" 只保留一条
+    by_name: Dict[str, Tuple[Dict, List[Tuple[str, float, float]]]] = {}
+    for line in raw_lines:
+        if not any(kind in str(line.get("type") or "") for kind in RAIL_TYPES):
+            continue
+        stops = parse_stops(line)
+        name = str(line.get("name") or "").split("(")[0]
+        if len(stops) >= 2 and (name not in by_name or len(stops) > len(by_name[name][1])):
+            by_name[name] = (line, stops)
+
+    stations: List[List] = []
+    by_station_name: Dict[str, List[int]] = {}
+    lines: List[Dict] = []
+    rejected = 0
+    for name, (line, stops) in sorted(by_name.items()):
+        if center is not None and any(
+            haversine_m(lng, lat, center[0], center[1]) > MAX_CITY_DISTANCE_M for _, lng, lat in stops
+        ):
+            rejected += 1
+            continue
+        sequence = []
+        for stop_name, lng, lat in stops:
+            index = next(
+                (i for i in by_station_name.get(stop_name, [])
+                 if haversine_m(lng, lat, stations[i][1], stations[i][2]) <= merge_radius),
+                None,
+            )
+            if index is None:
+                index = len(stations)
+                stations.append([stop_name, round(lng, 6), round(lat, 6)])
+                by_station_name.setdefault(stop_name, []).append(index)
+            sequence.append(index)
+        lines.append({"name": name, "stations": sequence, "loop": str(line.get("loop")) == "1"})
+    return {"stations": stations, "lines": lines}, rejected
+
+
+async def build(args) -> int:
+    if config.amap is None or not config.amap.api_key:
+        print("未配置高德 API key（config/config.toml 的 [amap].api_key）")
+        return 1
+    city_centers = load_city_centers()
+    cities = [c for c in args.cities.split(",") if c] if args.cities else list(city_centers)
+    keywords = [k for k in args.keywords.split(",") if k]
+
+    output = Path(args.output)
+    payload_cities: Dict[str, Dict] = {}
+    try:
+        for city in cities:
+            raw_lines: List[Dict] = []
+            for keyword in keywords:
+                raw_lines += await fetch_lines(config.amap.api_key, city, keyword)
+            data, rejected = build_city(raw_lines, city_centers.get(city), args.merge_radius)
+            if data["lines"]:
+                payload_cities[city] = data
+            print(f"  {city}: {len(data['lines'])} 条线路, {len(data['stations'])} 个车站"
+                  + (f"（丢弃 {rejected} 条坐标不可信的线路）" if rejected else ""))
+    finally:
+        await close_amap_client()
+
+    print(f"共 {len(payload_cities)}/{len(cities)} 个城市有轨道交通数据")
+    if args.dry_run:
+        print("dry-run：未写入文件")
+        return 0
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(to_payload(payload_cities), fh, ensure_ascii=False, separators=(",", ":"))
+        fh.write("\n")
+    print(f"已写入 {output}（{output.stat().st_size / 1024:.1f}KB）")
+
+    graph = TransitGraph.load(output)
+    for city, network in graph.networks.items():
+        started = time.perf_counter()
+        network.precompute()
+        print(f"  {city}: {len(network)} 个车站, {network.platform_count} 个站台, "
+              f"建表 {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="从高德公交线路查询生成离线轨道交通线网")
+    parser.add_argument("--cities", default="", help="逗号分隔的城市，默认 data/cities.json 中的全部城市")
+    parser.add_argument("--keywords", default="地铁,轨道交通", help="逗号分隔的线路查询关键字")
+    parser.add_argument("--merge-radius", type=float, default=800.0, help="同名车站合并的最大距离（米）")
+    parser.add_argument("--output", default=str(DEFAULT_PATH), help="输出文件")
+    parser.add_argument("--dry-run", action="store_true", help="只统计，不写文件")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(build(args)))
+
+
+if __name__ == "__main__":
+    main()